@@ -0,0 +1,243 @@
+"""Benchmarks of overhead of invokelint itself.
+
+Measures:
+
+- Import time of invokelint.path
+- Build time of task collection in tasks.py
+- Dispatch overhead of lint.fast per command with stub tools which exit immediately
+- End-to-end time of lint.fast on generated synthetic projects
+
+Each measurement runs in a fresh interpreter to avoid module caches.
+Run from the project root:
+
+    python benchmarks/benchmark_invokelint.py --modules 100 --modules 1000 --json benchmark.json
+"""
+
+# Reason: Benchmarks are standalone script, not package.
+# ruff: noqa: INP001
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import stat
+import statistics
+
+# Reason: To run benchmarks in fresh interpreters with trusted commands.
+import subprocess  # nosec B404
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import NamedTuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+STUB_TOOLS = ["bandit", "dodgy", "flake8", "pydocstyle", "radon", "ruff", "xenon"]
+MODULES_PER_PACKAGE = 100
+# Template of child process which prints elapsed seconds of statement.
+CHILD = """\
+import time
+{setup}
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+SETUP_DISPATCH = """\
+from invoke import Config
+from invoke import Context
+from invokelint.lint import fast
+from invokelint.path import paths
+paths.python_dirs
+context = Context(Config(overrides={"run": {"hide": True, "in_stream": False}}))
+"""
+TASKS = """\
+from invoke import Collection
+
+from invokelint import lint
+
+ns = Collection()
+ns.add_collection(lint)
+"""
+
+
+class Measurement(NamedTuple):
+    name: str
+    min: float
+    median: float
+
+
+def run_child(
+    statement: str,
+    *,
+    setup: str = "",
+    cwd: Path = PROJECT_ROOT,
+    env: dict[str, str] | None = None,
+) -> float:
+    """Runs statement in fresh interpreter and returns its elapsed seconds."""
+    code = CHILD.format(setup=setup, statement=statement)
+    # Reason: Command is built from constants in this script.
+    completed = subprocess.run(  # noqa: S603  # nosec B603
+        [sys.executable, "-c", code],
+        cwd=cwd,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return float(completed.stdout.splitlines()[-1])
+
+
+def run_end_to_end(cwd: Path) -> float:
+    """Runs lint.fast as user does and returns its elapsed seconds including interpreter startup."""
+    start = time.perf_counter()
+    # Reason: Command is built from constants in this script, failures of linters are out of scope.
+    subprocess.run(  # nosec B603
+        [sys.executable, "-m", "invoke", "lint.fast", "--skip-format"],
+        cwd=cwd,
+        check=False,
+        capture_output=True,
+    )
+    return time.perf_counter() - start
+
+
+def measure(name: str, repeat: int, function: Callable[..., float], *args: Any, **kwargs: Any) -> Measurement:
+    """Calls function repeatedly, then summarizes elapsed seconds."""
+    list_second = [function(*args, **kwargs) for _ in range(repeat)]
+    return Measurement(name, min(list_second), statistics.median(list_second))
+
+
+def generate_project(root: Path, modules: int) -> Path:
+    """Generates synthetic project which has package split into sub packages of 100 modules."""
+    root.mkdir(parents=True)
+    root.joinpath("pyproject.toml").write_text('[project]\nname = "synthetic"\nversion = "0.0.0"\n', encoding="utf-8")
+    root.joinpath("tasks.py").write_text(TASKS, encoding="utf-8")
+    package = root / "synthetic"
+    package.mkdir()
+    package.joinpath("__init__.py").write_text('"""Synthetic package."""\n', encoding="utf-8")
+    for index in range(modules):
+        sub_package = package / f"package_{index // MODULES_PER_PACKAGE}"
+        if not sub_package.exists():
+            sub_package.mkdir()
+            sub_package.joinpath("__init__.py").write_text('"""Synthetic sub package."""\n', encoding="utf-8")
+        sub_package.joinpath(f"module_{index}.py").write_text(build_module(index), encoding="utf-8")
+    return root
+
+
+def build_module(index: int) -> str:
+    return (
+        f'"""Synthetic module {index}."""\n\n\n'
+        f"def function_{index}(value: int) -> int:\n"
+        f'    """Returns value plus {index}."""\n'
+        f"    return value + {index}\n"
+    )
+
+
+def create_stub_tools(directory: Path) -> dict[str, str]:
+    """Creates tools which exit immediately, returns environment to use them."""
+    directory.mkdir()
+    for name in STUB_TOOLS:
+        stub = directory / name
+        stub.write_text("#!/bin/sh\nexit 0\n", encoding="utf-8")
+        stub.chmod(stub.stat().st_mode | stat.S_IXUSR)
+    return {**os.environ, "PATH": f"{directory}{os.pathsep}{os.environ['PATH']}"}
+
+
+def benchmark_startup(repeat: int) -> list[Measurement]:
+    return [
+        measure("import invokelint.path", repeat, run_child, "import invokelint.path"),
+        measure(
+            "build collection of tasks.py",
+            repeat,
+            run_child,
+            "import tasks\nCollection.from_module(tasks)",
+            setup="from invoke import Collection",
+        ),
+    ]
+
+
+def benchmark_dispatch(temporary: Path, repeat: int) -> list[Measurement]:
+    """Measures lint.fast with stub tools, so elapsed time is almost overhead of invokelint and Invoke."""
+    if sys.platform == "win32":
+        return []
+    project = generate_project(temporary / "dispatch", 1)
+    env = create_stub_tools(temporary / "stub")
+    count = len(run_fast_with_stubs(project, env))
+    statement = "fast(context, skip_format=True)"
+    measurement = measure(
+        "lint.fast with stub tools",
+        repeat,
+        run_child,
+        statement,
+        setup=SETUP_DISPATCH,
+        cwd=project,
+        env=env,
+    )
+    return [
+        measurement,
+        Measurement(f"dispatch per command ({count} commands)", measurement.min / count, measurement.median / count),
+    ]
+
+
+def run_fast_with_stubs(project: Path, env: dict[str, str]) -> list[str]:
+    """Lists commands which lint.fast runs, also warms up cache of project paths."""
+    code = f"{SETUP_DISPATCH}print('\\n'.join(result.command for result in fast(context, skip_format=True)))"
+    # Reason: Command is built from constants in this script.
+    completed = subprocess.run(  # noqa: S603  # nosec B603
+        [sys.executable, "-c", code],
+        cwd=project,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return completed.stdout.splitlines()
+
+
+def benchmark_end_to_end(temporary: Path, repeat: int, list_modules: list[int]) -> list[Measurement]:
+    list_measurement = []
+    for modules in list_modules:
+        project = generate_project(temporary / f"synthetic_{modules}", modules)
+        list_measurement.append(measure(f"lint.fast on {modules} modules", repeat, run_end_to_end, project))
+    return list_measurement
+
+
+def report(list_measurement: list[Measurement]) -> str:
+    lines = [f"{'Benchmark':<45} {'Min [s]':>10} {'Median [s]':>10}"]
+    lines.extend(f"{each.name:<45} {each.min:>10.4f} {each.median:>10.4f}" for each in list_measurement)
+    return "\n".join(lines)
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parses command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs of each benchmark (default: 3)")
+    parser.add_argument(
+        "--modules",
+        type=int,
+        action="append",
+        help="Number of modules of synthetic project, repeatable (default: 100, 1000, 10000)",
+    )
+    parser.add_argument("--json", help="Writes measurements as JSON into the file to compare between releases")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Runs all benchmarks and prints summary table."""
+    arguments = parse_arguments()
+    list_modules = arguments.modules or [100, 1000, 10000]
+    list_measurement = benchmark_startup(arguments.repeat)
+    with tempfile.TemporaryDirectory() as directory:
+        temporary = Path(directory)
+        list_measurement.extend(benchmark_dispatch(temporary, arguments.repeat))
+        list_measurement.extend(benchmark_end_to_end(temporary, arguments.repeat, list_modules))
+    print(report(list_measurement))  # noqa: T201
+    if arguments.json:
+        content = [measurement._asdict() for measurement in list_measurement]
+        Path(arguments.json).write_text(json.dumps(content, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
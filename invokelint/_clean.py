@@ -2,50 +2,141 @@
 
 from __future__ import annotations
 
+import os
 import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
+from fnmatch import fnmatch
 from pathlib import Path
+from typing import NamedTuple
 
+import click
 from invoke import Collection
 from invoke import Context
 from invoke import Result
 from invoke import task
 
-from invokelint.run import run_all
-from invokelint.run import run_in_pty
+from invokelint import dmypy
+from invokelint.path import CACHE_DIR
 
 ROOT_DIR = Path(__file__).parent
 COVERAGE_FILE = ROOT_DIR.joinpath(".coverage")
 COVERAGE_DIR = ROOT_DIR.joinpath("htmlcov")
+# Directories which are not walked since they never contain artifacts to clean up and may be huge.
+# Cache contains virtual environment to build packages, whose egg-info and build directories shouldn't be cleaned up.
+EXCLUDED_DIRECTORIES = [".git", ".venv", "venv", "node_modules", CACHE_DIR.name]
+DIST_ROOT_DIRECTORIES = ["build", "dist", ".eggs"]
+DIST_PATTERNS = ["*.egg-info", "*.egg"]
+PYTHON_PATTERNS = ["*.pyc", "*.pyo", "*~", "__pycache__"]
+HELP = {
+    "exclude": f"Directory name not to walk in addition to {', '.join(EXCLUDED_DIRECTORIES)} (repeatable)",
+    "jobs": "Deletes files by N threads",
+}
 
 ns = Collection()
 
 
-@task
-def dist(context: Context) -> list[Result]:
+class Removed(NamedTuple):
+    """Counts of removed files, directories, and freed bytes."""
+
+    files: int = 0
+    directories: int = 0
+    size: int = 0
+
+    def __add__(self, other: object) -> Removed:
+        if not isinstance(other, Removed):
+            return NotImplemented
+        return Removed(self.files + other.files, self.directories + other.directories, self.size + other.size)
+
+    def report(self) -> str:
+        return f"Removed {self.files} files and {self.directories} directories, freed {self.size} bytes.\n"
+
+
+def find(patterns: list[str], excludes: list[str]) -> list[str]:
+    """Finds paths matching patterns by walking the tree only once, matched directories are not walked."""
+    matches = []
+    directories = ["."]
+    while directories:
+        for entry in scan(directories.pop()):
+            if is_matched(entry.name, patterns):
+                matches.append(entry.path)
+            elif is_walkable(entry, excludes):
+                directories.append(entry.path)
+    return matches
+
+
+def scan(directory: str) -> list[os.DirEntry[str]]:
+    """Lists entries of directory, nothing when it can't be read, e.g. permission denied."""
+    try:
+        with os.scandir(directory) as entries:
+            return list(entries)
+    except OSError:
+        return []
+
+
+def is_matched(name: str, patterns: list[str]) -> bool:
+    return any(fnmatch(name, pattern) for pattern in patterns)
+
+
+def is_walkable(entry: os.DirEntry[str], excludes: list[str]) -> bool:
+    return entry.is_dir(follow_symlinks=False) and entry.name not in excludes
+
+
+def remove(path: str) -> Removed:
+    """Removes file or directory, returns what is removed."""
+    if not Path(path).is_dir() or Path(path).is_symlink():
+        return remove_file(path)
+    removed = Removed(directories=1)
+    for root, dirs, files in os.walk(path):
+        removed += Removed(directories=len(dirs)) + sum_file_sizes(root, files)
+    shutil.rmtree(path, ignore_errors=True)
+    return removed
+
+
+def remove_file(path: str) -> Removed:
+    """Removes file, returns nothing removed when it has already been removed."""
+    file = Path(path)
+    try:
+        size = file.lstat().st_size
+        file.unlink()
+    except FileNotFoundError:
+        return Removed()
+    return Removed(files=1, size=size)
+
+
+def sum_file_sizes(root: str, files: list[str]) -> Removed:
+    removed = Removed()
+    for file in files:
+        with suppress(FileNotFoundError):
+            removed += Removed(files=1, size=Path(root, file).lstat().st_size)
+    return removed
+
+
+def clean(root_directories: list[str], patterns: list[str], *, excludes: list[str] | None, jobs: int) -> Result:
+    """Cleans up root directories and paths matching patterns, reports what is removed."""
+    paths = [directory for directory in root_directories if Path(directory).exists() or Path(directory).is_symlink()]
+    paths.extend(find(patterns, [*EXCLUDED_DIRECTORIES, *(excludes or [])]))
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+        removed = sum(executor.map(remove, paths), Removed())
+    report = removed.report()
+    click.echo(report, nl=False)
+    return Result(stdout=report)
+
+
+@task(help=HELP, iterable=["exclude"])
+def dist(_context: Context, *, exclude: list[str] | None = None, jobs: int = 1) -> list[Result]:
     """Cleans up files from package building."""
-    return [
-        run_in_pty(context, "rm -fr build/"),
-        run_in_pty(context, "rm -fr dist/"),
-        run_in_pty(context, "rm -fr .eggs/"),
-        run_in_pty(context, "find . -name '*.egg-info' -exec rm -fr {} +"),
-        run_in_pty(context, "find . -name '*.egg' -not -path '*/.venv/*' -exec rm -f {} +"),
-    ]
+    return [clean(DIST_ROOT_DIRECTORIES, DIST_PATTERNS, excludes=exclude, jobs=jobs)]
 
 
 ns.add_task(dist)
 
 
-@task
-def python(context: Context) -> list[Result]:
+@task(help=HELP, iterable=["exclude"])
+def python(_context: Context, *, exclude: list[str] | None = None, jobs: int = 1) -> list[Result]:
     """Cleans up python file artifacts."""
-    return [
-        run_in_pty(context, "find . -name '*.pyc' -exec rm -f {} +"),
-        run_in_pty(context, "find . -name '*.pyo' -exec rm -f {} +"),
-        run_in_pty(context, "find . -name '*~' -exec rm -f {} +"),
-        run_in_pty(context, "find . -name '__pycache__' -exec rm -fr {} +"),
-    ]
+    return [clean([], PYTHON_PATTERNS, excludes=exclude, jobs=jobs)]
 
 
 ns.add_task(python)
@@ -74,10 +165,25 @@ def tests(_context: Context) -> list[Result]:
 ns.add_task(tests)
 
 
-@task(name="all")
-def clean_all(context: Context) -> list[Result]:
+@task
+def cache(context: Context) -> list[Result]:
+    """Cleans up cache of invokelint, stops mypy daemon since its status file is in the cache."""
+    list_result = dmypy.stop(context)
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+    return [*list_result, Result()]
+
+
+ns.add_task(cache)
+
+
+@task(name="all", help=HELP, iterable=["exclude"])
+def clean_all(context: Context, *, exclude: list[str] | None = None, jobs: int = 1) -> list[Result]:
     """Cleans up all."""
-    return run_all([dist, python, tests], context)
+    # Walks the tree only once for both of dist and python.
+    list_result = [clean(DIST_ROOT_DIRECTORIES, DIST_PATTERNS + PYTHON_PATTERNS, excludes=exclude, jobs=jobs)]
+    list_result.extend(tests(context))
+    list_result.extend(dmypy.stop(context))
+    return list_result
 
 
 ns.add_task(clean_all, default=True)
@@ -0,0 +1,168 @@
+"""Latency budget which picks and orders linters by their runtimes recorded in previous runs."""
+
+from __future__ import annotations
+
+import json
+import re
+import statistics
+import threading
+import time
+from typing import TYPE_CHECKING
+from typing import Any
+
+import click
+from invoke import CommandTimedOut
+from invoke import Context
+from invoke import Exit
+from invoke import UnexpectedExit
+
+from invokelint.cache import get_tool_name
+from invokelint.path import CACHE_DIR
+from invokelint.run import clone_context
+from invokelint.run import run_in_parallel
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from invoke import Result
+
+    from invokelint.run import TaskFunction
+
+HISTORY_FILE = CACHE_DIR.joinpath("history.json")
+# Estimate follows recent runs, since runtime changes as project grows.
+MAX_SAMPLES = 5
+UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0}
+PATTERN_DURATION = re.compile(r"^(?P<value>\d+(?:\.\d+)?)(?P<unit>ms|s|m)?$")
+
+
+def parse_duration(duration: str) -> float:
+    """Parses duration such as 500ms, 10s, 1.5m, or 10 (seconds) into seconds."""
+    match = PATTERN_DURATION.match(duration.strip())
+    if not match:
+        msg = f"--budget requires duration such as 10s, 500ms, or 1m: {duration}"
+        raise Exit(msg)
+    return float(match["value"]) * UNITS[match["unit"] or "s"]
+
+
+def resolve_deadline(budget: str) -> float | None:
+    """Resolves deadline in time of time.monotonic(), None means no budget."""
+    return time.monotonic() + parse_duration(budget) if budget else None
+
+
+def load_runtimes(path: Path) -> dict[str, list[float]]:
+    try:
+        runtimes: dict[str, list[float]] = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return runtimes
+
+
+class RuntimeHistory:
+    """Recent runtimes of each tool, thread-safe to record tools run concurrently."""
+
+    def __init__(self, path: Path = HISTORY_FILE) -> None:
+        self.path = path
+        self.runtimes = load_runtimes(path)
+        self.timed_out: list[str] = []
+        self.lock = threading.Lock()
+
+    def estimate(self, task: TaskFunction) -> float:
+        """Estimates runtime of task by median of recent runs, 0 when it has never run to measure it first."""
+        runtimes = self.runtimes.get(get_tool_name(task))
+        return statistics.median(runtimes) if runtimes else 0.0
+
+    def record(self, name: str, runtime: float) -> None:
+        with self.lock:
+            self.runtimes[name] = [*self.runtimes.get(name, []), runtime][-MAX_SAMPLES:]
+
+    def wrap(self, list_task: list[TaskFunction]) -> list[TaskFunction]:
+        return [self.measure(each_task) for each_task in list_task]
+
+    def measure(self, task: TaskFunction) -> TaskFunction:
+        """Wraps task to record its runtime, a timed out task is recorded and reported instead of failure."""
+        name = get_tool_name(task)
+
+        def measured_task(context: Context, *args: Any, **kwargs: Any) -> list[Result]:
+            start = time.perf_counter()
+            try:
+                list_result = task(context, *args, **kwargs)
+            except CommandTimedOut:
+                self.record(name, time.perf_counter() - start)
+                with self.lock:
+                    self.timed_out.append(name)
+                return []
+            except UnexpectedExit:
+                self.record(name, time.perf_counter() - start)
+                raise
+            # Task skipped by cache returns no result, and its runtime doesn't represent the tool.
+            if list_result:
+                self.record(name, time.perf_counter() - start)
+            return list_result
+
+        measured_task.__name__ = getattr(task, "__name__", "")
+        return measured_task
+
+    def save(self) -> None:
+        """Saves runtimes, they are dropped when they can't be written."""
+        # Reason: History is optional, linters run even if it can't be written, e.g. in read-only checkout.
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.lock:
+                self.path.write_text(json.dumps(self.runtimes, indent=2), encoding="utf-8")
+        except OSError:
+            pass
+
+
+def build_timeout_context(context: Context, timeout: float) -> Context:
+    """Builds context whose commands time out at the deadline."""
+    timeout_context = clone_context(context)
+    timeout_context.config.timeouts.command = timeout
+    return timeout_context
+
+
+def run_within_budget(
+    list_task: list[TaskFunction],
+    context: Context,
+    *,
+    history: RuntimeHistory,
+    deadline: float,
+    **kwargs: Any,
+) -> list[Result]:
+    """Runs tasks expected to finish by the deadline, cheapest first, and all of them start at once.
+
+    Outputs are printed in order of estimated runtime, so the cheapest feedback comes first. Tasks estimated to
+    exceed the remaining budget are deferred, and commands still running at the deadline time out.
+
+    Args:
+        list_task: Tasks wrapped by RuntimeHistory.measure().
+        context: Context.
+        history: History which recorded runtimes of tasks.
+        deadline: Deadline in time of time.monotonic().
+        **kwargs: Keyword arguments to pass to each task.
+    """
+    remaining = deadline - time.monotonic()
+    ordered = sorted(list_task, key=history.estimate)
+    selected = select_within(ordered, history, remaining)
+    deferred = [get_tool_name(each_task) for each_task in ordered if each_task not in selected]
+    try:
+        if not selected:
+            return []
+        timeout_context = build_timeout_context(context, remaining)
+        return run_in_parallel(selected, timeout_context, jobs=len(selected), fail_fast=False, **kwargs)
+    finally:
+        echo_skipped(deferred, history.timed_out, remaining)
+
+
+def select_within(list_task: list[TaskFunction], history: RuntimeHistory, remaining: float) -> list[TaskFunction]:
+    """Selects tasks estimated to finish within remaining budget, none when budget has run out."""
+    if remaining <= 0:
+        return []
+    return [each_task for each_task in list_task if history.estimate(each_task) <= remaining]
+
+
+def echo_skipped(deferred: list[str], timed_out: list[str], budget: float) -> None:
+    """Reports checks which didn't run within the budget."""
+    if deferred:
+        click.echo(f"Deferred (estimated to exceed budget {budget:.1f}s): {', '.join(deferred)}", err=True)
+    if timed_out:
+        click.echo(f"Timed out (exceeded budget {budget:.1f}s): {', '.join(timed_out)}", err=True)
@@ -0,0 +1,162 @@
+"""Content hash based cache of passing results to skip linters whose inputs haven't changed."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import sysconfig
+import time
+from contextlib import suppress
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+
+import click
+
+from invokelint.path import CACHE_DIR
+from invokelint.path import list_python_files
+from invokelint.path import remove_duplicate
+from invokelint.path.index import hash_file
+from invokelint.path.index import hash_indexed
+
+if TYPE_CHECKING:
+    from invoke import Context
+    from invoke import Result
+
+    from invokelint.run import TaskFunction
+
+RESULT_CACHE_DIR = CACHE_DIR.joinpath("results")
+# Configuration files which may change behavior of tools.
+CONFIG_FILES = ["pyproject.toml", "setup.cfg", ".flake8"]
+MAX_ENTRIES = 256
+# dodgy scans whole working directory and Semgrep downloads rules from registry,
+# so their inputs can't be identified by target files.
+NOT_CACHEABLE = ["call_dodgy", "call_semgrep"]
+# These tools read modules imported by targets or ignore targets, so their inputs are all Python files to lint.
+WHOLE_PROJECT = ["call_xenon", "call_mypy", "call_pylint"]
+
+
+def fingerprint_executable(executable: str) -> str:
+    """Identifies installed version of tool by path, size, and modified time of its executable.
+
+    Installing another version of tool rewrites its executable.
+    """
+    path = shutil.which(executable)
+    if path is None:
+        return ""
+    stat = Path(path).stat()
+    return f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+@lru_cache(maxsize=None)
+def fingerprint_distributions() -> str:
+    """Identifies installed distributions by names of their metadata directories, which contain versions.
+
+    Installing plugin or stub package changes results of tools without changing their executables.
+    """
+    names: list[str] = []
+    for directory in remove_duplicate([sysconfig.get_paths()["purelib"], sysconfig.get_paths()["platlib"]]):
+        with suppress(OSError):
+            names.extend(path.name for path in Path(directory).iterdir() if path.suffix in (".dist-info", ".egg-info"))
+    return hashlib.sha256("\n".join(sorted(names)).encode()).hexdigest()
+
+
+def get_tool_name(task: TaskFunction) -> str:
+    """Gets tool name from name of task, e.g. call_ruff_fmt -> ruff_fmt."""
+    name: str = getattr(task, "__name__", "")
+    return name[len("call_") :] if name.startswith("call_") else name
+
+
+def get_executable(task: TaskFunction) -> str:
+    """Gets executable name of tool from name of task, e.g. call_ruff_fmt -> ruff."""
+    return get_tool_name(task).split("_")[0]
+
+
+def build_key(executable: str, name: str, options: dict[str, Any], files: list[str]) -> str:
+    """Builds cache key from tool, its options, configuration files, and content of target files."""
+    lines = [name, fingerprint_executable(executable), fingerprint_distributions(), repr(sorted(options.items()))]
+    lines.extend(f"{config_file}:{hash_file(config_file)}" for config_file in CONFIG_FILES)
+    lines.extend(f"{file}:{hash_indexed(file)}" for file in files)
+    return hashlib.sha256("\n".join(lines).encode()).hexdigest()
+
+
+class ResultCache:
+    """Stores keys of passing runs, evicts least recently used entries over max entries."""
+
+    def __init__(self, directory: Path = RESULT_CACHE_DIR, max_entries: int = MAX_ENTRIES) -> None:
+        self.directory = directory
+        self.max_entries = max_entries
+
+    def contains(self, key: str) -> bool:
+        """Checks whether key is stored, marks it as recently used."""
+        # Entry may be evicted by concurrent run at any time, so it isn't checked before marked.
+        try:
+            os.utime(self.directory.joinpath(key))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def store(self, key: str, commands: list[str]) -> None:
+        """Stores key of passing run."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        content = {"commands": commands, "time": time.time()}
+        self.directory.joinpath(key).write_text(json.dumps(content), encoding="utf-8")
+        self.evict()
+
+    def evict(self) -> None:
+        """Deletes least recently used entries over max entries."""
+        entries = sorted(
+            ((mtime_ns, path) for path in self.directory.iterdir() for mtime_ns in get_mtime_ns(path)),
+            key=lambda entry: entry[0],
+            reverse=True,
+        )
+        for _, path in entries[self.max_entries :]:
+            # Reason: Another worker of parallel run may have evicted it.
+            with suppress(FileNotFoundError):
+                path.unlink()
+
+
+def get_mtime_ns(path: Path) -> list[int]:
+    """Gets modified time of entry, nothing when another worker of parallel run has evicted it."""
+    try:
+        return [path.stat().st_mtime_ns]
+    except FileNotFoundError:
+        return []
+
+
+def list_key_files(name: str, targets: list[str] | None, context: Context) -> list[str]:
+    """Lists files which decide result of tool, all Python files to lint for tools which read more than targets."""
+    return list_python_files(None if name in WHOLE_PROJECT else targets, context)
+
+
+def cache_task(task: TaskFunction, result_cache: ResultCache | None = None) -> TaskFunction:
+    """Wraps task to skip it when inputs haven't changed since the last passing run."""
+    result_cache = result_cache or ResultCache()
+    name = getattr(task, "__name__", "")
+
+    def cached_task(context: Context, *args: Any, targets: list[str] | None = None, **kwargs: Any) -> list[Result]:
+        key = build_key(get_executable(task), name, kwargs, list_key_files(name, targets, context))
+        if result_cache.contains(key):
+            click.echo(f"Skipped {get_tool_name(task)}: inputs haven't changed since the last passing run.")
+            return []
+        list_result = task(context, *args, targets=targets, **kwargs)
+        if all(result.ok for result in list_result):
+            result_cache.store(key, [result.command for result in list_result])
+        return list_result
+
+    cached_task.__name__ = name
+    return cached_task
+
+
+def wrap_tasks(list_task: list[TaskFunction], *, enabled: bool) -> list[TaskFunction]:
+    """Wraps tasks by cache when enabled."""
+    if not enabled:
+        return list_task
+    result_cache = ResultCache()
+    return [
+        each_task if getattr(each_task, "__name__", "") in NOT_CACHEABLE else cache_task(each_task, result_cache)
+        for each_task in list_task
+    ]
@@ -0,0 +1,57 @@
+"""Client of lint server started by `inv lint.serve`, for editors and pre-commit hooks.
+
+This module imports only standard library to start fast, e.g. `python -m invokelint.client package/module.py`, or
+`python -m invokelint.client --stdin-filename package/module.py < buffer.py` to lint buffer not saved yet.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import socket
+import sys
+from pathlib import Path
+from typing import Any
+
+# Same as invokelint.serve.SOCKET_FILE, not imported since invokelint.serve imports Invoke.
+SOCKET_FILE = Path(".invokelint_cache", "serve.sock")
+# Same as invokelint.serve.EXIT_CODE_ERROR.
+EXIT_CODE_ERROR = 2
+
+
+def request(content: dict[str, Any], path: Path = SOCKET_FILE) -> dict[str, Any]:
+    """Sends request to server, returns response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(path))
+        client.sendall(json.dumps(content).encode() + b"\n")
+        with client.makefile("rb") as file:
+            response: dict[str, Any] = json.loads(file.readline())
+    return response
+
+
+def build_request(files: list[str], stdin_filename: str | None) -> dict[str, Any]:
+    """Builds request to lint buffer from standard input when its file name is given, otherwise files."""
+    if stdin_filename is None:
+        return {"files": files}
+    return {"file": stdin_filename, "source": sys.stdin.read()}
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Prints output of linters, returns exit code of them."""
+    parser = argparse.ArgumentParser(prog="python -m invokelint.client", description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", help="Python files to lint")
+    parser.add_argument("--stdin-filename", help="Lints standard input as content of the file")
+    parser.add_argument("--socket", type=Path, default=SOCKET_FILE, help="Socket file of server")
+    arguments = parser.parse_args(argv)
+    try:
+        response = request(build_request(arguments.files, arguments.stdin_filename), arguments.socket)
+    except OSError as error:
+        sys.stderr.write(f"Failed to connect lint server, start it by `inv lint.serve`: {error}\n")
+        return EXIT_CODE_ERROR
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return int(response["exited"])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
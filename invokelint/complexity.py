@@ -0,0 +1,279 @@
+"""In-process complexity analysis which parses each file once for Radon cc, Radon mi, and Xenon.
+
+Results are cached by hash of file content, so only edited files are analyzed again.
+"""
+
+from __future__ import annotations
+
+import ast
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import NamedTuple
+
+import click
+from invoke import Result
+from invoke import UnexpectedExit
+
+from invokelint.diagnostics import reporter
+from invokelint.path import CACHE_DIR
+from invokelint.path import list_python_files
+from invokelint.path.index import hash_indexed
+
+if TYPE_CHECKING:
+    from invoke import Context
+    from radon.cli import FileConfig
+    from radon.visitors import Class
+    from radon.visitors import Function
+
+COMPLEXITY_CACHE_FILE = CACHE_DIR.joinpath("complexity.json")
+# Ranks of Radon cc are ordered by letter.
+RANKS = "ABCDEF"
+
+
+class Block(NamedTuple):
+    """Function, method, or class with its cyclomatic complexity."""
+
+    letter: str
+    lineno: int
+    col_offset: int
+    name: str
+    complexity: int
+
+
+class FileMetrics(NamedTuple):
+    """Metrics of a file, error is not empty when the file can't be parsed."""
+
+    blocks: list[Block]
+    mi: float
+    error: str = ""
+
+
+def analyze_file(path: str) -> FileMetrics:
+    """Computes cyclomatic complexity of blocks and maintainability index of file from one syntax tree."""
+    # Reason: Importing Radon is slow, so it should be imported only when analysis is required.
+    from radon.metrics import h_visit_ast  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+    from radon.metrics import mi_compute  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+    from radon.raw import analyze as analyze_raw  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+    from radon.visitors import ComplexityVisitor  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+    try:
+        # UnicodeDecodeError is ValueError, so file which is not UTF-8 is reported as error same as syntax error.
+        code = Path(path).read_text(encoding="utf-8")
+        tree = ast.parse(code)
+        raw = analyze_raw(code)
+    except (SyntaxError, ValueError) as error:
+        return FileMetrics([], 0.0, str(error))
+    visitor = ComplexityVisitor.from_ast(tree)
+    # Same as radon.metrics.mi_visit() with multi=True which is default of Radon mi.
+    comments = (raw.comments + raw.multi) / float(raw.sloc) * 100 if raw.sloc != 0 else 0
+    mi = mi_compute(h_visit_ast(tree).total.volume, visitor.total_complexity, raw.lloc, comments)
+    return FileMetrics([convert_block(block) for block in visitor.blocks], mi)
+
+
+def convert_block(block: Function | Class) -> Block:
+    return Block(block.letter, block.lineno, block.col_offset, block.fullname, block.complexity)
+
+
+def get_radon_version() -> str:
+    # Reason: Importing Radon is slow, so it should be imported only when analysis is required.
+    import radon  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+    return str(radon.__version__)
+
+
+class ComplexityCache:
+    """Stores metrics of files by hash of their content, drops all when version of Radon changes."""
+
+    def __init__(self, path: Path = COMPLEXITY_CACHE_FILE) -> None:
+        self.path = path
+        self.version = get_radon_version()
+        self.files: dict[str, Any] = {}
+        try:
+            content = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if content["version"] == self.version:
+            self.files = content["files"]
+
+    def get(self, file: str, digest: str) -> FileMetrics | None:
+        entry = self.files.get(file)
+        if entry is None or entry["hash"] != digest:
+            return None
+        blocks, mi, error = entry["metrics"]
+        return FileMetrics([Block(*block) for block in blocks], mi, error)
+
+    def get_all(self, digests: dict[str, str]) -> dict[str, FileMetrics]:
+        """Gets metrics of files whose content hasn't changed."""
+        metrics = {}
+        for file, digest in digests.items():
+            each = self.get(file, digest)
+            if each is not None:
+                metrics[file] = each
+        return metrics
+
+    def save(self, metrics: dict[str, FileMetrics], digests: dict[str, str]) -> None:
+        """Saves metrics of current files only, to drop entries of removed files."""
+        self.files = {file: {"hash": digests[file], "metrics": each} for file, each in metrics.items()}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps({"version": self.version, "files": self.files}), encoding="utf-8")
+
+
+def analyze(files: list[str], *, cache: ComplexityCache, jobs: int = 0) -> dict[str, FileMetrics]:
+    """Analyzes files not cached across process pool.
+
+    Args:
+        files: Python files to analyze.
+        cache: Cache of metrics.
+        jobs: Maximum number of processes, 0 means default of ProcessPoolExecutor.
+    """
+    digests = {file: hash_indexed(file) for file in files}
+    cached = cache.get_all(digests)
+    missed = [file for file in files if file not in cached]
+    analyzed = {**cached, **dict(zip(missed, map_in_pool(missed, jobs)))}
+    metrics = {file: analyzed[file] for file in files}
+    cache.save(metrics, digests)
+    return metrics
+
+
+def map_in_pool(files: list[str], jobs: int) -> list[FileMetrics]:
+    """Analyzes files in processes, in this process when there is only one file or one job."""
+    if len(files) <= 1 or jobs == 1:
+        return [analyze_file(file) for file in files]
+    with ProcessPoolExecutor(max_workers=jobs or None) as executor:
+        return list(executor.map(analyze_file, files, chunksize=max(1, len(files) // 32)))
+
+
+def rank_cc(complexity: float) -> str:
+    """Same as radon.complexity.cc_rank()."""
+    thresholds = [5, 10, 20, 30, 40]
+    return RANKS[sum(complexity > threshold for threshold in thresholds)]
+
+
+def rank_mi(mi: float) -> str:
+    """Same as radon.metrics.mi_rank()."""
+    return "A" if mi > 19 else "B" if mi > 9 else "C"  # noqa: PLR2004
+
+
+def report_cc(metrics: dict[str, FileMetrics], *, min_rank: str = "A", show_complexity: bool = False) -> str:
+    """Formats cyclomatic complexity as same as Radon cc."""
+    lines = []
+    for file, each in metrics.items():
+        lines.extend(format_file_cc(file, each, min_rank=min_rank, show_complexity=show_complexity))
+    return "".join(f"{line}\n" for line in lines)
+
+
+def format_file_cc(file: str, metrics: FileMetrics, *, min_rank: str, show_complexity: bool) -> list[str]:
+    """Formats blocks of file ranked min rank or worse, nothing when there is no such block."""
+    if metrics.error:
+        return [file, f"    ERROR: {metrics.error}"]
+    blocks = filter_blocks(sort_blocks(metrics.blocks), min_rank)
+    lines = [f"    {format_block(block, show_complexity=show_complexity)}" for block in blocks]
+    return [file, *lines] if lines else []
+
+
+def filter_blocks(blocks: list[Block], min_rank: str) -> list[Block]:
+    return [block for block in blocks if rank_cc(block.complexity) >= min_rank]
+
+
+def sort_blocks(blocks: list[Block]) -> list[Block]:
+    return sorted(blocks, key=lambda block: -block.complexity)
+
+
+def format_block(block: Block, *, show_complexity: bool) -> str:
+    complexity = f" ({block.complexity})" if show_complexity else ""
+    return f"{block.letter} {block.lineno}:{block.col_offset} {block.name} - {rank_cc(block.complexity)}{complexity}"
+
+
+def report_mi(metrics: dict[str, FileMetrics], *, show: bool = False) -> str:
+    """Formats maintainability index as same as Radon mi."""
+    lines = []
+    for file, each in metrics.items():
+        if each.error:
+            lines.append(f"{file} - ERROR: {each.error}")
+            continue
+        value = f" ({each.mi:.2f})" if show else ""
+        lines.append(f"{file} - {rank_mi(each.mi)}{value}")
+    return "".join(f"{line}\n" for line in lines)
+
+
+def find_infractions(metrics: dict[str, FileMetrics], *, absolute: str, modules: str, average: str) -> list[str]:
+    """Finds blocks, average, and modules over thresholds as same as Xenon, which skips files can't be parsed."""
+    parsed = {file: each.blocks for file, each in metrics.items() if not each.error}
+    infractions = []
+    for file, blocks in parsed.items():
+        infractions.extend(find_block_infractions(file, blocks, absolute))
+    infractions.extend(find_average_infractions(parsed, average))
+    infractions.extend(find_module_infractions(parsed, modules))
+    return infractions
+
+
+def find_average_infractions(parsed: dict[str, list[Block]], average: str) -> list[str]:
+    rank = rank_average([block for blocks in parsed.values() for block in blocks])
+    return [f"average complexity is ranked {rank}"] if rank > average else []
+
+
+def find_module_infractions(parsed: dict[str, list[Block]], modules: str) -> list[str]:
+    ranks = {file: rank_average(blocks) for file, blocks in parsed.items()}
+    return [f"module {file!r} has a rank of {rank}" for file, rank in ranks.items() if rank > modules]
+
+
+def find_block_infractions(file: str, blocks: list[Block], absolute: str) -> list[str]:
+    return [
+        f'block "{file}:{block.lineno} {block.name}" has a rank of {rank_cc(block.complexity)}'
+        for block in sort_blocks(blocks)
+        if rank_cc(block.complexity) > absolute
+    ]
+
+
+def rank_average(blocks: list[Block]) -> str:
+    return rank_cc(sum(block.complexity for block in blocks) / len(blocks) if blocks else 0)
+
+
+def list_parse_errors(metrics: dict[str, FileMetrics]) -> list[str]:
+    return [f"cannot parse {file}: {each.error}" for file, each in metrics.items() if each.error]
+
+
+def to_result(command: str, stdout: str, *, failed: bool = False) -> Result:
+    """Prints output and builds result as if command ran, raises UnexpectedExit when failed."""
+    click.echo(stdout, nl=False)
+    result = Result(stdout=stdout, command=command, exited=1 if failed else 0)
+    reporter.record(result)
+    if failed:
+        raise UnexpectedExit(result)
+    return result
+
+
+def analyze_targets(jobs: int = 0, context: Context | None = None) -> dict[str, FileMetrics]:
+    """Analyzes all Python files to lint, in index when context enables it."""
+    return analyze(list_python_files(context=context), cache=ComplexityCache(), jobs=jobs)
+
+
+def read_radon_config() -> FileConfig:
+    """Reads configuration file of Radon as Radon CLI does."""
+    # Reason: Importing Radon is slow, so it should be imported only when analysis is required.
+    from radon.cli import FileConfig  # noqa: PLC0415 pylint: disable=import-outside-toplevel,redefined-outer-name
+
+    return FileConfig()
+
+
+def result_cc(command: str, metrics: dict[str, FileMetrics]) -> Result:
+    config = read_radon_config()
+    min_rank = str(config.get_value("cc_min", str, "A")).upper()
+    show_complexity = bool(config.get_value("show_complexity", bool, False))  # noqa: FBT003
+    return to_result(command, report_cc(metrics, min_rank=min_rank, show_complexity=show_complexity))
+
+
+def result_mi(command: str, metrics: dict[str, FileMetrics]) -> Result:
+    show = bool(read_radon_config().get_value("show_mi", bool, False))  # noqa: FBT003
+    return to_result(command, report_mi(metrics, show=show))
+
+
+def result_xenon(command: str, metrics: dict[str, FileMetrics], *, threshold: str = "A") -> Result:
+    """Checks thresholds of absolute, modules, and average as Xenon does, prints messages in format of Xenon."""
+    infractions = find_infractions(metrics, absolute=threshold, modules=threshold, average=threshold)
+    lines = [f"WARNING:xenon:{line}" for line in list_parse_errors(metrics)]
+    lines.extend(f"ERROR:xenon:{line}" for line in infractions)
+    return to_result(command, "".join(f"{line}\n" for line in lines), failed=bool(infractions))
@@ -0,0 +1,32 @@
+"""Configuration of invokelint in namespace invokelint of Invoke configuration, e.g. invoke.yaml."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import Any
+
+if TYPE_CHECKING:
+    from invoke import Context
+
+# Collections configure these defaults, so that environment variables such as INVOKE_INVOKELINT_STREAM=1 apply.
+DEFAULT_CONFIG = {
+    "invokelint": {
+        "stream": False,
+        "tail": 64 * 1024,
+        "warm": False,
+        "index": False,
+        # Files larger than this are skipped by index, e.g. generated files.
+        "max_file_size": 1024 * 1024,
+    },
+}
+
+
+def get_config(context: Context, key: str) -> Any:
+    """Gets value in namespace invokelint of configuration, default value when collection doesn't configure it."""
+    config = context.config.get("invokelint") or {}
+    return config.get(key, DEFAULT_CONFIG["invokelint"][key])
+
+
+def set_config(context: Context, **values: Any) -> None:
+    """Sets values in namespace invokelint of configuration, keeping the other values."""
+    context.config["invokelint"] = {**(context.config.get("invokelint") or {}), **values}
@@ -0,0 +1,340 @@
+"""Structured diagnostics parsed from machine-readable output of linters.
+
+Diagnostics are written into JSON Lines or SARIF file as soon as each tool finishes, so one run produces both output
+for human and output for CI.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+from contextlib import contextmanager
+from contextlib import suppress
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+from typing import NamedTuple
+
+from invokelint.path import CACHE_DIR
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from invoke import Result
+
+SEMGREP_JSON = CACHE_DIR.joinpath("semgrep.json")
+# Options to request output which has location and code of each diagnostic in a line.
+PARSEABLE_OPTIONS = {
+    "bandit": '--format custom --msg-template "{relpath}:{line}:{col}: {test_id} [{severity}] {msg}"',
+    "flake8": "--format default",
+    "mypy": "--show-column-numbers --no-pretty",
+    "pylint": '--msg-template "{path}:{line}:{column}: {msg_id} {msg} ({symbol})"',
+    "ruff": "--output-format concise",
+    "semgrep": f"--json-output {SEMGREP_JSON.as_posix()}",
+}
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+PATTERN_ANSI = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+# e.g. invokelint/lint.py:1:8: F401 [*] `os` imported but unused
+PATTERN_LOCATED = re.compile(
+    r"^(?P<path>[^\s:][^:]*):(?P<line>\d+):(?P<column>\d+): (?P<code>[\w-]+):? (?P<message>.*)$",
+)
+# e.g. invokelint/lint.py:2:12: error: Incompatible return value type (got "int", expected "str")  [return-value]
+PATTERN_MYPY = re.compile(
+    r"^(?P<path>[^\s:][^:]*):(?P<line>\d+):(?P<column>\d+): (?P<severity>error|note): "
+    r"(?P<message>.*?)(?:  \[(?P<code>[\w-]+)\])?$",
+)
+# e.g. invokelint/lint.py:4 in public function `f`:
+PATTERN_PYDOCSTYLE_LOCATION = re.compile(r"^(?P<path>\S[^:]*):(?P<line>\d+) (?:in|at) ")
+PATTERN_PYDOCSTYLE_MESSAGE = re.compile(r"^\s+(?P<code>D\d+): (?P<message>.*)$")
+PATTERN_XENON = re.compile(
+    r"^ERROR:xenon:(?:block \"(?P<path>[^:\"]+):(?P<line>\d+) [^\"]+\"|module '(?P<module>[^']+)') "
+    r"has a rank of (?P<rank>[A-F])$",
+)
+
+
+class Diagnostic(NamedTuple):
+    """Diagnostic common to all tools, line and column start from 1, and 0 means unknown.
+
+    Severity is one of levels of SARIF: error, warning, or note.
+    """
+
+    tool: str
+    path: str
+    line: int
+    column: int
+    code: str
+    message: str
+    severity: str = "error"
+
+
+def strip_ansi(text: str) -> str:
+    return PATTERN_ANSI.sub("", text)
+
+
+def parse_located(tool: str, stdout: str, *, offset: int = 0) -> list[Diagnostic]:
+    """Parses lines of format: path:line:column: code message.
+
+    Args:
+        tool: Name of tool.
+        stdout: Output of tool.
+        offset: Number to add to column to start from 1.
+    """
+    matches = (PATTERN_LOCATED.match(line) for line in stdout.splitlines())
+    return [
+        Diagnostic(
+            tool,
+            match["path"],
+            int(match["line"]),
+            int(match["column"]) + offset,
+            match["code"],
+            match["message"],
+        )
+        for match in matches
+        if match
+    ]
+
+
+def parse_ruff(stdout: str) -> list[Diagnostic]:
+    """Parses concise output of Ruff, drops mark of fixable."""
+    return [
+        (
+            diagnostic._replace(message=diagnostic.message[len("[*] ") :])
+            if diagnostic.message.startswith("[*] ")
+            else diagnostic
+        )
+        for diagnostic in parse_located("ruff", stdout)
+    ]
+
+
+def parse_bandit(stdout: str) -> list[Diagnostic]:
+    """Parses custom output of Bandit, severity LOW is reported as warning."""
+    return [convert_bandit(diagnostic) for diagnostic in parse_located("bandit", stdout, offset=1)]
+
+
+def convert_bandit(diagnostic: Diagnostic) -> Diagnostic:
+    match = re.match(r"\[(\w+)\] (.*)", diagnostic.message)
+    if not match:
+        return diagnostic
+    return diagnostic._replace(message=match[2], severity="warning" if match[1] == "LOW" else "error")
+
+
+def parse_mypy(stdout: str) -> list[Diagnostic]:
+    matches = (PATTERN_MYPY.match(line) for line in stdout.splitlines())
+    return [
+        Diagnostic(
+            "mypy",
+            match["path"],
+            int(match["line"]),
+            int(match["column"]),
+            match["code"] or "",
+            match["message"],
+            match["severity"],
+        )
+        for match in matches
+        if match
+    ]
+
+
+def parse_pydocstyle(stdout: str) -> list[Diagnostic]:
+    """Parses output of pydocstyle, which reports location and message in separate lines."""
+    lines = stdout.splitlines()
+    pairs = (
+        (PATTERN_PYDOCSTYLE_LOCATION.match(line), PATTERN_PYDOCSTYLE_MESSAGE.match(next_line))
+        for line, next_line in zip(lines, lines[1:])
+    )
+    return [
+        Diagnostic("pydocstyle", location["path"], int(location["line"]), 0, message["code"], message["message"])
+        for location, message in pairs
+        if location and message
+    ]
+
+
+def parse_dodgy(stdout: str) -> list[Diagnostic]:
+    """Parses JSON output of dodgy, which may follow messages of files can't be read."""
+    try:
+        content = json.loads(stdout[stdout.find("{") :])
+    except ValueError:
+        return []
+    return [
+        Diagnostic("dodgy", warning["path"], warning["line"], 0, warning["code"], warning["message"])
+        for warning in content["warnings"]
+    ]
+
+
+def parse_xenon(stdout: str) -> list[Diagnostic]:
+    """Parses infractions of blocks and modules, infraction of average has no location to report."""
+    matches = (PATTERN_XENON.match(line) for line in stdout.splitlines())
+    return [convert_xenon(match) for match in matches if match]
+
+
+def convert_xenon(match: re.Match[str]) -> Diagnostic:
+    message = match[0][len("ERROR:xenon:") :]
+    if match["module"]:
+        return Diagnostic("xenon", match["module"], 0, 0, "max-modules", message)
+    return Diagnostic("xenon", match["path"], int(match["line"]), 0, "max-absolute", message)
+
+
+# Reason: Compatibility with other parsers. pylint: disable-next=unused-argument
+def parse_semgrep(stdout: str) -> list[Diagnostic]:  # noqa: ARG001
+    """Parses JSON written by option --json-output since output of Semgrep for human spans multiple lines."""
+    try:
+        content = json.loads(SEMGREP_JSON.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+    return [convert_semgrep(result) for result in content["results"]]
+
+
+def clear_semgrep_json() -> None:
+    """Deletes JSON of the previous run, so that it isn't reported when Semgrep fails before writing JSON."""
+    with suppress(FileNotFoundError):
+        SEMGREP_JSON.unlink()
+
+
+def convert_semgrep(result: dict[str, Any]) -> Diagnostic:
+    start = result["start"]
+    extra = result["extra"]
+    severity = "error" if extra.get("severity") == "ERROR" else "warning"
+    return Diagnostic(
+        "semgrep",
+        result["path"],
+        start["line"],
+        start["col"],
+        result["check_id"],
+        extra["message"],
+        severity,
+    )
+
+
+PARSERS: dict[str, Callable[[str], list[Diagnostic]]] = {
+    "bandit": parse_bandit,
+    # The daemon outputs as same as mypy.
+    "dmypy": parse_mypy,
+    "dodgy": parse_dodgy,
+    "flake8": partial(parse_located, "flake8"),
+    "mypy": parse_mypy,
+    "pydocstyle": parse_pydocstyle,
+    "pylint": partial(parse_located, "pylint", offset=1),
+    "ruff": parse_ruff,
+    "semgrep": parse_semgrep,
+    "xenon": parse_xenon,
+}
+
+
+def detect_tool(command: str) -> str:
+    return Path(command.split(maxsplit=1)[0]).name if command.strip() else ""
+
+
+def parse(result: Result) -> list[Diagnostic] | None:
+    """Parses output of command, returns None when tool of command has no parser."""
+    parser = PARSERS.get(detect_tool(result.command))
+    return None if parser is None else parser(strip_ansi(result.stdout))
+
+
+def to_sarif(tools: list[str], diagnostics: list[Diagnostic]) -> dict[str, Any]:
+    """Builds SARIF log which has a run for each tool."""
+    runs = [
+        {
+            "tool": {"driver": {"name": tool}},
+            "results": [to_sarif_result(diagnostic) for diagnostic in diagnostics if diagnostic.tool == tool],
+        }
+        for tool in tools
+    ]
+    return {"$schema": SARIF_SCHEMA, "version": "2.1.0", "runs": runs}
+
+
+def to_sarif_result(diagnostic: Diagnostic) -> dict[str, Any]:
+    """Builds result of SARIF, region is omitted when line is unknown since SARIF requires it starts from 1."""
+    location: dict[str, Any] = {"artifactLocation": {"uri": diagnostic.path}}
+    if diagnostic.line:
+        region = {"startLine": diagnostic.line}
+        if diagnostic.column:
+            region["startColumn"] = diagnostic.column
+        location["region"] = region
+    return {
+        "ruleId": diagnostic.code,
+        "level": diagnostic.severity,
+        "message": {"text": diagnostic.message},
+        "locations": [{"physicalLocation": location}],
+    }
+
+
+def is_sarif(path: Path) -> bool:
+    return path.name.endswith((".sarif", ".sarif.json"))
+
+
+class Reporter:
+    """Writes diagnostics of each command when it finishes, thread-safe to record commands run concurrently.
+
+    JSON Lines file is appended, SARIF file is rewritten since it's a single JSON document.
+    """
+
+    def __init__(self) -> None:
+        self.path: Path | None = None
+        self.tools: list[str] = []
+        self.diagnostics: list[Diagnostic] = []
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def start(self, path: str) -> None:
+        """Starts recording into the file, truncates the file."""
+        with self.lock:
+            self.path = Path(path)
+            self.tools.clear()
+            self.diagnostics.clear()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text("", encoding="utf-8")
+            if is_sarif(self.path):
+                self.write([])
+
+    def stop(self) -> None:
+        with self.lock:
+            self.path = None
+
+    def record(self, result: Result) -> None:
+        """Parses output of command and writes its diagnostics, does nothing when tool of command has no parser."""
+        if self.path is None:
+            return
+        diagnostics = parse(result)
+        if diagnostics is None:
+            return
+        tool = detect_tool(result.command)
+        with self.lock:
+            if tool not in self.tools:
+                self.tools.append(tool)
+            self.diagnostics.extend(diagnostics)
+            self.write(diagnostics)
+
+    def write(self, diagnostics: list[Diagnostic]) -> None:
+        """Appends new diagnostics into JSON Lines, or rewrites SARIF with all diagnostics."""
+        if self.path is None:
+            return
+        if is_sarif(self.path):
+            self.path.write_text(json.dumps(to_sarif(self.tools, self.diagnostics), indent=2), encoding="utf-8")
+            return
+        with self.path.open("a", encoding="utf-8") as file:
+            file.writelines(json.dumps(diagnostic._asdict()) + "\n" for diagnostic in diagnostics)
+
+
+reporter = Reporter()
+
+
+def parseable_options(tool: str) -> str:
+    """Returns options to request parseable output of the tool while reporting, otherwise keeps output as is."""
+    return f" {PARSEABLE_OPTIONS[tool]}" if reporter.enabled else ""
+
+
+@contextmanager
+def reporting(path: str) -> Iterator[None]:
+    """Records diagnostics of commands into the file, nothing is recorded when path is empty."""
+    if path:
+        reporter.start(path)
+    try:
+        yield
+    finally:
+        reporter.stop()
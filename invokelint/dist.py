@@ -1,16 +1,46 @@
 """Tasks of build."""
 
+from __future__ import annotations
+
 import builtins
+import hashlib
+import json
+import os
+import shlex
+import sys
+from pathlib import Path
+from typing import Any
 
+import click
 from invoke import Collection
 from invoke import Context
 from invoke import Result
 from invoke import task
 
-from invokelint._clean import clean_all
+from invokelint._clean import DIST_PATTERNS
+from invokelint._clean import DIST_ROOT_DIRECTORIES
+from invokelint._clean import clean
+from invokelint.config import DEFAULT_CONFIG
+from invokelint.path import CACHE_DIR
+from invokelint.path import filter_directories
+from invokelint.path import list_existing_modules
+from invokelint.path import paths
+from invokelint.path.index import hash_file
 from invokelint.run import run_in_pty
 
+DIST_DIR = Path("dist")
+# Stored out of dist/ so that `twine upload dist/*` uploads only packages.
+MANIFEST_FILE = CACHE_DIR.joinpath("dist.json")
+BUILD_ENV_DIR = CACHE_DIR.joinpath("build-env")
+# Files which affect metadata or contents of packages in addition to files in packages.
+BUILD_FILES = ["pyproject.toml", "setup.cfg", "setup.py", "MANIFEST.in", "README.md", "README.rst", "LICENSE"]
+HELP = {
+    "no_isolation": "Builds in environment cached in .invokelint_cache/ instead of fresh isolated environment",
+    "force": "Builds even if packages in dist/ match sources",
+}
+
 ns = Collection()
+ns.configure(DEFAULT_CONFIG)
 
 
 def module_exists(module_name: str) -> bool:
@@ -26,16 +56,142 @@ def module_exists(module_name: str) -> bool:
     return True
 
 
-@task(clean_all)
-def dist(context: Context) -> Result:
-    """Builds source and wheel packages into dist/ directory."""
-    if module_exists("build"):
-        return run_in_pty(context, "python -m build")
-    if module_exists("wheel"):
-        run_in_pty(context, "python setup.py sdist")
-        return run_in_pty(context, "python setup.py bdist_wheel")
+def find_builder() -> str:
+    """Finds module to build packages, fails before anything is cleaned up when neither exists."""
+    for module_name in ("build", "wheel"):
+        if module_exists(module_name):
+            return module_name
     msg = "Neither build nor wheel module exists. Run `pip install build` or `pip install wheel`."
     raise ModuleNotFoundError(msg)
 
 
+def list_package_files(directory: str) -> list[str]:
+    """Lists all files under package in stable order, since packages may include data files."""
+    files: list[str] = []
+    for root, dirs, names in os.walk(directory):
+        dirs[:] = filter_directories(dirs)
+        files.extend(str(Path(root, name)) for name in sorted(names))
+    return files
+
+
+def list_input_files() -> list[str]:
+    """Lists files which packages are built from."""
+    files = [*BUILD_FILES, *list_existing_modules(paths.setuptools_python_modules)]
+    for package in paths.production_packages:
+        files.extend(list_package_files(package))
+    return files
+
+
+def hash_inputs(builder: str) -> str:
+    """Hashes content of input files, which don't exist are hashed as empty."""
+    lines = [builder]
+    lines.extend(f"{file}:{hash_file(file)}" for file in list_input_files())
+    return hashlib.sha256("\n".join(lines).encode()).hexdigest()
+
+
+def hash_artifacts() -> dict[str, str]:
+    """Hashes packages in dist/, returns nothing when dist/ doesn't exist."""
+    if not DIST_DIR.is_dir():
+        return {}
+    return {file.name: hash_file(file) for file in sorted(DIST_DIR.iterdir()) if file.is_file()}
+
+
+def read_manifest() -> dict[str, Any]:
+    try:
+        manifest: dict[str, Any] = json.loads(MANIFEST_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return manifest
+
+
+def write_manifest(inputs: str) -> None:
+    # Reason: Manifest is optional, packages are just rebuilt next time if it can't be written.
+    try:
+        MANIFEST_FILE.parent.mkdir(parents=True, exist_ok=True)
+        MANIFEST_FILE.write_text(json.dumps({"inputs": inputs, "artifacts": hash_artifacts()}), encoding="utf-8")
+    except OSError:
+        pass
+
+
+def is_up_to_date(inputs: str) -> bool:
+    """Checks whether packages in dist/ are the ones built from the same inputs."""
+    artifacts = hash_artifacts()
+    return bool(artifacts) and read_manifest() == {"inputs": inputs, "artifacts": artifacts}
+
+
+def get_build_env_python() -> Path:
+    return BUILD_ENV_DIR.joinpath("Scripts" if os.name == "nt" else "bin", "python")
+
+
+def list_build_requires() -> list[str]:
+    """Lists requirements in [build-system] of pyproject.toml, or default of PEP 518 when it doesn't exist."""
+    # Reason: Importing build is required only when building without isolation.
+    import build  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+    return sorted(build.ProjectBuilder(".").build_system_requires)
+
+
+def list_backend_requires(python: Path) -> list[str]:
+    """Lists requirements which backend installed in environment requests to build, e.g. wheel of old setuptools."""
+    # Reason: Importing build is required only when building without isolation.
+    import build  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+    builder = build.ProjectBuilder(".", python_executable=str(python))
+    return sorted(builder.get_requires_for_build("sdist") | builder.get_requires_for_build("wheel"))
+
+
+def read_stamp(stamp: Path) -> str:
+    try:
+        return stamp.read_text(encoding="utf-8")
+    except OSError:
+        return ""
+
+
+def install_requires(context: Context, python: Path, requires: list[str], stamp: Path) -> None:
+    """Installs requirements into environment unless they are the same as stamp."""
+    if read_stamp(stamp) == json.dumps(requires):
+        return
+    if requires:
+        run_in_pty(context, f"{shlex.quote(str(python))} -m pip install {' '.join(map(shlex.quote, requires))}")
+    stamp.write_text(json.dumps(requires), encoding="utf-8")
+
+
+def prepare_build_env(context: Context) -> str:
+    """Creates build environment once, installs requirements again only when they change, returns its Python."""
+    python = get_build_env_python()
+    if not python.exists():
+        # Same interpreter as invoke, not the first python in PATH, so that packages are built for the project's Python.
+        run_in_pty(context, f"{shlex.quote(sys.executable)} -m venv {shlex.quote(BUILD_ENV_DIR.as_posix())}")
+    install_requires(context, python, ["build", *list_build_requires()], BUILD_ENV_DIR.joinpath("requires.json"))
+    # Backend can tell its requirements only after it is installed.
+    install_requires(context, python, list_backend_requires(python), BUILD_ENV_DIR.joinpath("backend.json"))
+    return shlex.quote(str(python))
+
+
+def build_packages(context: Context, builder: str, *, no_isolation: bool) -> Result:
+    """Builds source and wheel packages by builder."""
+    if builder == "wheel":
+        run_in_pty(context, "python setup.py sdist")
+        return run_in_pty(context, "python setup.py bdist_wheel")
+    if no_isolation:
+        return run_in_pty(context, f"{prepare_build_env(context)} -m build --no-isolation")
+    return run_in_pty(context, "python -m build")
+
+
+@task(help=HELP)
+def dist(context: Context, *, no_isolation: bool = False, force: bool = False) -> Result:
+    """Builds source and wheel packages into dist/ directory, skips when they are built from the same sources."""
+    builder = find_builder()
+    inputs = hash_inputs(builder)
+    if not force and is_up_to_date(inputs):
+        message = "Packages in dist/ are up to date, skipped build.\n"
+        click.echo(message, nl=False)
+        return Result(stdout=message)
+    # Cleans up only outputs of build, since previous packages would be mixed into dist/.
+    clean(DIST_ROOT_DIRECTORIES, DIST_PATTERNS, excludes=None, jobs=1)
+    result = build_packages(context, builder, no_isolation=no_isolation)
+    write_manifest(inputs)
+    return result
+
+
 ns.add_task(dist, default=True)
@@ -0,0 +1,62 @@
+"""Runs mypy by its daemon, which keeps program state in memory to check only changes."""
+
+from __future__ import annotations
+
+import hashlib
+import sys
+from typing import TYPE_CHECKING
+
+from invokelint.cache import fingerprint_executable
+from invokelint.path import CACHE_DIR
+from invokelint.path.index import hash_file
+from invokelint.run import run_in_pty
+
+if TYPE_CHECKING:
+    from invoke import Context
+    from invoke import Result
+
+STATUS_FILE = CACHE_DIR.joinpath("dmypy.json")
+FINGERPRINT_FILE = CACHE_DIR.joinpath("dmypy_fingerprint")
+# The daemon restarts by itself when options change, but not when plugins or interpreter change.
+CONFIG_FILES = ["pyproject.toml", "setup.cfg", "mypy.ini", ".mypy.ini"]
+
+
+def build_command(subcommand: str) -> str:
+    return f"dmypy --status-file {STATUS_FILE.as_posix()} {subcommand}"
+
+
+def fingerprint() -> str:
+    """Identifies interpreter, mypy, and configuration which the daemon has loaded."""
+    lines = [sys.executable, fingerprint_executable("dmypy")]
+    lines.extend(f"{config_file}:{hash_file(config_file)}" for config_file in CONFIG_FILES)
+    return hashlib.sha256("\n".join(lines).encode()).hexdigest()
+
+
+def read_fingerprint() -> str:
+    try:
+        return FINGERPRINT_FILE.read_text(encoding="utf-8")
+    except OSError:
+        return ""
+
+
+def run(context: Context, targets: str, *, options: str = "") -> Result:
+    """Checks targets by the daemon, starts it on demand and restarts it when interpreter or configuration changed.
+
+    Args:
+        context: Context.
+        targets: Targets joined by space.
+        options: Options of mypy which start with space.
+    """
+    current = fingerprint()
+    if read_fingerprint() != current:
+        stop(context)
+        FINGERPRINT_FILE.parent.mkdir(parents=True, exist_ok=True)
+        FINGERPRINT_FILE.write_text(current, encoding="utf-8")
+    return run_in_pty(context, build_command(f"run --{options} {targets}"))
+
+
+def stop(context: Context) -> list[Result]:
+    """Stops the daemon when it may be running."""
+    if not STATUS_FILE.exists():
+        return []
+    return [run_in_pty(context, build_command("stop"), warn=True)]
@@ -0,0 +1,216 @@
+"""Map from source files to tests which execute them, to select tests affected by changes."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from invokelint.path import CACHE_DIR
+from invokelint.path import is_in_targets
+from invokelint.path import paths
+from invokelint.path.index import hash_file
+
+if TYPE_CHECKING:
+    from invokelint.path.imports import ImportGraph
+
+MAP_FILE = CACHE_DIR.joinpath("test_map.json")
+RCFILE = CACHE_DIR.joinpath("test_map.coveragerc")
+DATA_FILE = CACHE_DIR.joinpath("test_map.coverage")
+JSON_FILE = CACHE_DIR.joinpath("test_map_coverage.json")
+# Changes in these files may affect any test, so all tests run.
+FILES_AFFECTING_ALL_TESTS = ["pyproject.toml", "setup.cfg", "setup.py", "tox.ini", "pytest.ini", ".coveragerc"]
+
+
+def build_stamp() -> str:
+    """Hashes files affecting all tests, the map is stale when this changes."""
+    files = [*FILES_AFFECTING_ALL_TESTS, *list_conftest_files()]
+    return hashlib.sha256("\n".join(f"{file}:{hash_file(file)}" for file in files).encode()).hexdigest()
+
+
+def list_conftest_files() -> list[str]:
+    files = [str(path) for directory in paths.existing_test_packages for path in Path(directory).rglob("conftest.py")]
+    return sorted(["conftest.py", *files])
+
+
+def is_affecting_all_tests(file: str) -> bool:
+    return file in FILES_AFFECTING_ALL_TESTS or Path(file).name == "conftest.py"
+
+
+def is_test_module(file: str) -> bool:
+    name = Path(file).name
+    return name.startswith("test_") and name.endswith(".py")
+
+
+def is_test_file(file: str) -> bool:
+    return is_in_targets(file, paths.existing_test_packages) and is_test_module(file)
+
+
+def select_importing_tests(file: str, graph: ImportGraph | None) -> list[str] | None:
+    """Selects test modules importing file transitively, returns None when they are unknown."""
+    if graph is None:
+        return None
+    test_files = [importer for importer in graph.expand([file])[1:] if is_test_file(importer)]
+    return test_files or None
+
+
+def build_coverage_config() -> str:
+    """Builds configuration of Coverage.py which records which test executes each line.
+
+    It doesn't inherit configuration of project since configuration file of Coverage.py can't include others.
+    """
+    source = ",".join(Path(package).stem for package in paths.production_packages)
+    return (
+        "[run]\n"
+        f"data_file = {DATA_FILE.as_posix()}\n"
+        "dynamic_context = test_function\n"
+        "relative_files = True\n"
+        f"source = {source}\n"
+    )
+
+
+def convert_to_node_id(label: str) -> str | None:
+    """Converts context label of Coverage.py into node ID of pytest.
+
+    e.g. tests.test_lint.TestClass.test_method -> tests/test_lint.py::TestClass::test_method
+    """
+    parts = label.split(".")
+    for index in range(len(parts) - 1, 0, -1):
+        module = "/".join(parts[:index]) + ".py"
+        if Path(module).is_file():
+            return "::".join([module, *parts[index:]])
+    return None
+
+
+def parse_coverage_json(content: dict[str, dict[str, dict[str, dict[str, list[str]]]]]) -> dict[str, list[str]]:
+    """Parses JSON report of Coverage.py with contexts into map from source file to node IDs of tests."""
+    return {Path(file).as_posix(): list_node_ids(report["contexts"]) for file, report in content["files"].items()}
+
+
+def list_node_ids(contexts: dict[str, list[str]]) -> list[str]:
+    """Lists node IDs of tests from contexts of lines, empty label means out of tests such as importing."""
+    labels = set().union(*contexts.values()) - {""}
+    node_ids = {convert_to_node_id(label) for label in labels}
+    return sorted(node_id for node_id in node_ids if node_id)
+
+
+def is_selected(node_id: str, selectors: list[str]) -> bool:
+    """Checks whether node ID is selected by pytest arguments of node IDs or test files."""
+    return any(node_id == selector or node_id.startswith(f"{selector}::") for selector in selectors)
+
+
+def resolve_node_ids(selectors: list[str]) -> list[str]:
+    """Resolves recorded selectors into arguments of pytest, since tests may be renamed or deleted after recorded.
+
+    Test file is selected instead of test no longer defined in it, tests in deleted file are dropped.
+    """
+    sources: dict[str, str] = {}
+    resolved: list[str] = []
+    for selector in selectors:
+        argument = resolve_node_id(selector, sources)
+        if argument is not None and argument not in resolved:
+            resolved.append(argument)
+    return drop_tests_in_files(resolved)
+
+
+def drop_tests_in_files(arguments: list[str]) -> list[str]:
+    """Drops node IDs of tests in test files given as arguments, since they run anyway."""
+    files = [argument for argument in arguments if "::" not in argument]
+    return [argument for argument in arguments if not is_test_in_files(argument, files)]
+
+
+def is_test_in_files(argument: str, files: list[str]) -> bool:
+    file, separator, _ = argument.partition("::")
+    return bool(separator) and file in files
+
+
+def resolve_node_id(selector: str, sources: dict[str, str]) -> str | None:
+    """Resolves node ID or test file, sources are cache of test files read so far."""
+    file, _, names = selector.partition("::")
+    if not Path(file).is_file():
+        return None
+    if file not in sources:
+        sources[file] = Path(file).read_text(encoding="utf-8", errors="replace")
+    name = names.rsplit("::", 1)[-1]
+    return selector if re.search(rf"\bdef {re.escape(name)}\(", sources[file]) else file
+
+
+class ImpactMap:
+    """Map from source file to node IDs of tests which execute it."""
+
+    def __init__(self, path: Path = MAP_FILE) -> None:
+        self.path = path
+        self.files: dict[str, list[str]] = {}
+        self.stamp = ""
+        try:
+            content = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        self.files = content["files"]
+        self.stamp = content["stamp"]
+
+    def is_valid(self, stamp: str) -> bool:
+        return bool(self.files) and self.stamp == stamp
+
+    def select(self, changed_files: list[str], graph: ImportGraph | None = None) -> list[str] | None:
+        """Selects tests affected by changed files, returns None when all tests should run."""
+        selected: list[str] = []
+        for file in changed_files:
+            node_ids = self.select_by_file(file, graph)
+            if node_ids is None:
+                return None
+            selected.extend(node_ids)
+        return resolve_node_ids(selected)
+
+    def select_by_file(self, file: str, graph: ImportGraph | None = None) -> list[str] | None:
+        """Selects tests affected by changed file, returns None when all tests should run."""
+        if is_affecting_all_tests(file):
+            return None
+        if not is_in_targets(file, [*paths.existing_test_packages, *paths.production_packages]):
+            return []
+        if not Path(file).exists():
+            return self.select_by_deleted_file(file)
+        return self.select_by_existing_file(file, graph)
+
+    def select_by_existing_file(self, file: str, graph: ImportGraph | None) -> list[str] | None:
+        """Selects test module itself, or tests which executed file or import it."""
+        if is_test_file(file):
+            return [file]
+        # Helpers of tests aren't measured and files not measured yet such as new module have no record,
+        # so tests importing them are selected instead.
+        node_ids = self.files.get(file)
+        return select_importing_tests(file, graph) if node_ids is None else node_ids
+
+    def select_by_deleted_file(self, file: str) -> list[str] | None:
+        """Selects tests which executed deleted file, returns None when they are unknown.
+
+        Tests importing deleted file fail, but the import graph no longer knows them. Tests in deleted test files are
+        dropped when node IDs are resolved.
+        """
+        return [] if is_test_file(file) else self.files.get(file)
+
+    def update(self, files: dict[str, list[str]], node_ids: list[str] | None) -> None:
+        """Updates records of rerun tests, replaces all records when node IDs are None which means all tests ran."""
+        if node_ids is None:
+            self.files = files
+            return
+        self.remove(node_ids)
+        for file, list_node_id in files.items():
+            self.files[file] = sorted({*self.files.get(file, []), *list_node_id})
+
+    def remove(self, selectors: list[str]) -> None:
+        """Removes records of tests selected by selectors."""
+        for file, list_node_id in self.files.items():
+            self.files[file] = [node_id for node_id in list_node_id if not is_selected(node_id, selectors)]
+
+    def save(self, stamp: str) -> None:
+        """Saves the map with stamp of files affecting all tests."""
+        self.stamp = stamp
+        # Reason: Map is optional, all tests just run next time if it can't be written.
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps({"stamp": stamp, "files": self.files}, indent=2), encoding="utf-8")
+        except OSError:
+            pass
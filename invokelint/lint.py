@@ -3,42 +3,99 @@
 from __future__ import annotations
 
 import platform
+import shlex
+from functools import partial
+from functools import update_wrapper
+from pathlib import Path
 from typing import TYPE_CHECKING
 from typing import Any
 
+import click
 from invoke import Collection
 from invoke import Context
 from invoke import Result
 from invoke import task
 
+from invokelint import complexity
+from invokelint import dmypy
 from invokelint import ruff as ruff_commands
-from invokelint.path import PYTHON_DIRS
+from invokelint.budget import RuntimeHistory
+from invokelint.budget import resolve_deadline
+from invokelint.budget import run_within_budget
+from invokelint.cache import wrap_tasks
+from invokelint.config import DEFAULT_CONFIG
+from invokelint.config import set_config
+from invokelint.diagnostics import clear_semgrep_json
+from invokelint.diagnostics import parseable_options
+from invokelint.diagnostics import reporting
+from invokelint.path import is_nothing_changed
+from invokelint.path import join_targets
+from invokelint.path import paths
+from invokelint.path import resolve_targets
+from invokelint.path.imports import expand_to_importers
+from invokelint.path.index import get_index
+from invokelint.path.index import list_ignored_paths
+from invokelint.run import build_buffered_context
+from invokelint.run import count_cpus
 from invokelint.run import run_all
+from invokelint.run import run_all_capturing
 from invokelint.run import run_in_order
+from invokelint.run import run_in_parallel
 from invokelint.run import run_in_pty
+from invokelint.run import run_with_input
+from invokelint.semgrep_rules import REGISTRY_CONFIG
+from invokelint.semgrep_rules import RULES_FILE
+from invokelint.semgrep_rules import resolve_config
+from invokelint.semgrep_rules import snapshot
+from invokelint.serve import serve as serve_requests
+from invokelint.shard import HELP_SHARDS
+from invokelint.shard import run_sharded
 from invokelint.style import fmt
+from invokelint.timing import profiling
+from invokelint.warm import warm_up
+from invokelint.watch import HELP_WATCH
+from invokelint.watch import watch as watch_files
 
 if TYPE_CHECKING:
     from invokelint.run import TaskFunction
 
 ns = Collection()
+ns.configure(DEFAULT_CONFIG)
 
 
-@task
-def radon_cc(context: Context) -> list[Result]:
+HELP_COMPLEXITY = {
+    "in_process": "Analyzes in this process by Radon API, parsing each file once and caching results by file content",
+    "jobs": "Analyzes files by N processes with --in-process (0: number of CPUs)",
+}
+
+
+@task(help=HELP_COMPLEXITY)
+def radon_cc(context: Context, *, in_process: bool = False, jobs: int = 0) -> list[Result]:
     """Reports code complexity."""
-    return [context.run(f"radon cc {' '.join(PYTHON_DIRS)}")]
+    command = f"radon cc {join_targets()}"
+    if in_process:
+        return [complexity.result_cc(command, complexity.analyze_targets(jobs, context))]
+    return [run_in_pty(context, command)]
 
 
-@task
-def radon_mi(context: Context) -> list[Result]:
+@task(help=HELP_COMPLEXITY)
+def radon_mi(context: Context, *, in_process: bool = False, jobs: int = 0) -> list[Result]:
     """Reports maintainability index."""
-    return [context.run(f"radon mi {' '.join(PYTHON_DIRS)}")]
+    command = f"radon mi {join_targets()}"
+    if in_process:
+        return [complexity.result_mi(command, complexity.analyze_targets(jobs, context))]
+    return [run_in_pty(context, command)]
 
 
-@task
-def radon(context: Context) -> list[Result]:
+@task(help=HELP_COMPLEXITY)
+def radon(context: Context, *, in_process: bool = False, jobs: int = 0) -> list[Result]:
     """Reports radon both code complexity and maintainability index."""
+    if in_process:
+        metrics = complexity.analyze_targets(jobs, context)
+        return [
+            complexity.result_cc(f"radon cc {join_targets()}", metrics),
+            complexity.result_mi(f"radon mi {join_targets()}", metrics),
+        ]
     return run_all([radon_cc, radon_mi], context)
 
 
@@ -47,22 +104,33 @@ ns.add_task(radon_mi)
 ns.add_task(radon)
 
 
-@task
-def cohesion(context: Context) -> list[Result]:
+@task(help={"jobs": "Runs Cohesion for N directories concurrently (0: number of CPUs, 1: one by one)"})
+def cohesion(context: Context, *, jobs: int = 0) -> list[Result]:
     """Lints code with Cohesion."""
     # 2021-10-24:
     # Cohesion doesn't support multiple directories in 1 command.
     # Only the last directory enables when supply multiple --directory options.
-    return [run_in_pty(context, f"cohesion --directory {directory}") for directory in PYTHON_DIRS]
+    list_task: list[TaskFunction] = [partial(run_cohesion, directory=directory) for directory in paths.python_dirs]
+    if jobs == 1:
+        return run_in_order(list_task, context)
+    # Outputs are printed in order of directories, and all failures are reported together.
+    return run_in_parallel(list_task, context, jobs=jobs or count_cpus(), fail_fast=False)
+
+
+# Reason: Compatibility with TaskFunction to be called from run_in_parallel(). pylint: disable=unused-argument
+def run_cohesion(context: Context, *, directory: str, **kwargs: Any) -> list[Result]:  # noqa: ARG001
+    return [run_in_pty(context, f"cohesion --directory {directory}")]
 
 
 ns.add_task(cohesion)
 
 
-@task
-def xenon(context: Context) -> list[Result]:
+@task(help=HELP_COMPLEXITY)
+def xenon(context: Context, *, in_process: bool = False, jobs: int = 0) -> list[Result]:
     """Checks code complexity."""
-    command = f"xenon --max-absolute A --max-modules A --max-average A {' '.join(PYTHON_DIRS)}"
+    command = f"xenon --max-absolute A --max-modules A --max-average A {join_targets()}"
+    if in_process:
+        return [complexity.result_xenon(command, complexity.analyze_targets(jobs, context))]
     return [run_in_pty(context, command)]
 
 
@@ -71,32 +139,50 @@ def call_xenon(context: Context, **kwargs: Any) -> list[Result]:  # noqa: ARG001
     return xenon(context)
 
 
-@task(name="ruff")
-def ruff_task(context: Context) -> list[Result]:
+HELP_TARGETS = "Python file or directory to lint instead of project paths (repeatable)"
+HELP_PROFILE = "Prints summary table of wall time, CPU time, and peak RSS of each tool"
+HELP_PROFILE_JSON = "Writes the summary of --profile as JSON into the file"
+HELP_REPORT = "Writes diagnostics of each tool into the file as JSON Lines, or SARIF when it ends with .sarif"
+
+
+@task(name="ruff", help={"targets": HELP_TARGETS}, iterable=["targets"])
+def ruff_task(context: Context, *, targets: list[str] | None = None) -> list[Result]:
     """Lints code with Ruff."""
-    return ruff_commands.chk(context)
+    return ruff_commands.chk(context, targets=targets)
 
 
 # Reason: Compatibility with semgrep task to be called from fast().. pylint: disable=unused-argument
-def call_ruff(context: Context, **kwargs: Any) -> list[Result]:  # noqa: ARG001
-    return ruff_task(context)
+def call_ruff(context: Context, *, targets: list[str] | None = None, **kwargs: Any) -> list[Result]:  # noqa: ARG001
+    return ruff_task(context, targets=targets)
 
 
-@task
-def bandit(context: Context) -> list[Result]:
+@task(help={"targets": HELP_TARGETS, "shards": HELP_SHARDS}, iterable=["targets"])
+def bandit(context: Context, *, targets: list[str] | None = None, shards: int = 1) -> list[Result]:
     """Lints code with bandit."""
-    return [run_in_pty(context, f"bandit --configfile pyproject.toml --recursive {' '.join(PYTHON_DIRS)}")]
+    command = f"bandit{parseable_options('bandit')} --configfile pyproject.toml --recursive"
+    return [run_sharded(context, command, targets=targets, shards=shards)]
 
 
 # Reason: Compatibility with semgrep task to be called from fast().. pylint: disable=unused-argument
-def call_bandit(context: Context, **kwargs: Any) -> list[Result]:  # noqa: ARG001
-    return bandit(context)
+def call_bandit(
+    context: Context,
+    *,
+    targets: list[str] | None = None,
+    shards: int = 1,
+    **kwargs: Any,  # noqa: ARG001
+) -> list[Result]:
+    """Lints code with bandit, keyword arguments for other tasks are ignored."""
+    return bandit(context, targets=targets, shards=shards)
 
 
 @task
 def dodgy(context: Context) -> list[Result]:
     """Lints code with dodgy."""
-    return [run_in_pty(context, "dodgy --ignore-paths csvinput")]
+    ignore_paths = ["csvinput"]
+    if get_index(context) is not None:
+        # dodgy scans whole working directory, so entries which .gitignore ignores are skipped in the same way as index.
+        ignore_paths.extend(shlex.quote(path) for path in list_ignored_paths())
+    return [run_in_pty(context, f"dodgy --ignore-paths {' '.join(ignore_paths)}")]
 
 
 # Reason: Compatibility with semgrep task to be called from fast().. pylint: disable=unused-argument
@@ -104,11 +190,12 @@ def call_dodgy(context: Context, **kwargs: Any) -> list[Result]:  # noqa: ARG001
     return dodgy(context)
 
 
-@task
-def flake8(context: Context, *, radon_show_closures: bool = True) -> list[Result]:
+@task(help={"targets": HELP_TARGETS}, iterable=["targets"])
+def flake8(context: Context, *, radon_show_closures: bool = True, targets: list[str] | None = None) -> list[Result]:
     """Lints code with flake8."""
     radon_flag = " --radon-show-closures" if radon_show_closures else ""
-    return [run_in_pty(context, f"flake8{radon_flag} {' '.join(PYTHON_DIRS)}")]
+    # flake8 checks files by processes for each CPU by itself, so files are chunked only to fit in command line.
+    return [run_sharded(context, f"flake8{radon_flag}{parseable_options('flake8')}", targets=targets, shards=1)]
 
 
 # Reason: Compatibility with semgrep task to be called from fast().. pylint: disable=unused-argument
@@ -117,21 +204,29 @@ def call_flake8(  # pylint: disable=redefined-outer-name
     *,
     xenon: bool = False,
     no_xenon: bool = False,
+    targets: list[str] | None = None,
     **kwargs: Any,  # noqa: ARG001
 ) -> list[Result]:
     """Calls flake8 with radon_show_closures enabled only when xenon is active."""
-    return flake8(context, radon_show_closures=xenon and not no_xenon)
+    return flake8(context, radon_show_closures=xenon and not no_xenon, targets=targets)
 
 
-@task
-def pydocstyle(context: Context) -> list[Result]:
+@task(help={"targets": HELP_TARGETS, "shards": HELP_SHARDS}, iterable=["targets"])
+def pydocstyle(context: Context, *, targets: list[str] | None = None, shards: int = 1) -> list[Result]:
     """Lints code with pydocstyle."""
-    return [run_in_pty(context, f"pydocstyle {' '.join(PYTHON_DIRS)}")]
+    return [run_sharded(context, "pydocstyle", targets=targets, shards=shards)]
 
 
 # Reason: Compatibility with semgrep task to be called from fast().. pylint: disable=unused-argument
-def call_pydocstyle(context: Context, **kwargs: Any) -> list[Result]:  # noqa: ARG001
-    return pydocstyle(context)
+def call_pydocstyle(
+    context: Context,
+    *,
+    targets: list[str] | None = None,
+    shards: int = 1,
+    **kwargs: Any,  # noqa: ARG001
+) -> list[Result]:
+    """Lints code with pydocstyle, keyword arguments for other tasks are ignored."""
+    return pydocstyle(context, targets=targets, shards=shards)
 
 
 @task(
@@ -143,9 +238,19 @@ def call_pydocstyle(context: Context, **kwargs: Any) -> list[Result]:  # noqa: A
         "xenon": "Runs xenon",
         "no_xenon": "Skips Xenon linting.",
         "pydocstyle": "Runs pydocstyle",
+        "jobs": "Runs linters concurrently by N threads and prints outputs in order (0: number of CPUs + 4, max 32)",
+        "keep_going": "Runs all linters even if some of them fail",
+        "changed": "Lints only Python files changed from --base or untracked",
+        "base": "Git revision to compare with for --changed (default: HEAD)",
+        "cache": "Skips linters whose inputs haven't changed since the last passing run",
+        "profile": HELP_PROFILE,
+        "profile_json": HELP_PROFILE_JSON,
+        "report": HELP_REPORT,
+        "budget": "Runs linters expected to finish within the duration (e.g. 10s) by recorded runtimes, cheapest first",
+        "shards": f"{HELP_SHARDS}, for docformatter, bandit, and pydocstyle",
     },
 )
-# Reason: For specification  pylint: disable=too-many-arguments
+# Reason: For specification  pylint: disable=too-many-arguments,too-many-locals
 def fast(  # noqa: PLR0913
     context: Context,
     *,
@@ -158,19 +263,144 @@ def fast(  # noqa: PLR0913
     no_xenon: bool = False,
     # Reason: To name command line option.
     pydocstyle: bool = False,  # pylint: disable=redefined-outer-name
+    jobs: int = 1,
+    keep_going: bool = False,
+    changed: bool = False,
+    base: str = "HEAD",
+    cache: bool = False,
+    profile: bool = False,
+    profile_json: str = "",
+    report: str = "",
+    budget: str = "",
+    shards: int = 1,
 ) -> list[Result]:
     """Runs fast linting (ruff, bandit, dodgy, flake8, pydocstyle).
 
     Xenon runs when --xenon is given.
     """
-    list_result = [] if skip_format else fmt(context, ruff=ruff, by_ruff=by_ruff, no_ruff=no_ruff)
-    tasks: list[TaskFunction] = [call_ruff, call_bandit, call_dodgy, call_flake8]
-    if xenon and not no_xenon:
+    with profiling(enabled=profile, json_path=profile_json), reporting(report):
+        return run_fast(
+            context,
+            skip_format=skip_format,
+            ruff=ruff,
+            by_ruff=by_ruff,
+            no_ruff=no_ruff,
+            xenon=xenon,
+            no_xenon=no_xenon,
+            pydocstyle=pydocstyle,
+            jobs=jobs,
+            keep_going=keep_going,
+            changed=changed,
+            base=base,
+            cache=cache,
+            budget=budget,
+            shards=shards,
+        )
+
+
+# Reason: For specification  pylint: disable-next=too-many-arguments,too-many-locals
+def run_fast(  # noqa: PLR0913
+    context: Context,
+    *,
+    skip_format: bool,
+    ruff: bool,
+    by_ruff: bool,
+    no_ruff: bool,
+    # Reason: To name as same as command line option.
+    xenon: bool,  # pylint: disable=redefined-outer-name
+    no_xenon: bool,
+    # Reason: To name as same as command line option.
+    pydocstyle: bool,  # pylint: disable=redefined-outer-name
+    jobs: int,
+    keep_going: bool,
+    changed: bool,
+    base: str,
+    cache: bool,
+    budget: str,
+    shards: int,
+) -> list[Result]:
+    """Runs fast linting with options resolved by task fast."""
+    # Budget includes time to format.
+    deadline = resolve_deadline(budget)
+    targets = resolve_targets(context, changed=changed, base=base, targets=None)
+    if is_nothing_changed(changed=changed, targets=targets):
+        return []
+    list_result = (
+        []
+        if skip_format
+        else fmt(
+            context,
+            ruff=ruff,
+            by_ruff=by_ruff,
+            no_ruff=no_ruff,
+            targets=targets,
+            shards=shards,
+        )
+    )
+    # Style already ran Ruff check on the same targets unless it leaves Ruff warnings.
+    tasks = build_fast_tasks(xenon=xenon and not no_xenon, pydocstyle=pydocstyle, ruff=skip_format or ruff)
+    tasks = wrap_tasks(tasks, enabled=cache)
+    list_result.extend(
+        run_fast_linters(
+            tasks,
+            context,
+            deadline=deadline,
+            jobs=jobs,
+            keep_going=keep_going,
+            xenon=xenon,
+            no_xenon=no_xenon,
+            targets=targets,
+            shards=shards,
+        ),
+    )
+    return list_result
+
+
+def run_fast_linters(
+    tasks: list[TaskFunction],
+    context: Context,
+    *,
+    deadline: float | None,
+    jobs: int,
+    keep_going: bool,
+    **kwargs: Any,
+) -> list[Result]:
+    """Runs linters recording their runtimes, picks and orders them by the history when deadline is given."""
+    history = RuntimeHistory()
+    tasks = history.wrap(tasks)
+    try:
+        if deadline is None:
+            return run_linters(tasks, context, jobs=jobs, keep_going=keep_going, **kwargs)
+        return run_within_budget(tasks, context, history=history, deadline=deadline, **kwargs)
+    finally:
+        history.save()
+
+
+# Reason: To name as same as command line option. pylint: disable-next=redefined-outer-name
+def build_fast_tasks(*, xenon: bool, pydocstyle: bool, ruff: bool = True) -> list[TaskFunction]:
+    """Builds list of fast linters to run."""
+    tasks: list[TaskFunction] = [call_bandit, call_dodgy, call_flake8]
+    if ruff:
+        tasks.insert(0, call_ruff)
+    if xenon:
         tasks.insert(0, call_xenon)
     if pydocstyle:
         tasks.append(call_pydocstyle)
-    list_result.extend(run_in_order(tasks, context, xenon=xenon, no_xenon=no_xenon))
-    return list_result
+    return tasks
+
+
+def run_linters(
+    tasks: list[TaskFunction],
+    context: Context,
+    *,
+    jobs: int = 1,
+    keep_going: bool = False,
+    **kwargs: Any,
+) -> list[Result]:
+    """Runs linters in order, or concurrently when multiple jobs or keep going is requested."""
+    if jobs == 1 and not keep_going:
+        return run_in_order(tasks, context, **kwargs)
+    return run_in_parallel(tasks, context, jobs=jobs, fail_fast=not keep_going, **kwargs)
 
 
 ns.add_task(xenon)
@@ -182,53 +412,275 @@ ns.add_task(pydocstyle)
 ns.add_task(fast, default=True)
 
 
-@task
-def mypy(context: Context) -> list[Result]:
-    """Lints code with mypy."""
-    return [run_in_pty(context, f"mypy {' '.join(PYTHON_DIRS)}")]
+@task(help={"pydocstyle": "Runs pydocstyle", **HELP_WATCH})
+def watch(
+    context: Context,
+    *,
+    # Reason: To name command line option.
+    pydocstyle: bool = False,  # pylint: disable=redefined-outer-name
+    interval: float = 0.5,
+    debounce: float = 0.3,
+) -> list[Result]:
+    """Lints changed files by Ruff, Bandit, and Flake8 whenever they are saved (watchdog is used when installed).
+
+    dodgy and Xenon are skipped since they scan the whole project.
+    """
+    return watch_files(
+        partial(lint_changed, context, pydocstyle=pydocstyle),
+        targets=paths.python_dirs,
+        interval=interval,
+        debounce=debounce,
+    )
+
+
+# Reason: To name as same as command line option. pylint: disable-next=redefined-outer-name
+def lint_changed(context: Context, targets: list[str], *, pydocstyle: bool) -> list[Result]:
+    """Runs all linters accepting targets on changed files and reports all failures together."""
+    tasks: list[TaskFunction] = [call_ruff, call_bandit, call_flake8]
+    if pydocstyle:
+        tasks.append(call_pydocstyle)
+    return run_linters(tasks, context, keep_going=True, targets=targets)
+
+
+ns.add_task(watch)
+
+
+@task(help={"pydocstyle": "Runs pydocstyle"})
+def serve(
+    context: Context,
+    *,
+    # Reason: To name command line option.
+    pydocstyle: bool = False,  # pylint: disable=redefined-outer-name
+) -> None:
+    """Answers requests of `python -m invokelint.client` to lint by Ruff, Bandit, and Flake8 until interrupted.
+
+    Tools run in processes forked from preloaded server, and passing results are cached by content of files.
+    """
+    server_context = build_buffered_context(context)
+    set_config(server_context, warm=True)
+    warm_up()
+    serve_requests(
+        partial(lint_captured, server_context, pydocstyle=pydocstyle),
+        partial(lint_source_captured, server_context, pydocstyle=pydocstyle),
+        targets=paths.python_dirs,
+    )
+
+
+# Reason: To name as same as command line option. pylint: disable-next=redefined-outer-name
+def lint_captured(context: Context, targets: list[str], *, pydocstyle: bool) -> list[Result]:
+    """Runs all linters accepting targets, returns results including failures."""
+    tasks: list[TaskFunction] = [call_ruff, call_bandit, call_flake8]
+    if pydocstyle:
+        tasks.append(call_pydocstyle)
+    return run_all_capturing(wrap_tasks(tasks, enabled=True), context, targets=targets)
+
+
+# Reason: To name as same as command line option. pylint: disable-next=redefined-outer-name
+def lint_source_captured(context: Context, file: str, copy: str, *, pydocstyle: bool) -> list[Result]:
+    """Lints source in copy of file, by Ruff and Flake8 from standard input as file, by the others as copy.
+
+    Both ways keep path based configuration applied, e.g. per-file-ignores and excludes of Bandit.
+    """
+    source = Path(copy).read_text(encoding="utf-8")
+    list_result = [
+        run_with_input(context, f"ruff check --stdin-filename {shlex.quote(file)} -", source),
+        run_with_input(context, f"flake8 --stdin-display-name {shlex.quote(file)} -", source),
+    ]
+    tasks: list[TaskFunction] = [call_bandit]
+    if pydocstyle:
+        tasks.append(call_pydocstyle)
+    list_result.extend(run_all_capturing(tasks, context, targets=[copy]))
+    return list_result
+
+
+ns.add_task(serve)
+
+
+HELP_DAEMON = "Checks by mypy daemon which is started on demand and reused (stop it by `inv clean`)"
+
+
+@task(help={"daemon": HELP_DAEMON, "targets": HELP_TARGETS}, iterable=["targets"])
+def mypy(context: Context, *, daemon: bool = False, targets: list[str] | None = None) -> list[Result]:
+    """Lints code with mypy, by its daemon when daemon is True."""
+    if daemon:
+        return [dmypy.run(context, join_targets(targets), options=parseable_options("mypy"))]
+    return [run_in_pty(context, f"mypy{parseable_options('mypy')} {join_targets(targets)}")]
 
 
 # Reason: Compatibility with semgrep task to be called from deep().. pylint: disable=unused-argument
-def call_mypy(context: Context, **kwargs: Any) -> list[Result]:  # noqa: ARG001
-    return mypy(context)
+def call_mypy(
+    context: Context,
+    *,
+    daemon: bool = False,
+    targets: list[str] | None = None,
+    **kwargs: Any,  # noqa: ARG001
+) -> list[Result]:
+    """Lints code with mypy, keyword arguments for other tasks are ignored."""
+    return mypy(context, daemon=daemon, targets=targets)
 
 
-@task
-def pylint(context: Context) -> list[Result]:
+@task(help={"targets": HELP_TARGETS}, iterable=["targets"])
+def pylint(context: Context, *, targets: list[str] | None = None) -> list[Result]:
     """Lints code with Pylint."""
-    return [run_in_pty(context, f"pylint {' '.join(PYTHON_DIRS)}")]
+    return [run_in_pty(context, f"pylint{parseable_options('pylint')} {join_targets(targets)}")]
 
 
 # Reason: Compatibility with semgrep task to be called from deep(). pylint: disable=unused-argument
-def call_pylint(context: Context, **kwargs: Any) -> list[Result]:  # noqa: ARG001
-    return pylint(context)
+def call_pylint(context: Context, *, targets: list[str] | None = None, **kwargs: Any) -> list[Result]:  # noqa: ARG001
+    return pylint(context, targets=targets)
+
 
+HELP_BASELINE_COMMIT = "Reports only Semgrep findings not found in this Git revision, e.g. base of branch in CI"
 
-@task(help={"ci": "Run as CI mode."})
-def semgrep(context: Context, *, ci: bool = False) -> list[Result]:
-    """Lints code with Semgrep."""
+
+@task(
+    help={
+        "ci": "Run as CI mode.",
+        "jobs": "Number of Semgrep jobs (0: number of CPUs)",
+        "baseline_commit": HELP_BASELINE_COMMIT,
+    },
+)
+def semgrep(context: Context, *, ci: bool = False, jobs: int = 0, baseline_commit: str = "") -> list[Result]:
+    """Lints code with Semgrep, by snapshot of ruleset taken by lint.semgrep-rules when it exists."""
     command = "ci" if ci else "scan"
+    includes = " --include ".join(paths.python_dirs)
+    options = parseable_options("semgrep")
+    clear_semgrep_json()
+    if baseline_commit:
+        options += f" --baseline-commit {shlex.quote(baseline_commit)}"
     full_command = (
-        f"semgrep {command} --oss-only --config p/python --metrics off --include {' --include '.join(PYTHON_DIRS)}"
+        f"semgrep {command}{options} --oss-only --config {resolve_config()} --metrics off"
+        f" --jobs {jobs or count_cpus()} --include {includes}"
     )
     return [run_in_pty(context, full_command)]
 
 
 # Reason: Compatibility with semgrep task to be called from deep().. pylint: disable=unused-argument
-def call_semgrep(context: Context, *, ci: bool = False, **kwargs: Any) -> list[Result]:  # noqa: ARG001
-    return semgrep(context)
+def call_semgrep(
+    context: Context,
+    *,
+    ci: bool = False,
+    baseline_commit: str = "",
+    jobs: int = 0,
+    **kwargs: Any,  # noqa: ARG001
+) -> list[Result]:
+    """Lints code with Semgrep, keyword arguments for other tasks are ignored."""
+    return semgrep(context, ci=ci, jobs=jobs, baseline_commit=baseline_commit)
+
+
+@task(help={"config": f"Ruleset in registry of Semgrep to snapshot (default: {REGISTRY_CONFIG})"})
+def semgrep_rules(context: Context, *, config: str = REGISTRY_CONFIG) -> list[Result]:
+    """Snapshots ruleset from registry of Semgrep into local file to scan offline.
+
+    Commit the file to scan on build agents without network, and run this task again to update it.
+    """
+    # Version check of Semgrep waits for network until it times out on build agents without network.
+    env = {"SEMGREP_ENABLE_VERSION_CHECK": "0"}
+    result = context.run("semgrep --version", hide=True, pty=False, in_stream=False, env=env)
+    stamp = snapshot(config, result.stdout.strip())
+    click.echo(f"Saved {RULES_FILE.as_posix()}: {stamp}")
+    return [result]
 
 
-@task(help={"ci": "Run as CI mode."})
-def deep(context: Context, *, ci: bool = False) -> list[Result]:
+@task(
+    help={
+        "ci": "Run as CI mode.",
+        "parallel": "Runs linters at once and reports all failures together",
+        "jobs": "Maximum number of linters to run at once with --parallel (0: number of CPUs)",
+        "changed": "Lints only Python files changed from --base or untracked, and files importing them transitively",
+        "base": "Git revision to compare with for --changed (default: HEAD)",
+        "cache": "Skips mypy and Pylint whose inputs haven't changed since the last passing run",
+        "daemon": HELP_DAEMON,
+        "baseline_commit": HELP_BASELINE_COMMIT,
+        "profile": HELP_PROFILE,
+        "profile_json": HELP_PROFILE_JSON,
+        "report": HELP_REPORT,
+    },
+)
+# Reason: For specification  pylint: disable=too-many-arguments
+def deep(  # noqa: PLR0913
+    context: Context,
+    *,
+    ci: bool = False,
+    parallel: bool = False,
+    jobs: int = 0,
+    changed: bool = False,
+    base: str = "HEAD",
+    cache: bool = False,
+    daemon: bool = False,
+    baseline_commit: str = "",
+    profile: bool = False,
+    profile_json: str = "",
+    report: str = "",
+) -> list[Result]:
     """Runs slow but detailed linting (mypy, Pylint, semgrep)."""
+    with profiling(enabled=profile, json_path=profile_json), reporting(report):
+        return run_deep(
+            context,
+            ci=ci,
+            parallel=parallel,
+            jobs=jobs,
+            changed=changed,
+            base=base,
+            cache=cache,
+            daemon=daemon,
+            baseline_commit=baseline_commit,
+        )
+
+
+def resolve_deep_targets(context: Context, *, changed: bool, base: str) -> list[str] | None:
+    """Resolves targets, mypy and Pylint check across modules so changes may break files importing changed files."""
+    targets = resolve_targets(context, changed=changed, base=base, targets=None)
+    return expand_to_importers(targets, context) if targets else targets
+
+
+# Reason: For specification  pylint: disable-next=too-many-arguments
+def run_deep(  # noqa: PLR0913
+    context: Context,
+    *,
+    ci: bool,
+    parallel: bool,
+    jobs: int,
+    changed: bool,
+    base: str,
+    cache: bool,
+    daemon: bool,
+    baseline_commit: str,
+) -> list[Result]:
+    """Runs deep linting with options resolved by task deep."""
+    targets = resolve_deep_targets(context, changed=changed, base=base)
+    if is_nothing_changed(changed=changed, targets=targets):
+        return []
+    jobs = jobs or count_cpus()
+    list_task = wrap_tasks(build_deep_tasks(parallel=parallel, jobs=jobs), enabled=cache)
+    if not parallel:
+        return run_in_order(list_task, context, ci=ci, daemon=daemon, targets=targets, baseline_commit=baseline_commit)
+    return run_in_parallel(
+        list_task,
+        context,
+        jobs=jobs,
+        fail_fast=False,
+        ci=ci,
+        daemon=daemon,
+        targets=targets,
+        baseline_commit=baseline_commit,
+    )
+
+
+def build_deep_tasks(*, parallel: bool, jobs: int) -> list[TaskFunction]:
+    """Builds tasks of deep linting, Semgrep gets its share of CPUs when it runs at once with other linters."""
     list_task: list[TaskFunction] = [call_mypy, call_pylint]
-    if platform.system() != "Windows":
-        list_task.append(call_semgrep)
-    return run_in_order(list_task, context, ci=ci)
+    if platform.system() == "Windows":
+        return list_task
+    if not parallel:
+        return [*list_task, call_semgrep]
+    share = max(count_cpus() // min(jobs, len(list_task) + 1), 1)
+    # Keeps name of task since cache skips Semgrep by it.
+    return [*list_task, update_wrapper(partial(call_semgrep, jobs=share), call_semgrep)]
 
 
 ns.add_task(mypy)
 ns.add_task(pylint)
 ns.add_task(semgrep)
+ns.add_task(semgrep_rules)
 ns.add_task(deep)
@@ -2,16 +2,23 @@
 
 from __future__ import annotations
 
+import json
 import os
 from collections import OrderedDict
 from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Callable
+from typing import cast
 
 import click
 from invoke import Collection
 from invoke import Context
 from invoke import task
-from packagediscovery import Packages
-from packagediscovery import Setuptools
+
+if TYPE_CHECKING:
+    from packagediscovery import Setuptools
+
+    from invokelint.path.index import FileIndex
 
 # The following list of directories that setuptools exclude from dist should be added into targets for lint and format.
 PACKAGES_TO_LINT = [
@@ -60,26 +67,284 @@ def remove_duplicate(list_str: list[str]) -> list[str]:
     return list(OrderedDict.fromkeys(list_str))
 
 
-setuptools = Setuptools(modules_to_lint=MODULES_TO_LINT)
-PRODUCTION_PACKAGES = Packages([package.replace(".", os.sep) for package in setuptools.packages]).list_roots_only
-SETUPTOOLS_PYTHON_MODULES = setuptools.py_modules
-EXISTING_PACKAGES = [package for package in PACKAGES_TO_LINT if Path(package).is_dir()]
-EXISTING_MODULES = [f"{module}.py" for module in SETUPTOOLS_PYTHON_MODULES if Path(f"{module}.py").is_file()]
-EXISTING_TEST_PACKAGES = [package for package in TEST_PACKAGES if Path(package).is_dir()]
-PYTHON_DIRS = remove_duplicate([*PRODUCTION_PACKAGES, *EXISTING_MODULES, *EXISTING_PACKAGES, *EXISTING_TEST_PACKAGES])
-PYTHON_DIRS_EXCLUDING_TEST = remove_duplicate([*PRODUCTION_PACKAGES, *EXISTING_MODULES, *EXISTING_PACKAGES])
+CACHE_DIR = Path(".invokelint_cache")
+PATHS_CACHE_FILE = CACHE_DIR.joinpath("paths.json")
+# Package discovery depends only on these files and the top-level directory listing.
+FILES_AFFECTING_DISCOVERY = ["pyproject.toml", "setup.cfg", "setup.py"]
+
+
+def discover() -> dict[str, list[str]]:
+    """Discovers project paths by setuptools settings."""
+    setuptools = create_setuptools()
+    production_packages = list_root_packages(setuptools.packages)
+    existing_packages = list_existing_directories(PACKAGES_TO_LINT)
+    existing_modules = list_existing_modules(setuptools.py_modules)
+    existing_test_packages = list_existing_directories(TEST_PACKAGES)
+    python_dirs_excluding_test = remove_duplicate([*production_packages, *existing_modules, *existing_packages])
+    return {
+        "setuptools_packages": setuptools.packages,
+        "production_packages": production_packages,
+        "setuptools_python_modules": setuptools.py_modules,
+        "existing_packages": existing_packages,
+        "existing_modules": existing_modules,
+        "existing_test_packages": existing_test_packages,
+        "python_dirs": remove_duplicate([*python_dirs_excluding_test, *existing_test_packages]),
+        "python_dirs_excluding_test": python_dirs_excluding_test,
+    }
+
+
+def create_setuptools() -> Setuptools:
+    # Reason: Importing setuptools is slow, so it should be imported only when discovery is required.
+    import packagediscovery  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+    return packagediscovery.Setuptools(modules_to_lint=MODULES_TO_LINT)
+
+
+def list_root_packages(packages: list[str]) -> list[str]:
+    # Reason: Importing setuptools is slow, so it should be imported only when discovery is required.
+    import packagediscovery  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+    return packagediscovery.Packages([package.replace(".", os.sep) for package in packages]).list_roots_only
+
+
+def list_existing_directories(names: list[str]) -> list[str]:
+    return [name for name in names if Path(name).is_dir()]
+
+
+def list_existing_modules(modules: list[str]) -> list[str]:
+    return [f"{module}.py" for module in modules if Path(f"{module}.py").is_file()]
+
+
+def build_stamp() -> list[str]:
+    """Builds stamp to invalidate cache of discovered paths."""
+    stamp = [f"{file}:{get_mtime_ns(file)}" for file in FILES_AFFECTING_DISCOVERY]
+    # Hidden entries like caches of tools are ignored since they don't affect discovery.
+    with os.scandir() as entries:
+        stamp.extend(
+            sorted(
+                f"{entry.name}{os.sep if entry.is_dir() else ''}"
+                for entry in entries
+                if not entry.name.startswith(".")
+            ),
+        )
+    return stamp
+
+
+def get_mtime_ns(file: str) -> int:
+    try:
+        return Path(file).stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+class ProjectPaths:
+    """Discovers project paths lazily on first access.
+
+    Discovered paths are cached in file until the files affecting discovery or the top-level directory listing change.
+    """
+
+    def __init__(self, cache_file: Path = PATHS_CACHE_FILE) -> None:
+        self.cache_file = cache_file
+        self._paths: dict[str, list[str]] | None = None
+
+    @property
+    def setuptools_packages(self) -> list[str]:
+        return self.load()["setuptools_packages"]
+
+    @property
+    def production_packages(self) -> list[str]:
+        return self.load()["production_packages"]
+
+    @property
+    def setuptools_python_modules(self) -> list[str]:
+        return self.load()["setuptools_python_modules"]
+
+    @property
+    def existing_packages(self) -> list[str]:
+        return self.load()["existing_packages"]
+
+    @property
+    def existing_modules(self) -> list[str]:
+        return self.load()["existing_modules"]
+
+    @property
+    def existing_test_packages(self) -> list[str]:
+        return self.load()["existing_test_packages"]
+
+    @property
+    def python_dirs(self) -> list[str]:
+        return self.load()["python_dirs"]
+
+    @property
+    def python_dirs_excluding_test(self) -> list[str]:
+        return self.load()["python_dirs_excluding_test"]
+
+    def load(self) -> dict[str, list[str]]:
+        """Loads paths from memory, cache file, or discovery in this order."""
+        if self._paths is None:
+            stamp = build_stamp()
+            self._paths = self.read_cache(stamp)
+            if self._paths is None:
+                self._paths = discover()
+                self.write_cache(stamp, self._paths)
+        return self._paths
+
+    def read_cache(self, stamp: list[str]) -> dict[str, list[str]] | None:
+        """Reads paths from cache file, returns None when cache file doesn't exist or is outdated."""
+        try:
+            content = json.loads(self.cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return cast("dict[str, list[str]]", content["paths"]) if content.get("stamp") == stamp else None
+
+    def write_cache(self, stamp: list[str], discovered: dict[str, list[str]]) -> None:
+        # Reason: Cache is optional, paths are available even if it can't be written.
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            self.cache_file.write_text(json.dumps({"stamp": stamp, "paths": discovered}), encoding="utf-8")
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        """Forgets paths in memory, to be discovered again on next access."""
+        self._paths = None
+
+
+paths = ProjectPaths()
+# Constants for backward compatibility, they are resolved lazily by module level __getattr__().
+LAZY_CONSTANTS = {
+    "PRODUCTION_PACKAGES": "production_packages",
+    "SETUPTOOLS_PYTHON_MODULES": "setuptools_python_modules",
+    "EXISTING_PACKAGES": "existing_packages",
+    "EXISTING_MODULES": "existing_modules",
+    "EXISTING_TEST_PACKAGES": "existing_test_packages",
+    "PYTHON_DIRS": "python_dirs",
+    "PYTHON_DIRS_EXCLUDING_TEST": "python_dirs_excluding_test",
+}
+
+
+def __getattr__(name: str) -> object:
+    """Resolves constants of project paths lazily.
+
+    see:
+    - PEP 562 - Module __getattr__ and __dir__ | peps.python.org
+      https://peps.python.org/pep-0562/
+    """
+    if name in LAZY_CONSTANTS:
+        return getattr(paths, LAZY_CONSTANTS[name])
+    if name == "setuptools":
+        return create_setuptools()
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
+
+
 ns = Collection()
 
 
+def join_targets(targets: list[str] | None = None) -> str:
+    """Joins targets into command line arguments, all Python file or directories to lint by default.
+
+    Directories aren't expanded even if index is enabled, since command line is limited. Tools which check files
+    independently get files in index by chunks, see invokelint.shard.run_sharded().
+    """
+    return " ".join(targets or paths.python_dirs)
+
+
+def list_python_files(targets: list[str] | None = None, context: Context | None = None) -> list[str]:
+    """Expands targets into Python files, all Python file or directories to lint by default.
+
+    Index is used when context enables it.
+    """
+    file_index = get_index(context)
+    return expand_targets(targets or paths.python_dirs, walk_python_files if file_index is None else file_index.scan)
+
+
+def expand_targets(targets: list[str], walk: Callable[[str], list[str]]) -> list[str]:
+    """Expands directories by walk, Python files given explicitly are kept as same as tools do."""
+    files = []
+    for target in targets:
+        if Path(target).is_dir():
+            files.extend(walk(target))
+        elif target.endswith(".py"):
+            files.append(target)
+    return remove_duplicate(files)
+
+
+def get_index(context: Context | None) -> FileIndex | None:
+    # Reason: invokelint.path.index depends on this module.
+    from invokelint.path import index  # noqa: PLC0415 pylint: disable=import-outside-toplevel
+
+    return index.get_index(context)
+
+
+def walk_python_files(directory: str) -> list[str]:
+    """Lists Python files under directory in stable order."""
+    files: list[str] = []
+    for root, dirs, names in os.walk(directory):
+        dirs[:] = filter_directories(dirs)
+        files.extend(str(Path(root, name)) for name in sorted(names) if name.endswith(".py"))
+    return files
+
+
+def filter_directories(names: list[str]) -> list[str]:
+    """Sorts directories to walk, skips hidden directories and caches."""
+    return sorted(name for name in names if not name.startswith(".") and name != "__pycache__")
+
+
+def list_changed_python_files(context: Context, base: str = "HEAD") -> list[str]:
+    """Lists Python files under Python file or directories to lint which are changed from base or untracked."""
+    files = list_changed_files(context, base)
+    return [file for file in files if file.endswith(".py") and is_in_targets(file, paths.python_dirs)]
+
+
+def list_changed_files(context: Context, base: str = "HEAD", *, deleted: bool = False) -> list[str]:
+    """Lists files which are changed from base or untracked, including deleted files when deleted is True.
+
+    Renamed file is listed as deleted file and added file.
+    """
+    diff_filter = "" if deleted else " --diff-filter=d"
+    return remove_duplicate(
+        [
+            *list_git_output(context, f"git diff --name-only --no-renames{diff_filter} --relative {base}"),
+            *list_git_output(context, "git ls-files --others --exclude-standard"),
+        ],
+    )
+
+
+def list_git_output(context: Context, command: str) -> list[str]:
+    """Runs Git command and returns lines of its output."""
+    result = context.run(command, hide=True, pty=False, in_stream=False)
+    return [line.strip() for line in result.stdout.splitlines() if line.strip()]
+
+
+def is_nothing_changed(*, changed: bool, targets: list[str] | None) -> bool:
+    """Reports and returns True when there is no changed Python file to process in changed mode."""
+    if changed and not targets:
+        click.echo("No changed Python files.")
+        return True
+    return False
+
+
+def resolve_targets(context: Context, *, changed: bool, base: str, targets: list[str] | None) -> list[str] | None:
+    """Returns changed Python files when changed is True, otherwise targets as is."""
+    return list_changed_python_files(context, base) if changed else targets
+
+
+def is_in_targets(file: str, targets: list[str]) -> bool:
+    """Checks whether file is one of targets or is under one of targets."""
+    path = Path(file)
+    return any(path == Path(target) or Path(target) in path.parents for target in targets)
+
+
 @task
 def debug(_context: Context) -> None:
     """Debugs and displays which path is recognized as project paths."""
-    click.echo(f"Setuptools detected packages: {setuptools.packages}")
-    click.echo(f"Root packages: {PRODUCTION_PACKAGES}")
-    click.echo(f"Setuptools detected Python modules: {SETUPTOOLS_PYTHON_MODULES}")
-    click.echo(f"Existing test packages: {EXISTING_TEST_PACKAGES}")
-    click.echo(f"Python file or directories to lint: {PYTHON_DIRS}")
-    click.echo(f"Python file or directories to lint excluding test packages: {PYTHON_DIRS_EXCLUDING_TEST}")
+    click.echo(f"Setuptools detected packages: {paths.setuptools_packages}")
+    click.echo(f"Root packages: {paths.production_packages}")
+    click.echo(f"Setuptools detected Python modules: {paths.setuptools_python_modules}")
+    click.echo(f"Existing test packages: {paths.existing_test_packages}")
+    click.echo(f"Python file or directories to lint: {paths.python_dirs}")
+    click.echo(f"Python file or directories to lint excluding test packages: {paths.python_dirs_excluding_test}")
 
 
 ns.add_task(debug, default=True)
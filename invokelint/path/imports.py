@@ -0,0 +1,140 @@
+"""Graph of imports between Python files to lint, to expand changed files to files importing them."""
+
+from __future__ import annotations
+
+import ast
+import json
+from collections import defaultdict
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+
+from invokelint.path import CACHE_DIR
+from invokelint.path import list_python_files
+from invokelint.path.index import hash_indexed
+
+if TYPE_CHECKING:
+    from invoke import Context
+
+GRAPH_FILE = CACHE_DIR.joinpath("imports.json")
+
+
+def to_module_name(file: str) -> str:
+    """Converts path of file into name of module, directories without __init__.py such as src are not package."""
+    path = Path(file).with_suffix("")
+    parts = [] if path.name == "__init__" else [path.name]
+    parent = path.parent
+    while parent.name and parent.joinpath("__init__.py").is_file():
+        parts.insert(0, parent.name)
+        parent = parent.parent
+    return ".".join(parts)
+
+
+def scan_imports(file: str, module: str) -> list[str]:
+    """Lists names of modules which file imports by syntax tree only, names may be attributes of module.
+
+    Imports in functions and under `if TYPE_CHECKING:` are included, since changes in imported module may break them.
+    """
+    try:
+        tree = ast.parse(Path(file).read_bytes())
+    except (SyntaxError, ValueError):
+        return []
+    package = module if Path(file).name == "__init__.py" else module.rpartition(".")[0]
+    return sorted({name for node in ast.walk(tree) for name in list_imported(node, package)})
+
+
+def list_imported(node: ast.AST, package: str) -> list[str]:
+    if isinstance(node, ast.Import):
+        return [alias.name for alias in node.names]
+    if isinstance(node, ast.ImportFrom):
+        return list_imported_from(node, package)
+    return []
+
+
+def list_imported_from(node: ast.ImportFrom, package: str) -> list[str]:
+    """Lists module of from-import and imported names since they may be submodules."""
+    base = resolve_relative(node.module or "", node.level, package)
+    return [base, *(f"{base}.{alias.name}" if base else alias.name for alias in node.names)]
+
+
+def resolve_relative(module: str, level: int, package: str) -> str:
+    """Resolves relative import into absolute name, e.g. level 2 means parent package."""
+    if level == 0:
+        return module
+    parts = package.split(".") if package else []
+    base = parts[: len(parts) - level + 1]
+    return ".".join([*base, module] if module else base)
+
+
+def list_prefixes(name: str) -> list[str]:
+    """Lists name and its parent packages which are also imported, e.g. a.b.c -> a, a.b, a.b.c."""
+    parts = name.split(".")
+    return [".".join(parts[:index]) for index in range(1, len(parts) + 1)]
+
+
+def resolve_imports(names: list[str], files_by_module: dict[str, str]) -> set[str]:
+    """Resolves names of imported modules into files, modules out of project are ignored."""
+    prefixes = {prefix for name in names for prefix in list_prefixes(name)}
+    return {files_by_module[prefix] for prefix in prefixes if prefix in files_by_module}
+
+
+class ImportGraph:
+    """Imports of each file, rescanned only when hash of file changes."""
+
+    def __init__(self, path: Path = GRAPH_FILE) -> None:
+        self.path = path
+        try:
+            entries = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            entries = {}
+        self.entries: dict[str, Any] = entries
+
+    def update(self, files: list[str]) -> None:
+        """Scans files whose content changed, drops entries of files not in files."""
+        entries = {}
+        for file in files:
+            digest = hash_indexed(file)
+            entry = self.entries.get(file)
+            if entry is None or entry["hash"] != digest:
+                module = to_module_name(file)
+                entry = {"hash": digest, "module": module, "imports": scan_imports(file, module)}
+            entries[file] = entry
+        self.entries = entries
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.entries, separators=(",", ":")), encoding="utf-8")
+
+    def build_importers(self) -> dict[str, set[str]]:
+        """Builds map from file to files which import it directly."""
+        files_by_module = {entry["module"]: file for file, entry in self.entries.items()}
+        importers = defaultdict(set)
+        for file, entry in self.entries.items():
+            for imported in resolve_imports(entry["imports"], files_by_module) - {file}:
+                importers[imported].add(file)
+        return importers
+
+    def expand(self, files: list[str]) -> list[str]:
+        """Expands files to files importing them transitively, files come first."""
+        importers = self.build_importers()
+        expanded = list(files)
+        queue = list(files)
+        while queue:
+            for importer in sorted(importers.get(queue.pop(0), set())):
+                if importer not in expanded:
+                    expanded.append(importer)
+                    queue.append(importer)
+        return expanded
+
+
+def load_graph(context: Context | None = None) -> ImportGraph:
+    """Loads graph and updates it for current Python files, in index when context enables it."""
+    graph = ImportGraph()
+    graph.update(list_python_files(context=context))
+    graph.save()
+    return graph
+
+
+def expand_to_importers(files: list[str], context: Context | None = None) -> list[str]:
+    """Expands changed files to files importing them transitively."""
+    return load_graph(context).expand(files)
@@ -0,0 +1,288 @@
+"""Index of Python files to lint, built by one scan which honors .gitignore and skips too large files.
+
+Enable it by configuration of Invoke, e.g. `invokelint: {index: true}` in invoke.yaml, or environment variable
+INVOKE_INVOKELINT_INDEX=1. Then tools get Python files in index instead of directories to walk by themselves.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import NamedTuple
+
+from invokelint.config import get_config
+from invokelint.path import CACHE_DIR
+from invokelint.path import filter_directories
+from invokelint.path import is_in_targets
+
+if TYPE_CHECKING:
+    from invoke import Context
+
+INDEX_FILE = CACHE_DIR.joinpath("index.json")
+GITIGNORE = ".gitignore"
+GIT_EXCLUDE = Path(".git", "info", "exclude")
+WILDCARDS = {"*": "[^/]*", "?": "[^/]"}
+
+
+class IgnorePattern(NamedTuple):
+    """Compiled pattern of .gitignore, which matches path relative to the directory of .gitignore."""
+
+    regex: re.Pattern[str]
+    negated: bool
+    directory_only: bool
+
+    def matches(self, relative: str, *, is_dir: bool) -> bool:
+        return (is_dir or not self.directory_only) and bool(self.regex.fullmatch(relative))
+
+
+def translate(pattern: str) -> str:
+    """Translates glob of .gitignore into regular expression, `**` matches any number of directories."""
+    parts = []
+    index = 0
+    while index < len(pattern):
+        if pattern.startswith("**/", index):
+            parts.append("(?:.*/)?")
+            index += 3
+        elif pattern.startswith("**", index):
+            parts.append(".*")
+            index += 2
+        else:
+            part, index = translate_character(pattern, index)
+            parts.append(part)
+    return "".join(parts)
+
+
+def translate_character(pattern: str, index: int) -> tuple[str, int]:
+    """Translates wildcard or bracket expression at index, returns regular expression and next index."""
+    character = pattern[index]
+    if character in WILDCARDS:
+        return WILDCARDS[character], index + 1
+    end = pattern.find("]", index + 2)
+    if character == "[" and end != -1:
+        return translate_bracket(pattern[index + 1 : end]), end + 1
+    return re.escape(character), index + 1
+
+
+def translate_bracket(expression: str) -> str:
+    """Translates bracket expression, `!` negates it as same as `^`."""
+    return f"[^{expression[1:]}]" if expression.startswith("!") else f"[{expression}]"
+
+
+def parse_flags(line: str) -> tuple[str, bool, bool]:
+    """Parses negation and trailing slash, returns glob, negated, and directory only."""
+    negated = line.startswith("!")
+    line = line[1:] if negated else line
+    # Backslash escapes leading `#` and `!`.
+    line = line[1:] if line.startswith("\\") else line
+    return line.rstrip("/"), negated, line.endswith("/")
+
+
+def compile_pattern(line: str) -> IgnorePattern | None:
+    """Compiles line of .gitignore, returns None for blank line and comment."""
+    line = line.rstrip("\n").rstrip(" ")
+    if not line or line.startswith("#"):
+        return None
+    glob, negated, directory_only = parse_flags(line)
+    # Pattern with slash except at the end matches only relative to the directory of .gitignore.
+    prefix = "" if "/" in glob else "(?:.*/)?"
+    return IgnorePattern(re.compile(prefix + translate(glob.lstrip("/"))), negated, directory_only)
+
+
+def compile_patterns(lines: list[str]) -> list[IgnorePattern]:
+    return [pattern for pattern in map(compile_pattern, lines) if pattern is not None]
+
+
+class IgnoreRules(NamedTuple):
+    """Patterns of .gitignore in directory, which is empty for the root."""
+
+    directory: str
+    patterns: list[IgnorePattern]
+
+
+def read_rules(file: Path, directory: str) -> list[IgnoreRules]:
+    """Reads patterns of .gitignore, returns nothing when file doesn't exist or has no pattern."""
+    try:
+        lines = file.read_text(encoding="utf-8").splitlines()
+    except (OSError, UnicodeDecodeError):
+        return []
+    patterns = compile_patterns(lines)
+    return [IgnoreRules(directory, patterns)] if patterns else []
+
+
+def to_relative(path: str) -> str:
+    """Converts path into POSIX path relative to working directory, which is empty for working directory."""
+    relative = Path(os.path.relpath(path)).as_posix()
+    return "" if relative == "." else relative
+
+
+def read_parent_rules(directory: str) -> list[IgnoreRules]:
+    """Reads patterns of Git exclude file and .gitignore in parents of directory up to working directory."""
+    if directory.startswith(".."):
+        return []
+    parts = Path(directory).parts
+    list_rules = read_rules(GIT_EXCLUDE, "")
+    for depth in range(len(parts)):
+        parent = Path(*parts[:depth]).as_posix() if depth else ""
+        list_rules.extend(read_rules(Path(parent, GITIGNORE), parent))
+    return list_rules
+
+
+def is_ignored(list_rules: list[IgnoreRules], path: str, *, is_dir: bool) -> bool:
+    """Checks whether path relative to working directory is ignored, the last matching pattern wins."""
+    ignored = False
+    for rules in list_rules:
+        relative = relative_to(path, rules.directory)
+        for pattern in rules.patterns:
+            if pattern.matches(relative, is_dir=is_dir):
+                ignored = not pattern.negated
+    return ignored
+
+
+def relative_to(path: str, directory: str) -> str:
+    return path[len(directory) + 1 :] if directory else path
+
+
+def hash_file(path: str | Path) -> str:
+    """Hashes content of file, returns empty string when file doesn't exist."""
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return ""
+
+
+def is_directory_to_scan(entry: os.DirEntry[str], list_rules: list[IgnoreRules]) -> bool:
+    """Checks whether entry is directory which is neither hidden, cache, nor ignored by .gitignore."""
+    if not entry.is_dir() or not filter_directories([entry.name]):
+        return False
+    return not is_ignored(list_rules, to_relative(entry.path), is_dir=True)
+
+
+def build_entry(file: str, stat: os.stat_result, known: dict[str, Any] | None) -> dict[str, Any]:
+    """Builds entry of file, hash is reused from known entry while size and modified time haven't changed."""
+    entry: dict[str, Any] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    is_known = known is not None and all(known.get(key) == value for key, value in entry.items())
+    entry["hash"] = known["hash"] if known is not None and is_known else hash_file(file)
+    return entry
+
+
+class FileIndex:
+    """Size, modified time, and hash of Python files under scanned directories.
+
+    Each directory is scanned once for each process, and hash is reused from the previous run while size and modified
+    time of file haven't changed.
+    """
+
+    def __init__(self, path: Path = INDEX_FILE, max_file_size: int = 1024 * 1024) -> None:
+        self.path = path
+        self.max_file_size = max_file_size
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.scanned: dict[str, list[str]] = {}
+        self.previous: dict[str, dict[str, Any]] | None = None
+
+    def configure(self, max_file_size: int) -> None:
+        """Sets max file size, forgets scanned directories when it changes."""
+        if max_file_size != self.max_file_size:
+            self.max_file_size = max_file_size
+            self.scanned = {}
+
+    def scan(self, directory: str) -> list[str]:
+        """Lists Python files under directory in the same order as os.walk(), scanning it only once."""
+        if directory not in self.scanned:
+            files: list[str] = []
+            self.scan_directory(directory, read_parent_rules(to_relative(directory)), files)
+            self.scanned[directory] = files
+            self.save()
+        return self.scanned[directory]
+
+    def scan_directory(self, directory: str, list_rules: list[IgnoreRules], files: list[str]) -> None:
+        """Records files in directory first, then descends into subdirectories in sorted order."""
+        list_rules = list_rules + read_rules(Path(directory, GITIGNORE), to_relative(directory))
+        with os.scandir(directory) as iterator:
+            entries = sorted(iterator, key=lambda entry: entry.name)
+        files.extend(entry.path for entry in entries if self.is_file_to_index(entry, list_rules))
+        for entry in entries:
+            if is_directory_to_scan(entry, list_rules):
+                self.scan_directory(entry.path, list_rules, files)
+
+    def is_file_to_index(self, entry: os.DirEntry[str], list_rules: list[IgnoreRules]) -> bool:
+        """Checks whether entry is Python file to lint, records it when it is."""
+        if not entry.name.endswith(".py") or not entry.is_file():
+            return False
+        if is_ignored(list_rules, to_relative(entry.path), is_dir=False):
+            return False
+        return self.record(entry)
+
+    def record(self, entry: os.DirEntry[str]) -> bool:
+        """Records file, returns False when file is larger than max file size."""
+        stat = entry.stat()
+        if stat.st_size > self.max_file_size:
+            return False
+        self.entries[entry.path] = build_entry(entry.path, stat, self.load_previous().get(entry.path))
+        return True
+
+    def load_previous(self) -> dict[str, dict[str, Any]]:
+        if self.previous is None:
+            try:
+                self.previous = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self.previous = {}
+        return self.previous
+
+    def save(self) -> None:
+        # Reason: Index file is optional, files are listed even if it can't be written.
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self.merge_previous()), encoding="utf-8")
+        except OSError:
+            pass
+
+    def merge_previous(self) -> dict[str, dict[str, Any]]:
+        """Merges entries into the previous index, dropping entries under directories scanned in this process."""
+        directories = list(self.scanned)
+        kept = {file: entry for file, entry in self.load_previous().items() if not is_in_targets(file, directories)}
+        return {**kept, **self.entries}
+
+    def get_hash(self, file: str) -> str:
+        """Gets hash of file recorded in index, rehashes file when it has changed or isn't recorded."""
+        entry = self.entries.get(file)
+        if entry is None:
+            return hash_file(file)
+        self.entries[file] = build_entry(file, Path(file).stat(), entry)
+        return str(self.entries[file]["hash"])
+
+
+def list_ignored_paths() -> list[str]:
+    """Lists regular expressions of entries in working directory which .gitignore ignores, e.g. ^build(/|$)."""
+    list_rules = read_parent_rules("") + read_rules(Path(GITIGNORE), "")
+    with os.scandir() as iterator:
+        # dodgy skips hidden entries by itself.
+        names = sorted(
+            entry.name
+            for entry in iterator
+            if not entry.name.startswith(".") and is_ignored(list_rules, entry.name, is_dir=entry.is_dir())
+        )
+    return [f"^{re.escape(name)}(/|$)" for name in names]
+
+
+file_index = FileIndex()
+
+
+def get_index(context: Context | None) -> FileIndex | None:
+    """Gets index configured by context, None when context doesn't enable it."""
+    if context is None or not get_config(context, "index"):
+        return None
+    file_index.configure(int(get_config(context, "max_file_size")))
+    return file_index
+
+
+def hash_indexed(file: str) -> str:
+    """Hashes file by index when it is recorded, returns empty string when file doesn't exist."""
+    try:
+        return file_index.get_hash(file)
+    except FileNotFoundError:
+        return ""
@@ -4,7 +4,8 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from invokelint.path import PYTHON_DIRS
+from invokelint.diagnostics import parseable_options
+from invokelint.path import join_targets
 from invokelint.run import run_in_pty
 
 if TYPE_CHECKING:
@@ -12,7 +13,14 @@ if TYPE_CHECKING:
     from invoke import Result
 
 
-def chk(context: Context, *, fix: bool = False, show_fixes: bool = False, warn: bool = False) -> list[Result]:
+def chk(
+    context: Context,
+    *,
+    fix: bool = False,
+    show_fixes: bool = False,
+    warn: bool = False,
+    targets: list[str] | None = None,
+) -> list[Result]:
     """Lints code with Ruff."""
     list_options = []
     if fix:
@@ -20,13 +28,25 @@ def chk(context: Context, *, fix: bool = False, show_fixes: bool = False, warn:
     if show_fixes:
         list_options.append("--show-fixes")
     options = " " + " ".join(list_options) if list_options else ""
-    return [run_in_pty(context, f"ruff check{options} {' '.join(PYTHON_DIRS)}", warn=warn)]
-
-
-def fmt(context: Context, *, diff: bool = False, warn: bool = False) -> list[Result]:
+    return [
+        run_in_pty(
+            context,
+            f"ruff check{options}{parseable_options('ruff')} {join_targets(targets)}",
+            warn=warn,
+        ),
+    ]
+
+
+def fmt(
+    context: Context,
+    *,
+    diff: bool = False,
+    warn: bool = False,
+    targets: list[str] | None = None,
+) -> list[Result]:
     """Lints code with Ruff."""
     list_options = []
     if diff:
         list_options.append("--diff")
     options = " " + " ".join(list_options) if list_options else ""
-    return [run_in_pty(context, f"ruff format{options} {' '.join(PYTHON_DIRS)}", warn=warn)]
+    return [run_in_pty(context, f"ruff format{options} {join_targets(targets)}", warn=warn)]
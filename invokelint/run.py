@@ -2,17 +2,30 @@
 
 from __future__ import annotations
 
+import io
+import os
 import platform
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import Callable
 from typing import cast
 
+import click
 from invoke import Context
 from invoke import Result
 from invoke import UnexpectedExit
 
+from invokelint.diagnostics import reporter
+from invokelint.stream import StreamingLocal
+from invokelint.stream import is_streaming
+from invokelint.timing import profiler
+from invokelint.warm import is_warm
+from invokelint.warm import is_warmable
+from invokelint.warm import run_warm
+
 if TYPE_CHECKING:
+    from concurrent.futures import Future
     from typing import Protocol
 
     class TaskFunction(Protocol):
@@ -23,9 +36,39 @@ if TYPE_CHECKING:
 
 
 def run_in_pty(context: Context, command: str, **kwargs: Any) -> Result:
+    """Runs command in pseudo terminal except on Windows or in streaming mode, records its timing and diagnostics."""
+    with profiler.measure(command):
+        try:
+            result = run_command(context, command, **kwargs)
+        except UnexpectedExit as error:
+            reporter.record(error.result)
+            raise
+    reporter.record(result)
+    return result
+
+
+def run_command(context: Context, command: str, **kwargs: Any) -> Result:
+    """Runs command by warm runner when enabled, or without pseudo terminal in streaming mode."""
+    if is_warm(context) and is_warmable(context, command, kwargs):
+        return run_warm(context, command, **kwargs)
+    if is_streaming(context):
+        return cast("Result", build_streaming_context(context).run(command, pty=False, **kwargs))
     return cast("Result", context.run(command, pty=platform.system() != "Windows", **kwargs))
 
 
+def run_with_input(context: Context, command: str, source: str) -> Result:
+    """Runs command which reads source from standard input, returns its result even if it fails.
+
+    Pseudo terminal isn't used since it echoes standard input into output.
+    """
+    return cast("Result", context.run(command, pty=False, in_stream=io.StringIO(source), warn=True))
+
+
+def count_cpus() -> int:
+    """Counts CPUs as budget of concurrent jobs."""
+    return os.cpu_count() or 1
+
+
 def run_in_order(list_task: list[TaskFunction], context: Context, *args: Any, **kwargs: Any) -> list[Result]:
     """Runs tasks in order, stop subsequent tasks when task fail."""
     list_result = []
@@ -47,3 +90,129 @@ def run_all(list_task: list[Callable[[Context], list[Result]]], context: Context
     if list_unexpected_exit:
         raise list_unexpected_exit[0]
     return list_result
+
+
+def run_all_capturing(list_task: list[TaskFunction], context: Context, **kwargs: Any) -> list[Result]:
+    """Runs all tasks even if failure, returns results of failed commands instead of raising."""
+    list_result = []
+    for each_task in list_task:
+        try:
+            list_result.extend(each_task(context, **kwargs))
+        # Reason: This loops only the time we can count
+        except UnexpectedExit as error:  # noqa: PERF203
+            list_result.append(error.result)
+    return list_result
+
+
+def clone_context(context: Context) -> Context:
+    """Clones context including working directories and prefixes, so that its configuration can be changed alone."""
+    cloned_context = Context(config=context.config.clone())  # type: ignore[no-untyped-call]
+    cloned_context.command_cwds = list(context.command_cwds)
+    cloned_context.command_prefixes = list(context.command_prefixes)
+    return cloned_context
+
+
+def build_buffered_context(context: Context) -> Context:
+    """Builds context which captures output instead of printing it, to run tasks concurrently."""
+    buffered_context = clone_context(context)
+    buffered_context.config.run.hide = True
+    # Reason: Concurrent commands can't share standard input.
+    buffered_context.config.run.in_stream = False
+    return buffered_context
+
+
+def build_streaming_context(context: Context) -> Context:
+    """Builds context which runs commands by StreamingLocal."""
+    streaming_context = clone_context(context)
+    streaming_context.config.runners.local = StreamingLocal
+    return streaming_context
+
+
+def echo_results(list_result: list[Result]) -> None:
+    """Prints captured output of results."""
+    for result in list_result:
+        click.echo(result.stdout, nl=False)
+        click.echo(result.stderr, nl=False, err=True)
+
+
+def run_in_parallel(
+    list_task: list[TaskFunction],
+    context: Context,
+    *args: Any,
+    jobs: int = 0,
+    fail_fast: bool = True,
+    echo: bool = True,
+    **kwargs: Any,
+) -> list[Result]:
+    """Runs tasks concurrently, prints captured output of each task in order of list.
+
+    Args:
+        list_task: Tasks which don't depend on each other.
+        context: Context.
+        *args: Arguments to pass to each task.
+        jobs: Maximum number of tasks to run at the same time, 0 means default of ThreadPoolExecutor.
+        fail_fast: Cancels tasks not started yet when task fail, otherwise runs all tasks even if failure.
+        echo: Prints output and raises the first failure after all tasks, otherwise returns results of all tasks
+            including failures without printing, so that caller merges and prints them.
+        **kwargs: Keyword arguments to pass to each task.
+    """
+    buffered_context = build_buffered_context(context)
+    with ThreadPoolExecutor(max_workers=jobs or None) as executor:
+        list_future = [executor.submit(each_task, buffered_context, *args, **kwargs) for each_task in list_task]
+        collect = collect_results if echo else gather_results
+        return collect(list_future, fail_fast=fail_fast)
+
+
+def collect_results(list_future: list[Future[list[Result]]], *, fail_fast: bool) -> list[Result]:
+    """Collects results in order of list, raises the first failure after outputs are printed."""
+    list_unexpected_exit = []
+    list_result = []
+    for future in list_future:
+        try:
+            list_result_task = future.result()
+        except UnexpectedExit as error:
+            echo_unexpected_exit(error)
+            if fail_fast:
+                cancel_all(list_future)
+                raise
+            list_unexpected_exit.append(error)
+            continue
+        echo_results(list_result_task)
+        list_result.extend(list_result_task)
+    if list_unexpected_exit:
+        echo_failures(list_unexpected_exit)
+        raise list_unexpected_exit[0]
+    return list_result
+
+
+def gather_results(list_future: list[Future[list[Result]]], *, fail_fast: bool) -> list[Result]:
+    """Collects results in order of list without printing, results of failures are included."""
+    list_result = []
+    for future in list_future:
+        try:
+            list_result.extend(future.result())
+        # Reason: This loops only the time we can count
+        except UnexpectedExit as error:  # noqa: PERF203
+            if fail_fast:
+                cancel_all(list_future)
+                raise
+            list_result.append(error.result)
+    return list_result
+
+
+def echo_failures(list_unexpected_exit: list[UnexpectedExit]) -> None:
+    """Reports all failed commands together."""
+    for error in list_unexpected_exit:
+        click.echo(f"Failed: {error.result.command} (exit code: {error.result.exited})", err=True)
+
+
+def echo_unexpected_exit(error: UnexpectedExit) -> None:
+    echo_results([error.result])
+    # Invoke prints captured output again when it handles UnexpectedExit of hidden result.
+    error.result.hide = ()
+
+
+def cancel_all(list_future: list[Future[list[Result]]]) -> None:
+    """Cancels futures which haven't started yet."""
+    for future in list_future:
+        future.cancel()
@@ -0,0 +1,67 @@
+"""Snapshot of Semgrep ruleset from registry, to scan without resolving registry on every run."""
+
+from __future__ import annotations
+
+import hashlib
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import click
+from invoke import Exit
+
+REGISTRY_CONFIG = "p/python"
+REGISTRY_URL = "https://semgrep.dev/c/"
+# Out of cache directory, so that it can be committed for build agents without network.
+RULES_FILE = Path(".semgrep_rules.yml")
+PREFIX_STAMP = "# invokelint snapshot:"
+TIMEOUT = 60
+
+
+def download(config: str) -> bytes:
+    """Downloads ruleset resolved by registry of Semgrep."""
+    url = f"{REGISTRY_URL}{config}"
+    try:
+        # Reason: Scheme is fixed to HTTPS.
+        with urllib.request.urlopen(url, timeout=TIMEOUT) as response:  # noqa: S310 # nosec B310
+            content: bytes = response.read()
+    except urllib.error.URLError as error:
+        msg = f"Failed to download ruleset {config} from {url}: {error.reason}"
+        raise Exit(msg) from error
+    return content
+
+
+def build_stamp(config: str, version: str, content: bytes) -> str:
+    """Builds stamp which identifies ruleset and version of Semgrep which snapshot is taken by."""
+    digest = hashlib.sha256(content).hexdigest()
+    return f"{PREFIX_STAMP} config={config} semgrep={version} sha256={digest}"
+
+
+def snapshot(config: str, version: str, path: Path = RULES_FILE) -> str:
+    """Saves ruleset with stamp in the first line, returns the stamp."""
+    content = download(config)
+    stamp = build_stamp(config, version, content)
+    path.write_bytes(f"{stamp}\n".encode() + content)
+    return stamp
+
+
+def read_stamp(path: Path = RULES_FILE) -> dict[str, str]:
+    """Reads stamp of snapshot, e.g. {"config": "p/python", "semgrep": "1.0.0", "sha256": "..."}."""
+    stamp, _, _ = path.read_bytes().partition(b"\n")
+    fields = stamp.decode().replace(PREFIX_STAMP, "", 1).split()
+    return dict(field.partition("=")[::2] for field in fields)
+
+
+def is_intact(path: Path = RULES_FILE) -> bool:
+    """Checks whether ruleset hasn't changed since snapshot is taken."""
+    _, _, content = path.read_bytes().partition(b"\n")
+    return read_stamp(path).get("sha256") == hashlib.sha256(content).hexdigest()
+
+
+def resolve_config(path: Path = RULES_FILE) -> str:
+    """Resolves snapshot when it exists, otherwise ruleset in registry."""
+    if not path.is_file():
+        return REGISTRY_CONFIG
+    if not is_intact(path):
+        click.echo(f"Warning: {path.as_posix()} has changed since snapshot is taken.", err=True)
+    return path.as_posix()
@@ -0,0 +1,174 @@
+"""Resident lint server which answers requests from editors and pre-commit hooks over Unix domain socket.
+
+Protocol is one line of JSON for each connection in both directions:
+
+- Request to lint files: {"files": ["package/module.py"]}
+- Request to lint buffer not saved yet: {"file": "package/module.py", "source": "..."}
+- Response: {"exited": 0, "stdout": "...", "stderr": "..."}
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import socketserver
+from contextlib import suppress
+from pathlib import Path
+from typing import Any
+from typing import Callable
+
+import click
+from invoke import Exit
+from invoke import Result
+
+from invokelint.path import CACHE_DIR
+from invokelint.path import is_in_targets
+
+SOCKET_FILE = CACHE_DIR.joinpath("serve.sock")
+# Copy of buffer is written into this directory next to the file, so that path based configuration of tools applies.
+# It is hidden, so that walkers of invokelint and tools skip it.
+BUFFER_DIR_NAME = ".invokelint_buffer"
+# Exit code of response when request can't be answered.
+EXIT_CODE_ERROR = 2
+
+
+def is_listening(path: Path) -> bool:
+    """Checks whether another server is listening on socket file."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(str(path))
+        except OSError:
+            return False
+    return True
+
+
+def prepare_socket_file(path: Path) -> None:
+    """Removes socket file left by server which didn't stop cleanly, fails when another server is listening."""
+    if is_listening(path):
+        msg = f"Server is already listening on {path.as_posix()}."
+        raise Exit(msg)
+    if path.exists():
+        path.unlink()
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+
+def build_response(list_result: list[Result]) -> dict[str, Any]:
+    """Builds response from results, exit code is the first failure."""
+    return {
+        "exited": next((result.exited for result in list_result if result.exited), 0),
+        "stdout": "".join(result.stdout for result in list_result),
+        "stderr": "".join(result.stderr for result in list_result),
+    }
+
+
+def is_python_file_in(file: str, targets: list[str]) -> bool:
+    return file.endswith(".py") and is_in_targets(file, targets)
+
+
+def build_error(message: str) -> dict[str, Any]:
+    return {"exited": EXIT_CODE_ERROR, "stdout": "", "stderr": f"{message}\n"}
+
+
+class LintRequestHandler(socketserver.StreamRequestHandler):
+    """Reads request, writes response."""
+
+    server: LintServer
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            # Client only checked whether server is listening.
+            return
+        try:
+            request = json.loads(line)
+        except ValueError:
+            response = build_error("Request should be one line of JSON.")
+        else:
+            response = self.server.answer(request)
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class LintServer(socketserver.UnixStreamServer):
+    """Server which lints files in targets by callback, one request at a time.
+
+    Project paths are resolved once on start, and callback keeps tools and cache warm between requests. Buffer is
+    linted by another callback, which gets path of file and path of copy whose content is the buffer.
+    """
+
+    def __init__(
+        self,
+        lint: Callable[[list[str]], list[Result]],
+        lint_source: Callable[[str, str], list[Result]],
+        *,
+        targets: list[str],
+        path: Path = SOCKET_FILE,
+    ) -> None:
+        prepare_socket_file(path)
+        super().__init__(str(path), LintRequestHandler)
+        self.lint = lint
+        self.lint_source = lint_source
+        self.targets = targets
+        self.path = path
+
+    def server_close(self) -> None:
+        super().server_close()
+        if self.path.exists():
+            self.path.unlink()
+
+    def answer(self, request: Any) -> dict[str, Any]:
+        """Answers request, see docstring of module for protocol."""
+        if not isinstance(request, dict):
+            return build_error("Request should be JSON object.")
+        if "source" in request:
+            return self.lint_buffer(str(request.get("file", "")), str(request["source"]))
+        return self.lint_files([str(file) for file in request.get("files", [])])
+
+    def lint_files(self, files: list[str]) -> dict[str, Any]:
+        """Lints Python files in targets, other files are ignored as same as `inv lint`.
+
+        Editors send absolute paths, so paths are made relative to project as same as targets. Request without any file
+        to lint fails, since empty success would be mistaken for passing lint.
+        """
+        files = [file for file in map(os.path.relpath, files) if is_python_file_in(file, self.targets)]
+        if not files:
+            return build_error(f"Request requires paths of Python files in {' '.join(self.targets)}.")
+        return build_response(self.lint(files))
+
+    def lint_buffer(self, file: str, source: str) -> dict[str, Any]:
+        """Lints source as copy next to file, then replaces path of copy in output with path of file."""
+        file = os.path.relpath(file)
+        if not is_python_file_in(file, self.targets):
+            return build_error(f"Buffer requires path of Python file in {' '.join(self.targets)}.")
+        copy = Path(file).parent.joinpath(BUFFER_DIR_NAME, Path(file).name)
+        copy.parent.mkdir(exist_ok=True)
+        copy.write_text(source, encoding="utf-8")
+        try:
+            response = build_response(self.lint_source(file, copy.as_posix()))
+        finally:
+            copy.unlink()
+            # Reason: Another server may be linting buffer in the same directory.
+            with suppress(OSError):
+                copy.parent.rmdir()
+        for stream in ("stdout", "stderr"):
+            response[stream] = response[stream].replace(copy.as_posix(), Path(file).as_posix())
+        return response
+
+
+def serve(
+    lint: Callable[[list[str]], list[Result]],
+    lint_source: Callable[[str, str], list[Result]],
+    *,
+    targets: list[str],
+    path: Path = SOCKET_FILE,
+) -> None:
+    """Answers requests until interrupted."""
+    if not hasattr(socket, "AF_UNIX"):
+        msg = "Server requires Unix domain socket, which isn't available on this platform."
+        raise Exit(msg)
+    with LintServer(lint, lint_source, targets=targets, path=path) as server:
+        click.echo(f"Listening on {path.as_posix()}... (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            return
@@ -0,0 +1,136 @@
+"""Shards of Python files to run tools which check each file independently by concurrent processes."""
+
+from __future__ import annotations
+
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+
+from invoke import Result
+from invoke import UnexpectedExit
+
+from invokelint.path import join_targets
+from invokelint.path import list_python_files
+from invokelint.path.index import get_index
+from invokelint.run import count_cpus
+from invokelint.run import echo_results
+from invokelint.run import run_in_parallel
+from invokelint.run import run_in_pty
+
+if TYPE_CHECKING:
+    from invoke import Context
+
+    from invokelint.run import TaskFunction
+
+HELP_SHARDS = "Splits files into N shards of similar sizes checked by concurrent processes (0: number of CPUs)"
+# Command line on Windows is limited to 32,767 characters, other platforms share their limit with environment.
+MAX_COMMAND_LENGTH = 30000
+
+
+def split_balanced(weights: dict[str, int], count: int) -> list[list[str]]:
+    """Splits keys into shards of similar total weights, heaviest first into the lightest shard."""
+    shards: list[list[str]] = [[] for _ in range(min(count, len(weights)))]
+    loads = [0] * len(shards)
+    for key in sorted(weights, key=lambda key: weights[key], reverse=True):
+        index = loads.index(min(loads))
+        shards[index].append(key)
+        loads[index] += weights[key]
+    return shards
+
+
+def chunk_by_length(files: list[str], limit: int = MAX_COMMAND_LENGTH) -> list[list[str]]:
+    """Chunks files so that each chunk joined by space fits in limit of command line."""
+    chunks: list[list[str]] = [[]]
+    length = 0
+    for file in files:
+        if chunks[-1] and length + len(file) + 1 > limit:
+            chunks.append([])
+            length = 0
+        chunks[-1].append(file)
+        length += len(file) + 1
+    return chunks
+
+
+def split_files(files: list[str], count: int) -> list[list[str]]:
+    """Splits files into shards of similar total byte sizes, which fit in command line."""
+    sizes = {file: Path(file).stat().st_size for file in files}
+    return [chunk for shard in split_balanced(sizes, count) for chunk in chunk_by_length(sorted(shard))]
+
+
+def merge_results(command: str, list_result: list[Result]) -> Result:
+    """Merges results of shards into result of command, exit code is the first failure."""
+    return Result(
+        stdout="".join(result.stdout for result in list_result),
+        stderr="".join(result.stderr for result in list_result),
+        command=command,
+        exited=next((result.exited for result in list_result if result.exited), 0),
+    )
+
+
+def run_sharded(
+    context: Context,
+    command: str,
+    *,
+    targets: list[str] | None,
+    shards: int,
+    warn: bool = False,
+) -> Result:
+    """Runs command followed by targets, by shards of their Python files when multiple shards are requested.
+
+    Results of shards are merged into one result of the command, which is printed once unless context hides output,
+    e.g. when context is buffered by run_in_parallel() which prints the result by itself.
+
+    Args:
+        context: Context.
+        command: Command which takes files to check at the end.
+        targets: Targets, project paths by default.
+        shards: Number of shards, 0 means number of CPUs.
+        warn: Returns failed result instead of raising UnexpectedExit.
+    """
+    count = shards or count_cpus()
+    full_command = f"{command} {join_targets(targets)}"
+    chunks = plan_chunks(context, full_command, targets, count)
+    if len(chunks) <= 1:
+        return run_in_pty(context, build_single_command(command, full_command, chunks), warn=warn)
+    result = merge_results(full_command, run_chunks(context, command, chunks, jobs=count))
+    return report_merged(context, result, warn=warn)
+
+
+def report_merged(context: Context, result: Result, *, warn: bool) -> Result:
+    """Prints merged result unless context hides output, raises UnexpectedExit when failed unless warn."""
+    if not context.config.run.hide:
+        echo_results([result])
+    if result.failed and not warn:
+        raise UnexpectedExit(result)
+    return result
+
+
+def build_single_command(command: str, full_command: str, chunks: list[list[str]]) -> str:
+    """Builds command followed by the only chunk, or by targets when there is no chunk."""
+    return f"{command} {' '.join(chunks[0])}" if chunks else full_command
+
+
+def plan_chunks(context: Context, full_command: str, targets: list[str] | None, count: int) -> list[list[str]]:
+    """Plans chunks of files, none when single command of targets is enough.
+
+    Files in index are always given explicitly since tools walking directories don't honor .gitignore.
+    """
+    if get_index(context) is not None:
+        return split_files(list_python_files(targets, context), count)
+    if count <= 1 and len(full_command) <= MAX_COMMAND_LENGTH:
+        return []
+    chunks = split_files(list_python_files(targets, context), count)
+    return chunks if len(chunks) > 1 else []
+
+
+def run_chunks(context: Context, command: str, chunks: list[list[str]], *, jobs: int) -> list[Result]:
+    """Runs command for each chunk of files concurrently, without printing their outputs."""
+    list_task: list[TaskFunction] = [partial(run_shard, command=f"{command} {' '.join(chunk)}") for chunk in chunks]
+    return run_in_parallel(list_task, context, jobs=jobs, fail_fast=False, echo=False)
+
+
+# Reason: Compatibility with TaskFunction to be called from run_in_parallel(). pylint: disable=unused-argument
+def run_shard(context: Context, *, command: str, **kwargs: Any) -> list[Result]:  # noqa: ARG001
+    """Runs command of shard, failure is raised after results of all shards are merged."""
+    return [run_in_pty(context, command, warn=True)]
@@ -0,0 +1,104 @@
+"""Streaming mode which runs commands without pseudo terminal and keeps only tail of their output in memory.
+
+Enable it by configuration of Invoke, e.g. `invokelint: {stream: true}` in invoke.yaml, or environment variable
+INVOKE_INVOKELINT_STREAM=1.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import IO
+from typing import TYPE_CHECKING
+
+from invoke.runners import Local
+
+from invokelint.config import get_config
+from invokelint.diagnostics import reporter
+from invokelint.path import CACHE_DIR
+
+if TYPE_CHECKING:
+    from invoke import Context
+
+LOG_DIR = CACHE_DIR.joinpath("logs")
+# Size of buffer to write log, output is flushed into file whenever the buffer fills.
+BUFFER_SIZE = 64 * 1024
+
+
+def is_streaming(context: Context) -> bool:
+    return bool(get_config(context, "stream"))
+
+
+def build_log_path(command: str) -> Path:
+    """Builds path of log for each command, e.g. .invokelint_cache/logs/pylint-0123abcd.log."""
+    tool = Path(command.split(" ", 1)[0]).name
+    digest = hashlib.sha256(command.encode()).hexdigest()[:8]
+    return LOG_DIR.joinpath(f"{tool}-{digest}.log")
+
+
+def rotate(path: Path) -> None:
+    """Keeps log of the previous run as .1 backup."""
+    if path.exists():
+        path.replace(f"{path}.1")
+
+
+class StreamingLocal(Local):
+    """Runner which writes whole output into log and keeps only tail of it in result.
+
+    Invoke keeps whole output in memory and joins all of it for watchers whenever output comes, so memory and time grow
+    with output of tool.
+    """
+
+    def __init__(self, context: Context) -> None:
+        super().__init__(context)
+        self.tail = int(get_config(context, "tail"))
+        # Reporter parses whole output of result, so output is kept while reporting.
+        self.trimming = not reporter.enabled
+        self.log_path = LOG_DIR
+        self.log: IO[str] | None = None
+        self.lock = threading.Lock()
+        # Sizes and omitted sizes of output by ID of buffer, since stdout and stderr have their own buffers.
+        self.sizes: dict[int, int] = defaultdict(int)
+        self.omitted: dict[int, int] = defaultdict(int)
+
+    def start(self, command: str, shell: str, env: dict[str, str]) -> None:
+        self.log_path = build_log_path(command)
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        rotate(self.log_path)
+        # Reason: Closed in stop() since Runner calls it even if command fails. pylint: disable-next=consider-using-with
+        self.log = self.log_path.open("w", encoding="utf-8", buffering=BUFFER_SIZE)
+        super().start(command, shell, env)
+
+    def stop(self) -> None:
+        super().stop()
+        if self.log is not None:
+            self.log.close()
+
+    def respond(self, buffer_: list[str]) -> None:
+        """Logs chunk just appended into buffer and drops the oldest chunks beyond the tail."""
+        if len(buffer_) == 1:
+            # Placeholder of note about omitted output.
+            buffer_.insert(0, "")
+        self.write_log(buffer_[-1])
+        self.sizes[id(buffer_)] += len(buffer_[-1])
+        if self.trimming:
+            self.trim(buffer_)
+        super().respond(buffer_)
+
+    def write_log(self, data: str) -> None:
+        with self.lock:
+            if self.log is not None:
+                self.log.write(data)
+
+    def trim(self, buffer_: list[str]) -> None:
+        """Drops the oldest chunks beyond the tail, and notes omitted size in placeholder."""
+        key = id(buffer_)
+        # Keeps at least tail, at most tail and a chunk.
+        while len(buffer_) > 2 and self.sizes[key] - len(buffer_[1]) >= self.tail:  # noqa: PLR2004
+            dropped = len(buffer_.pop(1))
+            self.sizes[key] -= dropped
+            self.omitted[key] += dropped
+        if self.omitted[key]:
+            buffer_[0] = f"[{self.omitted[key]} characters omitted, see {self.log_path.as_posix()}]\n"
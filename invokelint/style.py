@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import shutil
+from typing import TYPE_CHECKING
 from typing import Any
 
 from invoke import Collection
@@ -12,15 +13,35 @@ from invoke import task
 from invoke.exceptions import Exit
 
 from invokelint import ruff as ruff_commands
-from invokelint.path import PYTHON_DIRS
+from invokelint.cache import wrap_tasks
+from invokelint.config import DEFAULT_CONFIG
+from invokelint.path import is_nothing_changed
+from invokelint.path import join_targets
+from invokelint.path import paths
+from invokelint.path import resolve_targets
 from invokelint.run import run_in_order
 from invokelint.run import run_in_pty
+from invokelint.shard import HELP_SHARDS
+from invokelint.shard import run_sharded
+from invokelint.watch import HELP_WATCH
+from invokelint.watch import watch as watch_files
+
+if TYPE_CHECKING:
+    from invokelint.run import TaskFunction
 
 ns = Collection()
+ns.configure(DEFAULT_CONFIG)
 
 
 # Reason: Compatibility with semgrep task to be called from lint.fast().. pylint: disable=unused-argument
-def docformatter(context: Context, *, check: bool = False, **kwargs: Any) -> list[Result]:  # noqa: ARG001
+def docformatter(
+    context: Context,
+    *,
+    check: bool = False,
+    targets: list[str] | None = None,
+    shards: int = 1,
+    **kwargs: Any,  # noqa: ARG001
+) -> list[Result]:
     """Runs docformatter.
 
     This function includes hard coding of line length.
@@ -31,47 +52,87 @@ def docformatter(context: Context, *, check: bool = False, **kwargs: Any) -> lis
     if not shutil.which("docformatter"):
         return []
     docformatter_options = f" --recursive {'--check' if check else '--in-place'}"
-    return [run_in_pty(context, f"docformatter{docformatter_options} {' '.join(PYTHON_DIRS)}", warn=True)]
+    return [run_sharded(context, f"docformatter{docformatter_options}", targets=targets, shards=shards, warn=True)]
 
 
 # Reason: Compatibility with semgrep task to be called from lint.fast().. pylint: disable=unused-argument
-def autoflake(context: Context, *, check: bool = False, **kwargs: Any) -> list[Result]:  # noqa: ARG001
+def autoflake(
+    context: Context,
+    *,
+    check: bool = False,
+    targets: list[str] | None = None,
+    **kwargs: Any,  # noqa: ARG001
+) -> list[Result]:
     """Runs autoflake."""
     autoflake_options = f" --recursive {'--check' if check else '--in-place'}"
-    return [run_in_pty(context, f"autoflake{autoflake_options} {' '.join(PYTHON_DIRS)}", warn=True)]
+    return [run_sharded(context, f"autoflake{autoflake_options}", targets=targets, shards=1, warn=True)]
 
 
 # Reason: Compatibility with semgrep task to be called from lint.fast().. pylint: disable=unused-argument
-def isort(context: Context, *, check: bool = False, **kwargs: Any) -> list[Result]:  # noqa: ARG001
+def isort(
+    context: Context,
+    *,
+    check: bool = False,
+    targets: list[str] | None = None,
+    **kwargs: Any,  # noqa: ARG001
+) -> list[Result]:
     """Runs isort."""
     isort_options = " --check-only --diff" if check else ""
-    return [run_in_pty(context, f"isort{isort_options} {' '.join(PYTHON_DIRS)}", warn=True)]
+    return [run_sharded(context, f"isort{isort_options}", targets=targets, shards=1, warn=True)]
 
 
 # Reason: Compatibility with semgrep task to be called from lint.fast().. pylint: disable=unused-argument
-def black(context: Context, *, check: bool = False, **kwargs: Any) -> list[Result]:  # noqa: ARG001
+def black(
+    context: Context,
+    *,
+    check: bool = False,
+    targets: list[str] | None = None,
+    **kwargs: Any,  # noqa: ARG001
+) -> list[Result]:
     """Runs Black."""
     black_options = " --check --diff" if check else ""
-    return [run_in_pty(context, f"black{black_options} {' '.join(PYTHON_DIRS)}", warn=True)]
+    return [run_in_pty(context, f"black{black_options} {join_targets(targets)}", warn=True)]
 
 
 # Reason: Compatibility with semgrep task to be called from lint.fast().. pylint: disable=unused-argument
-def call_ruff_check(context: Context, *, check: bool = False, **kwargs: Any) -> list[Result]:  # noqa: ARG001
+def call_ruff_check(
+    context: Context,
+    *,
+    check: bool = False,
+    targets: list[str] | None = None,
+    **kwargs: Any,  # noqa: ARG001
+) -> list[Result]:
+    """Runs Ruff check, fixes warnings after showing them unless check is True.
+
+    Fixing is skipped when there is no warning to show.
+    """
     if check:
-        return ruff_commands.chk(context, show_fixes=True)
-    result = []
-    result.extend(ruff_commands.chk(context, show_fixes=True, warn=True))
-    result.extend(ruff_commands.chk(context, fix=True, show_fixes=True))
+        return ruff_commands.chk(context, show_fixes=True, targets=targets)
+    result = ruff_commands.chk(context, show_fixes=True, warn=True, targets=targets)
+    if result[0].ok:
+        return result
+    result.extend(ruff_commands.chk(context, fix=True, show_fixes=True, targets=targets))
     return result
 
 
 # Reason: Compatibility with semgrep task to be called from lint.fast().. pylint: disable=unused-argument
-def call_ruff_fmt(context: Context, *, check: bool = False, **kwargs: Any) -> list[Result]:  # noqa: ARG001
+def call_ruff_fmt(
+    context: Context,
+    *,
+    check: bool = False,
+    targets: list[str] | None = None,
+    **kwargs: Any,  # noqa: ARG001
+) -> list[Result]:
+    """Runs Ruff format, formats code after showing diff unless check is True.
+
+    Formatting is skipped when there is no diff to show.
+    """
     if check:
-        return ruff_commands.fmt(context, diff=check)
-    result = []
-    result.extend(ruff_commands.fmt(context, diff=True, warn=True))
-    result.extend(ruff_commands.fmt(context))
+        return ruff_commands.fmt(context, diff=check, targets=targets)
+    result = ruff_commands.fmt(context, diff=True, warn=True, targets=targets)
+    if result[0].ok:
+        return result
+    result.extend(ruff_commands.fmt(context, targets=targets))
     return result
 
 
@@ -89,22 +150,74 @@ def is_ruff(*, by_ruff: bool, no_ruff: bool) -> bool:
         "ruff": "Leaves Ruff warnings not fixed (not apply `ruff check --fix`, only `ruff format` is applied)",
         "by_ruff": "Formats code by Ruff (default)",
         "no_ruff": "Formats code by autoflake, isort, and Black (requires to install them)",
+        "changed": "Formats only Python files changed from --base or untracked",
+        "base": "Git revision to compare with for --changed (default: HEAD)",
+        "targets": "Python file or directory to format instead of project paths (repeatable)",
+        "cache": "Skips checks whose inputs haven't changed since the last passing run (only with --check)",
+        "shards": f"{HELP_SHARDS}, for docformatter",
     },
+    iterable=["targets"],
 )
-def fmt(
+# Reason: For specification  pylint: disable=too-many-arguments
+def fmt(  # noqa: PLR0913
     context: Context,
     *,
     check: bool = False,
     ruff: bool = False,
     by_ruff: bool = False,
     no_ruff: bool = False,
+    changed: bool = False,
+    base: str = "HEAD",
+    targets: list[str] | None = None,
+    cache: bool = False,
+    shards: int = 1,
 ) -> list[Result]:
     """Formats code by docformatter and Ruff (option for only check available)."""
-    tasks = [docformatter]
+    targets = resolve_targets(context, changed=changed, base=base, targets=targets)
+    if is_nothing_changed(changed=changed, targets=targets):
+        return []
+    # Cache only checks since formatters modify inputs.
+    tasks = wrap_tasks(build_tasks(check=check, ruff=ruff, by_ruff=by_ruff, no_ruff=no_ruff), enabled=cache and check)
+    return run_in_order(tasks, context, check=check, targets=targets, shards=shards)
+
+
+def build_tasks(*, check: bool, ruff: bool, by_ruff: bool, no_ruff: bool) -> list[TaskFunction]:
+    """Builds list of formatters to run."""
+    tasks: list[TaskFunction] = [docformatter]
     tasks.extend([call_ruff_fmt] if is_ruff(by_ruff=by_ruff, no_ruff=no_ruff) else [autoflake, isort, black])
     if check or not ruff:
         tasks.append(call_ruff_check)
-    return run_in_order(tasks, context, check=check)
+    return tasks
 
 
 ns.add_task(fmt, default=True)
+
+
+@task(
+    help={
+        "ruff": "Leaves Ruff warnings not fixed (not apply `ruff check --fix`, only `ruff format` is applied)",
+        "by_ruff": "Formats code by Ruff (default)",
+        "no_ruff": "Formats code by autoflake, isort, and Black (requires to install them)",
+        **HELP_WATCH,
+    },
+)
+# Reason: For specification  pylint: disable=too-many-arguments
+def watch(  # noqa: PLR0913
+    context: Context,
+    *,
+    ruff: bool = False,
+    by_ruff: bool = False,
+    no_ruff: bool = False,
+    interval: float = 0.5,
+    debounce: float = 0.3,
+) -> list[Result]:
+    """Formats changed files whenever they are saved (watchdog is used when installed)."""
+    return watch_files(
+        lambda changed: fmt(context, ruff=ruff, by_ruff=by_ruff, no_ruff=no_ruff, targets=changed),
+        targets=paths.python_dirs,
+        interval=interval,
+        debounce=debounce,
+    )
+
+
+ns.add_task(watch)
@@ -2,47 +2,202 @@
 
 from __future__ import annotations
 
+import importlib.util
+import json
 import webbrowser
+from collections import Counter
+from functools import partial
 from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
 
+import click
 from invoke import Collection
 from invoke import Context
 from invoke import Result
 from invoke import task
+from invoke.exceptions import Exit
 
-from invokelint.path import PRODUCTION_PACKAGES
-from invokelint.path import PYTHON_DIRS_EXCLUDING_TEST
+from invokelint.config import DEFAULT_CONFIG
+from invokelint.impact import JSON_FILE
+from invokelint.impact import RCFILE
+from invokelint.impact import ImpactMap
+from invokelint.impact import build_coverage_config
+from invokelint.impact import build_stamp
+from invokelint.impact import parse_coverage_json
+from invokelint.path import list_changed_files
+from invokelint.path import paths
+from invokelint.path.imports import load_graph
+from invokelint.run import count_cpus
+from invokelint.run import run_in_parallel
 from invokelint.run import run_in_pty
+from invokelint.shard import merge_results
+from invokelint.shard import report_merged
+from invokelint.shard import split_balanced
+
+if TYPE_CHECKING:
+    from invokelint.run import TaskFunction
 
 ns = Collection()
+ns.configure(DEFAULT_CONFIG)
+HELP_WORKERS = (
+    "Spreads tests across N processes or 'auto' for number of CPUs "
+    "(by pytest-xdist when installed, otherwise by splitting test files)"
+)
+# Windows cmd.exe requires to so surround "not slow" by double quote,
+# otherwise, following error raised:
+#   ERROR: file or directory not found: slow'
+# - Answer: cmd - What does single-quoting do in Windows batch files? - Stack Overflow
+#   https://stackoverflow.com/a/24181667/12721873
+OPTIONS_FAST = '-m "not slow"'
 
 
-@task
-def fast(context: Context) -> Result:
+@task(help={"workers": HELP_WORKERS})
+def fast(context: Context, *, workers: str = "") -> Result:
     """Runs fast tests (not mark @pytest.mark.slow)."""
-    # Windows cmd.exe requires to so surround "not slow" by double quote,
-    # otherwise, following error raised:
-    #   ERROR: file or directory not found: slow'
-    # - Answer: cmd - What does single-quoting do in Windows batch files? - Stack Overflow
-    #   https://stackoverflow.com/a/24181667/12721873
-    return run_in_pty(context, 'pytest -m "not slow" -vv')
+    return run_pytest(context, f"pytest {OPTIONS_FAST} -vv", workers=workers, options=OPTIONS_FAST)
 
 
 ns.add_task(fast, default=True)
 
 
-@task(name="all")
-def run_test_all(context: Context) -> Result:
+@task(name="all", help={"workers": HELP_WORKERS})
+def run_test_all(context: Context, *, workers: str = "") -> Result:
     """Runs all tests."""
-    return run_in_pty(context, "pytest -vv")
+    return run_pytest(context, "pytest -vv", workers=workers)
 
 
 ns.add_task(run_test_all)
 
 
-def build_coverage_run_command(*, is_all: bool = False) -> str:
+@task(
+    help={
+        "base": "Git revision to compare with (default: HEAD)",
+        "full": "Runs all fast tests to rebuild map of tests",
+    },
+)
+def affected(context: Context, *, base: str = "HEAD", full: bool = False) -> list[Result]:
+    """Runs fast tests affected by files changed from base or untracked.
+
+    Coverage.py records which test executes each production file into map of tests. All fast tests run to rebuild the
+    map when it is missing, or when configuration or conftest.py changes.
+    """
+    stamp = build_stamp()
+    impact_map = ImpactMap()
+    node_ids = select_affected_tests(context, impact_map, stamp=stamp, base=base, full=full)
+    if node_ids == []:
+        click.echo("No affected tests.")
+        return []
+    list_result = run_pytest_recording_contexts(context, node_ids)
+    impact_map.update(export_contexts(context), node_ids)
+    impact_map.save(stamp)
+    return list_result
+
+
+ns.add_task(affected)
+
+
+def select_affected_tests(
+    context: Context,
+    impact_map: ImpactMap,
+    *,
+    stamp: str,
+    base: str,
+    full: bool,
+) -> list[str] | None:
+    """Selects node IDs of affected tests, returns None when all tests should run."""
+    if full:
+        return None
+    if not impact_map.is_valid(stamp):
+        click.echo("Map of tests is missing or stale, runs all tests to rebuild it.")
+        return None
+    node_ids = impact_map.select(list_changed_files(context, base, deleted=True), load_graph(context))
+    if node_ids is None:
+        click.echo("Changes may affect all tests, runs all tests.")
+    return node_ids
+
+
+def run_pytest_recording_contexts(context: Context, node_ids: list[str] | None) -> list[Result]:
+    """Runs tests under Coverage.py which records which test executes each line into its own data file."""
+    RCFILE.parent.mkdir(parents=True, exist_ok=True)
+    RCFILE.write_text(build_coverage_config(), encoding="utf-8")
+    arguments = "".join(f" {node_id}" for node_id in node_ids or [])
+    return [run_in_pty(context, f"coverage run --rcfile={RCFILE.as_posix()} -m pytest {OPTIONS_FAST} -vv{arguments}")]
+
+
+def export_contexts(context: Context) -> dict[str, list[str]]:
+    """Exports recorded contexts and parses them into map from source file to node IDs of tests."""
+    command = f"coverage json --rcfile={RCFILE.as_posix()} --show-contexts -q -o {JSON_FILE.as_posix()}"
+    context.run(command, hide=True, pty=False, in_stream=False)
+    return parse_coverage_json(json.loads(JSON_FILE.read_text(encoding="utf-8")))
+
+
+def resolve_workers(workers: str) -> int:
+    """Resolves value of --workers into number of processes."""
+    if not workers:
+        return 1
+    if workers == "auto":
+        return count_cpus()
+    try:
+        return int(workers)
+    except ValueError as error:
+        msg = f"--workers requires number or 'auto': {workers}"
+        raise Exit(msg) from error
+
+
+def is_xdist_installed() -> bool:
+    return importlib.util.find_spec("xdist") is not None
+
+
+def run_pytest(context: Context, command: str, *, workers: str, options: str = "") -> Result:
+    """Runs pytest, spreads tests across processes when multiple workers are requested.
+
+    Args:
+        context: Context.
+        command: Command to run pytest without test files.
+        workers: Value of --workers.
+        options: Options in the command which select tests, to collect the same tests.
+    """
+    count = resolve_workers(workers)
+    if count <= 1:
+        return run_in_pty(context, command)
+    if is_xdist_installed():
+        return run_in_pty(context, f"{command} -n {count}")
+    return run_shards(context, command, count, options=options)
+
+
+def run_shards(context: Context, command: str, workers: int, *, options: str = "") -> Result:
+    """Runs test files split into shards concurrently, merges their results into one result of the command.
+
+    Tests are split by file to keep module scoped fixtures in one process.
+    """
+    shards = split_balanced(count_tests_by_file(collect_node_ids(context, options)), workers)
+    if len(shards) <= 1:
+        return run_in_pty(context, command)
+    list_task: list[TaskFunction] = [partial(run_shard, command=f"{command} {' '.join(shard)}") for shard in shards]
+    list_result = run_in_parallel(list_task, context, jobs=len(list_task), fail_fast=False, echo=False)
+    return report_merged(context, merge_results(command, list_result), warn=False)
+
+
+# Reason: Compatibility with TaskFunction to be called from run_in_parallel(). pylint: disable=unused-argument
+def run_shard(context: Context, *, command: str, **kwargs: Any) -> list[Result]:  # noqa: ARG001
+    """Runs command of shard, failure is raised after results of all shards are merged."""
+    return [run_in_pty(context, command, warn=True)]
+
+
+def collect_node_ids(context: Context, options: str = "") -> list[str]:
+    """Collects node IDs of tests without running them."""
+    result = context.run(f"pytest --collect-only -q {options}".rstrip(), hide=True, pty=False, in_stream=False)
+    return [line.strip() for line in result.stdout.splitlines() if "::" in line]
+
+
+def count_tests_by_file(node_ids: list[str]) -> dict[str, int]:
+    return dict(Counter(node_id.split("::", 1)[0] for node_id in node_ids))
+
+
+def build_coverage_run_command(*, is_all: bool = False, parallel: bool = False) -> str:
     """To seel complexity of building Coverage.py run command."""
-    targets = PYTHON_DIRS_EXCLUDING_TEST if is_all else PRODUCTION_PACKAGES
+    targets = paths.python_dirs_excluding_test if is_all else paths.production_packages
     # Coverage.py Currently can't apply any options including --source when multiprocessing:
     #   Options affecting multiprocessing must only be specified in a configuration file.
     #   Remove --source from the command line.
@@ -50,7 +205,18 @@ def build_coverage_run_command(*, is_all: bool = False) -> str:
     #   Full documentation is at https://coverage.readthedocs.io
     # Reason: Note. pylint: disable=line-too-long
     # command = "coverage run --concurrency=multiprocessing --source {} -m pytest".format(",".join(targets))  # noqa: ERA001
-    return f"coverage run --source {','.join(Path(target).stem for target in targets)} -m pytest"
+    # Instead, each shard runs in separate process which writes its own data file by --parallel-mode.
+    options = " --parallel-mode" if parallel else ""
+    return f"coverage run{options} --source {','.join(Path(target).stem for target in targets)} -m pytest"
+
+
+def run_coverage(context: Context, *, is_all: bool, workers: str) -> Result:
+    """Runs tests under Coverage.py, in shards of parallel mode when multiple workers are requested."""
+    count = resolve_workers(workers)
+    if count <= 1:
+        return run_in_pty(context, build_coverage_run_command(is_all=is_all))
+    # Not by pytest-xdist since Coverage.py doesn't measure its workers without pytest-cov.
+    return run_shards(context, build_coverage_run_command(is_all=is_all, parallel=True), count)
 
 
 @task(
@@ -59,10 +225,12 @@ def build_coverage_run_command(*, is_all: bool = False) -> str:
         "publish": "Publish the result via coveralls",
         "xml": "Export report as xml format",
         "html": "Export report as html format and open it in browser",
+        "workers": "Spreads tests across N processes or 'auto' for number of CPUs by splitting test files",
     },
     aliases=("cov",),
 )
-def coverage(
+# Reason: For specification  pylint: disable=too-many-arguments
+def coverage(  # noqa: PLR0913
     context: Context,
     *,
     # Reason: To name command line option.
@@ -70,9 +238,10 @@ def coverage(
     publish: bool = False,
     xml: bool = False,
     html: bool = False,
+    workers: str = "",
 ) -> list[Result]:
     """Runs all tests and report coverage (options for create xml / html available)."""
-    run_in_pty(context, build_coverage_run_command(is_all=all))
+    run_coverage(context, is_all=all, workers=workers)
     result = []
     # Only run 'coverage combine' when multiple .coverage.* files exist (multiprocessing mode)
     # In non-multiprocessing mode, only a single .coverage file exists, so combine is not needed
@@ -0,0 +1,111 @@
+"""Timing instrumentation of commands run by tasks."""
+
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import NamedTuple
+
+import click
+
+if sys.platform != "win32":
+    import resource
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+MAX_LENGTH_COMMAND = 60
+
+
+class Timing(NamedTuple):
+    """Measurement of a command.
+
+    CPU time and peak RSS are measured from resource usage of all child processes, so CPU time includes other commands
+    running at the same time, and peak RSS is available only when the command raises the peak of children.
+    """
+
+    command: str
+    wall: float
+    cpu: float
+    max_rss: int | None
+
+
+def get_children_usage() -> tuple[float, int]:
+    """Returns CPU time in seconds and max RSS in bytes of waited child processes."""
+    if sys.platform != "win32":
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        # Linux reports max RSS in kilobytes, macOS reports it in bytes.
+        max_rss = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+        return usage.ru_utime + usage.ru_stime, max_rss
+    return 0.0, 0
+
+
+class Profiler:
+    """Records timings of commands, thread-safe to measure commands run concurrently."""
+
+    def __init__(self) -> None:
+        self.list_timing: list[Timing] = []
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, command: str) -> Iterator[None]:
+        """Measures wall time, CPU time, and peak RSS of command."""
+        cpu_before, max_rss_before = get_children_usage()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            cpu_after, max_rss_after = get_children_usage()
+            max_rss = max_rss_after if max_rss_after > max_rss_before else None
+            with self.lock:
+                self.list_timing.append(Timing(command, wall, cpu_after - cpu_before, max_rss))
+
+    def clear(self) -> None:
+        with self.lock:
+            self.list_timing.clear()
+
+    def sorted(self) -> list[Timing]:
+        """Returns timings sorted by wall time in descending order."""
+        with self.lock:
+            return sorted(self.list_timing, key=lambda timing: timing.wall, reverse=True)
+
+    def report(self) -> str:
+        """Builds summary table sorted by wall time."""
+        lines = [f"{'Command':<{MAX_LENGTH_COMMAND}} {'Wall [s]':>9} {'CPU [s]':>9} {'Peak RSS [MiB]':>15}"]
+        lines.extend(format_timing(timing) for timing in self.sorted())
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> None:
+        """Writes timings as JSON to track trend."""
+        content = [timing._asdict() for timing in self.sorted()]
+        Path(path).write_text(json.dumps(content, indent=2), encoding="utf-8")
+
+
+def format_timing(timing: Timing) -> str:
+    command = timing.command
+    if len(command) > MAX_LENGTH_COMMAND:
+        command = command[: MAX_LENGTH_COMMAND - 3] + "..."
+    max_rss = "-" if timing.max_rss is None else f"{timing.max_rss / 1024 / 1024:.1f}"
+    return f"{command:<{MAX_LENGTH_COMMAND}} {timing.wall:>9.2f} {timing.cpu:>9.2f} {max_rss:>15}"
+
+
+profiler = Profiler()
+
+
+@contextmanager
+def profiling(*, enabled: bool, json_path: str = "") -> Iterator[None]:
+    """Prints summary table and writes JSON after commands finish even if they fail."""
+    profiler.clear()
+    try:
+        yield
+    finally:
+        if enabled:
+            click.echo(profiler.report(), nl=False)
+        if json_path:
+            profiler.dump(json_path)
@@ -0,0 +1,178 @@
+"""Warm runner which runs Python-based tools by their entry points in processes forked from a preloaded server.
+
+Each command runs in its own forked process, so `sys.exit()` and global state of tool don't leak, while the server has
+already imported tools and their plugins. Enable it by configuration of Invoke, e.g. `invokelint: {warm: true}` in
+invoke.yaml, or environment variable INVOKE_INVOKELINT_WARM=1.
+"""
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import multiprocessing
+import os
+import shlex
+import sys
+import tempfile
+import traceback
+from multiprocessing import forkserver
+from typing import IO
+from typing import TYPE_CHECKING
+from typing import Any
+
+import click
+from invoke import Result
+from invoke import UnexpectedExit
+
+from invokelint.config import get_config
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+
+    from invoke import Context
+
+# Entry points of console scripts, tools not listed here run as subprocess.
+ENTRY_POINTS = {
+    "bandit": ("bandit.cli.main", "main"),
+    "docformatter": ("docformatter.__main__", "main"),
+    "flake8": ("flake8.main.cli", "main"),
+    "isort": ("isort.main", "main"),
+    "pydocstyle": ("pydocstyle.cli", "main"),
+    "pylint": ("pylint", "run_pylint"),
+    "radon": ("radon", "main"),
+}
+# Characters which require shell to interpret command.
+SHELL_CHARACTERS = set("|&;<>()$`*?[]{}~!\\\"'\n")
+# Options of Context.run() which run_warm() supports.
+OPTIONS = {"warn", "hide"}
+
+
+def is_warm(context: Context) -> bool:
+    return bool(get_config(context, "warm"))
+
+
+def is_warmable(context: Context, command: str, options: dict[str, Any]) -> bool:
+    """Checks whether command can run by entry point with same behavior as subprocess."""
+    return hasattr(os, "fork") and is_plain_command(command) and is_plain_context(context) and set(options) <= OPTIONS
+
+
+def is_plain_command(command: str) -> bool:
+    """Checks whether command is simple command of tool without interpretation by shell."""
+    return command.split(" ", 1)[0] in ENTRY_POINTS and not SHELL_CHARACTERS.intersection(command)
+
+
+def is_plain_context(context: Context) -> bool:
+    """Checks whether context runs command without cwd, prefixes, environment variables, or timeout."""
+    if context.command_cwds or context.command_prefixes or context.config.run.env:
+        return False
+    return context.config.timeouts.command is None
+
+
+def list_preload_modules() -> list[str]:
+    """Lists modules of installed tools to import in server."""
+    modules = [
+        module for module, _ in ENTRY_POINTS.values() if importlib.util.find_spec(module.split(".", maxsplit=1)[0])
+    ]
+    return [__name__, *modules]
+
+
+def get_multiprocessing_context() -> Any:
+    """Gets context whose server is started on demand with tools imported, once for each process of invokelint."""
+    multiprocessing_context = multiprocessing.get_context("forkserver")
+    multiprocessing_context.set_forkserver_preload(list_preload_modules())
+    return multiprocessing_context
+
+
+def warm_up() -> None:
+    """Starts server and imports tools in advance, otherwise they are imported by the first command."""
+    get_multiprocessing_context()
+    forkserver.ensure_running()
+
+
+def run_warm(context: Context, command: str, *, warn: bool = False, hide: Any = None) -> Result:
+    """Runs command by entry point in forked process, raises UnexpectedExit as same as Context.run().
+
+    Args:
+        context: Context.
+        command: Command which starts with name of tool in ENTRY_POINTS.
+        warn: Returns failed result instead of raising UnexpectedExit.
+        hide: Hides output, configuration of context by default.
+    """
+    exited, stdout, stderr = run_in_process(shlex.split(command))
+    result = Result(stdout=stdout, stderr=stderr, command=command, exited=exited)
+    if not is_hidden(context, hide):
+        echo(result)
+    if result.failed and not (warn or context.config.run.warn):
+        raise UnexpectedExit(result)
+    return result
+
+
+def is_hidden(context: Context, hide: Any) -> bool:
+    return bool(context.config.run.hide if hide is None else hide)
+
+
+def echo(result: Result) -> None:
+    click.echo(result.stdout, nl=False)
+    click.echo(result.stderr, nl=False, err=True)
+
+
+def run_in_process(argv: list[str]) -> tuple[int, str, str]:
+    """Runs entry point in process forked from server, returns exit code and output."""
+    multiprocessing_context = get_multiprocessing_context()
+    receiver, sender = multiprocessing_context.Pipe(duplex=False)
+    # Not daemon since tools such as flake8 start their own processes.
+    process = multiprocessing_context.Process(target=run_entry_point, args=(argv, sender))
+    process.start()
+    sender.close()
+    try:
+        exited, stdout, stderr = receiver.recv()
+    except EOFError:
+        # Process died without sending result, e.g. by signal.
+        exited, stdout, stderr = None, "", ""
+    process.join()
+    return (process.exitcode if exited is None else exited), stdout, stderr
+
+
+def run_entry_point(argv: list[str], sender: Connection) -> None:
+    """Runs entry point with output redirected into files, sends exit code and output to parent."""
+    with tempfile.TemporaryFile() as stdout, tempfile.TemporaryFile() as stderr:
+        os.dup2(stdout.fileno(), sys.stdout.fileno())
+        os.dup2(stderr.fileno(), sys.stderr.fileno())
+        exited = call_entry_point(argv)
+        flush(sys.stdout)
+        flush(sys.stderr)
+        sender.send((exited, read(stdout), read(stderr)))
+
+
+def call_entry_point(argv: list[str]) -> int:
+    """Calls entry point as console script, returns exit code."""
+    module, attribute = ENTRY_POINTS[argv[0]]
+    sys.argv = argv
+    try:
+        code = getattr(importlib.import_module(module), attribute)()
+    except SystemExit as error:
+        code = error.code
+    # Reason: To report any error of tool as failure of command like console script.
+    except Exception:  # noqa: BLE001 pylint: disable=broad-exception-caught
+        traceback.print_exc()
+        return 1
+    return to_exit_code(code)
+
+
+def to_exit_code(code: object) -> int:
+    """Converts argument of sys.exit() or return value of entry point into exit code."""
+    if code is None or isinstance(code, int):
+        return code or 0
+    print(code, file=sys.stderr)  # noqa: T201
+    return 1
+
+
+def flush(stream: IO[str]) -> None:
+    """Flushes stream, which tools such as Bandit may have closed after writing report."""
+    if not stream.closed:
+        stream.flush()
+
+
+def read(file: Any) -> str:
+    file.seek(0)
+    return str(file.read().decode("utf-8", errors="replace"))
@@ -0,0 +1,221 @@
+"""Watches Python files to run tasks on changed files whenever they are saved."""
+
+from __future__ import annotations
+
+import abc
+import importlib.util
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+
+import click
+from invoke import UnexpectedExit
+
+from invokelint.path import filter_directories
+from invokelint.path import is_in_targets
+from invokelint.run import echo_failures
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from invoke import Result
+    from typing_extensions import Self
+
+HELP_WATCH = {
+    "interval": "Seconds between scans of files when watchdog isn't installed",
+    "debounce": "Seconds to wait for more changes after a change, to run once for a burst of saves",
+}
+
+
+def scan(targets: list[str]) -> dict[str, int]:
+    """Scans modified times of Python files in targets."""
+    mtimes: dict[str, int] = {}
+    for target in targets:
+        if Path(target).is_dir():
+            scan_directory(target, mtimes)
+        elif target.endswith(".py") and Path(target).is_file():
+            mtimes[target] = Path(target).stat().st_mtime_ns
+    return mtimes
+
+
+def scan_directory(directory: str, mtimes: dict[str, int]) -> None:
+    """Scans modified times by os.scandir() which reuses information of directory entries."""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                if filter_directories([entry.name]):
+                    scan_directory(entry.path, mtimes)
+            elif entry.name.endswith(".py"):
+                mtimes[entry.path] = entry.stat().st_mtime_ns
+
+
+def list_modified(before: dict[str, int], after: dict[str, int]) -> list[str]:
+    """Lists added or modified files, removed files are ignored since they can't be linted."""
+    return [file for file, mtime in after.items() if before.get(file) != mtime]
+
+
+class Watcher(abc.ABC):
+    """Base class of watchers which collect changed Python files in targets."""
+
+    def __init__(self, targets: list[str], *, interval: float) -> None:
+        self.targets = targets
+        self.interval = interval
+
+    def __enter__(self) -> Self:
+        return self
+
+    # Reason: Hook which only watchers with resources to release override.
+    def __exit__(  # noqa: B027
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stops watching, polling watcher has nothing to stop."""
+
+    @abc.abstractmethod
+    def poll(self) -> list[str]:
+        """Returns files changed since the last poll."""
+
+    def reset(self) -> None:
+        """Forgets changes so far, e.g. changes made by formatter."""
+        self.poll()
+
+    def wait(self, debounce: float) -> list[str]:
+        """Waits for changes, then collects following changes until no more change comes for debounce seconds."""
+        changed = self.wait_first()
+        while True:
+            time.sleep(debounce)
+            more = [file for file in self.poll() if file not in changed]
+            if not more:
+                return changed
+            changed.extend(more)
+
+    def wait_first(self) -> list[str]:
+        changed = self.poll()
+        while not changed:
+            time.sleep(self.interval)
+            changed = self.poll()
+        return changed
+
+
+class PollingWatcher(Watcher):
+    """Detects changes by modified times of files."""
+
+    def __init__(self, targets: list[str], *, interval: float) -> None:
+        super().__init__(targets, interval=interval)
+        self.mtimes = scan(targets)
+
+    def poll(self) -> list[str]:
+        mtimes = scan(self.targets)
+        changed = list_modified(self.mtimes, mtimes)
+        self.mtimes = mtimes
+        return changed
+
+
+class WatchdogWatcher(Watcher):
+    """Detects changes by events of file system through watchdog, e.g. inotify on Linux."""
+
+    def __init__(self, targets: list[str], *, interval: float) -> None:
+        # Reason: watchdog is optional. pylint: disable-next=import-outside-toplevel
+        from watchdog.observers import Observer  # noqa: PLC0415
+
+        super().__init__(targets, interval=interval)
+        self.changed: list[str] = []
+        self.lock = threading.Lock()
+        self.observer = Observer()
+        handler = build_event_handler(self.on_path)
+        for directory in {target if Path(target).is_dir() else str(Path(target).parent) for target in targets}:
+            self.observer.schedule(handler, directory, recursive=Path(directory).resolve() != Path.cwd())
+
+    def __enter__(self) -> Self:
+        self.observer.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.observer.stop()
+        self.observer.join()
+
+    def on_path(self, path: str) -> None:
+        """Collects Python file in targets."""
+        file = os.path.relpath(path)
+        if not file.endswith(".py") or not is_in_targets(file, self.targets):
+            return
+        with self.lock:
+            if file not in self.changed:
+                self.changed.append(file)
+
+    def poll(self) -> list[str]:
+        with self.lock:
+            changed, self.changed = self.changed, []
+        return [file for file in changed if Path(file).is_file()]
+
+
+def build_event_handler(callback: Callable[[str], None]) -> Any:
+    """Builds handler which passes modified, created, or moved path to callback."""
+    # Reason: watchdog is optional. pylint: disable-next=import-outside-toplevel
+    from watchdog.events import FileSystemEventHandler  # noqa: PLC0415
+
+    class Handler(FileSystemEventHandler):
+        def on_any_event(self, event: Any) -> None:
+            if event.is_directory or event.event_type not in ("modified", "created", "moved"):
+                return
+            callback(str(getattr(event, "dest_path", "") or event.src_path))
+
+    return Handler()
+
+
+def is_watchdog_installed() -> bool:
+    return importlib.util.find_spec("watchdog") is not None
+
+
+def build_watcher(targets: list[str], *, interval: float) -> Watcher:
+    """Builds watcher by watchdog when it is installed, otherwise by polling."""
+    if is_watchdog_installed():
+        return WatchdogWatcher(targets, interval=interval)
+    return PollingWatcher(targets, interval=interval)
+
+
+def watch(
+    on_change: Callable[[list[str]], list[Result]],
+    *,
+    targets: list[str],
+    interval: float,
+    debounce: float,
+) -> list[Result]:
+    """Runs callback with changed files whenever files are saved until interrupted.
+
+    Changes made while callback runs are ignored, since formatter modifies files.
+    Failures are already printed, so watching continues.
+
+    Returns:
+        Results of the last run.
+    """
+    list_result: list[Result] = []
+    with build_watcher(targets, interval=interval) as watcher:
+        try:
+            while True:
+                click.echo("Watching for changes... (Ctrl+C to stop)")
+                changed = watcher.wait(debounce)
+                click.echo(f"Changed: {' '.join(changed)}")
+                list_result = run_ignoring_failure(on_change, changed)
+                watcher.reset()
+        except KeyboardInterrupt:
+            return list_result
+
+
+def run_ignoring_failure(on_change: Callable[[list[str]], list[Result]], changed: list[str]) -> list[Result]:
+    try:
+        return on_change(changed)
+    except UnexpectedExit as error:
+        echo_failures([error])
+        return [error.result]
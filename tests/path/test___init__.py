@@ -3,11 +3,21 @@
 from textwrap import dedent
 from typing import TYPE_CHECKING
 
+from invoke import MockContext
+from invoke import Result
+
+from invokelint.path import ProjectPaths
 from invokelint.path import debug
+from invokelint.path import discover
+from invokelint.path import list_changed_python_files
+from invokelint.path import list_python_files
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     import pytest
     from invoke import Context
+    from pytest_mock import MockerFixture
 
 
 def test(context: "Context", capsys: "pytest.CaptureFixture[str]") -> None:
@@ -27,3 +37,53 @@ def test(context: "Context", capsys: "pytest.CaptureFixture[str]") -> None:
     captured = capsys.readouterr()
     assert captured.out == expected
     assert not captured.err
+
+
+def test_list_changed_python_files() -> None:
+    """Function: list_changed_python_files() should list only changed Python files under targets."""
+    context = MockContext(
+        run={
+            "git diff --name-only --no-renames --diff-filter=d --relative main": Result(
+                "README.md\ninvokelint/lint.py\ndocs/conf.py\ntasks.py\n",
+            ),
+            "git ls-files --others --exclude-standard": Result("tests/test_new.py\ninvokelint/lint.py\n"),
+        },
+    )
+    assert list_changed_python_files(context, "main") == ["invokelint/lint.py", "tasks.py", "tests/test_new.py"]
+
+
+def test_list_python_files() -> None:
+    """Function: list_python_files() should expand directories into Python files."""
+    list_file = list_python_files()
+    assert "invokelint/path/__init__.py" in list_file
+    assert "setup.py" in list_file
+    assert "tests/path/test___init__.py" in list_file
+    assert not [file for file in list_file if "__pycache__" in file]
+
+
+def test_project_paths_cache(tmp_path: "Path", mocker: "MockerFixture") -> None:
+    """Paths should be discovered only once, then loaded from cache file."""
+    mock_discover = mocker.patch("invokelint.path.discover", side_effect=discover)
+    cache_file = tmp_path / "paths.json"
+    assert ProjectPaths(cache_file).python_dirs == ["invokelint", "setup.py", "tasks.py", "tests"]
+    project_paths = ProjectPaths(cache_file)
+    assert project_paths.python_dirs_excluding_test == ["invokelint", "setup.py", "tasks.py"]
+    assert project_paths.production_packages == ["invokelint"]
+    assert mock_discover.call_count == 1
+
+
+def test_project_paths_cache_outdated(tmp_path: "Path", mocker: "MockerFixture") -> None:
+    """Paths should be discovered again when stamp changes."""
+    mock_discover = mocker.patch("invokelint.path.discover", side_effect=discover)
+    cache_file = tmp_path / "paths.json"
+    assert ProjectPaths(cache_file).python_dirs == ["invokelint", "setup.py", "tasks.py", "tests"]
+    mocker.patch("invokelint.path.build_stamp", return_value=["pyproject.toml:0"])
+    assert ProjectPaths(cache_file).python_dirs == ["invokelint", "setup.py", "tasks.py", "tests"]
+    assert mock_discover.call_count == 2  # noqa: PLR2004
+
+
+def test_project_paths_lazy(mocker: "MockerFixture") -> None:
+    """Paths should not be discovered until accessed."""
+    mock_discover = mocker.patch("invokelint.path.discover")
+    ProjectPaths()
+    mock_discover.assert_not_called()
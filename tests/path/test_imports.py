@@ -0,0 +1,101 @@
+"""Tests for imports module."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from invokelint.path.imports import ImportGraph
+from invokelint.path.imports import resolve_relative
+from invokelint.path.imports import scan_imports
+from invokelint.path.imports import to_module_name
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture(name="project")
+def fixture_project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Project whose modules import each other absolutely and relatively."""
+    monkeypatch.chdir(tmp_path)
+    package = tmp_path / "package"
+    (package / "sub").mkdir(parents=True)
+    (package / "__init__.py").write_text("", encoding="utf-8")
+    (package / "base.py").write_text("import json\n", encoding="utf-8")
+    (package / "sub" / "__init__.py").write_text("from .. import base\n", encoding="utf-8")
+    (package / "sub" / "user.py").write_text("from package.sub import helper\n", encoding="utf-8")
+    (package / "sub" / "helper.py").write_text("def f():\n    from ..base import dumps\n", encoding="utf-8")
+    (tmp_path / "main.py").write_text("import package.sub.user\n", encoding="utf-8")
+    return tmp_path
+
+
+FILES = [
+    "main.py",
+    "package/__init__.py",
+    "package/base.py",
+    "package/sub/__init__.py",
+    "package/sub/helper.py",
+    "package/sub/user.py",
+]
+
+
+@pytest.mark.usefixtures("project")
+@pytest.mark.parametrize(
+    ("file", "expected"),
+    [
+        ("main.py", "main"),
+        ("package/__init__.py", "package"),
+        ("package/sub/helper.py", "package.sub.helper"),
+    ],
+)
+def test_to_module_name(file: str, expected: str) -> None:
+    """Directories with __init__.py should be packages."""
+    assert to_module_name(file) == expected
+
+
+@pytest.mark.parametrize(
+    ("module", "level", "package", "expected"),
+    [
+        ("os", 0, "package.sub", "os"),
+        ("helper", 1, "package.sub", "package.sub.helper"),
+        ("", 2, "package.sub", "package"),
+        ("base", 2, "package.sub", "package.base"),
+    ],
+)
+def test_resolve_relative(module: str, level: int, package: str, expected: str) -> None:
+    """Level of relative import should climb up packages."""
+    assert resolve_relative(module, level, package) == expected
+
+
+@pytest.mark.usefixtures("project")
+def test_scan_imports() -> None:
+    """Imports in functions and relative imports in package should be resolved into absolute names."""
+    assert scan_imports("package/sub/helper.py", "package.sub.helper") == ["package.base", "package.base.dumps"]
+    assert scan_imports("package/sub/__init__.py", "package.sub") == ["package", "package.base"]
+
+
+@pytest.mark.usefixtures("project")
+def test_expand(tmp_path: Path) -> None:
+    """Changed file should come first and files importing it transitively should follow."""
+    graph = ImportGraph(tmp_path / "imports.json")
+    graph.update(FILES)
+    assert graph.expand(["package/sub/helper.py"]) == ["package/sub/helper.py", "package/sub/user.py", "main.py"]
+    assert graph.expand(["main.py"]) == ["main.py"]
+    # Importing submodule executes its parent packages.
+    assert "main.py" in graph.expand(["package/__init__.py"])
+
+
+def test_update(project: Path) -> None:
+    """Only files whose content changed should be rescanned, removed files should be dropped."""
+    path = project / "imports.json"
+    graph = ImportGraph(path)
+    graph.update(FILES)
+    graph.save()
+    (project / "main.py").write_text("import package.base\n", encoding="utf-8")
+    graph = ImportGraph(path)
+    graph.entries["package/base.py"]["imports"] = ["stale"]
+    graph.update(FILES[:-1])
+    assert graph.entries["main.py"]["imports"] == ["package.base"]
+    assert graph.entries["package/base.py"]["imports"] == ["stale"]
+    assert "package/sub/user.py" not in graph.entries
@@ -0,0 +1,121 @@
+"""Tests for index module."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from invokelint.config import set_config
+from invokelint.path import join_targets
+from invokelint.path import list_python_files
+from invokelint.path.index import FileIndex
+from invokelint.path.index import IgnoreRules
+from invokelint.path.index import compile_pattern
+from invokelint.path.index import compile_patterns
+from invokelint.path.index import hash_file
+from invokelint.path.index import is_ignored
+from invokelint.path.index import list_ignored_paths
+from invokelint.shard import plan_chunks
+
+if TYPE_CHECKING:
+    from invoke import Context
+    from pytest_mock import MockerFixture
+
+
+@pytest.fixture(name="project")
+def fixture_project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Project which has ignored, hidden, and too large files."""
+    monkeypatch.chdir(tmp_path)
+    files = {
+        ".gitignore": "build/\n*_pb2.py\n",
+        "package/module.py": "",
+        "package/message_pb2.py": "",
+        "package/large.py": "#" * 2048,
+        "package/sub/.gitignore": "/local.py\n",
+        "package/sub/local.py": "",
+        "package/sub/module.py": "",
+        "package/.hidden/module.py": "",
+        "build/lib/module.py": "",
+    }
+    for file, content in files.items():
+        (tmp_path / file).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / file).write_text(content, encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture(name="index_context")
+def fixture_index_context(context: Context, mocker: MockerFixture) -> Context:
+    """Context which enables fresh index."""
+    mocker.patch("invokelint.path.index.file_index", FileIndex())
+    set_config(context, index=True, max_file_size=1024)
+    return context
+
+
+@pytest.mark.parametrize(
+    ("pattern", "path", "is_dir", "expected"),
+    [
+        ("*.pyc", "package/module.pyc", False, True),
+        ("/build", "build", True, True),
+        ("/build", "package/build", True, False),
+        ("build/", "package/build", True, True),
+        ("build/", "build", False, False),
+        ("docs/**/*.py", "docs/a/b/conf.py", False, True),
+        ("docs/**/*.py", "docs/conf.py", False, True),
+        ("module_[!a].py", "module_b.py", False, True),
+        ("module_[!a].py", "module_a.py", False, False),
+        ("\\#file", "#file", False, True),
+    ],
+)
+def test_compile_pattern(pattern: str, path: str, *, is_dir: bool, expected: bool) -> None:
+    """Pattern should follow syntax of .gitignore."""
+    compiled = compile_pattern(pattern)
+    assert compiled is not None
+    assert is_ignored([IgnoreRules("", [compiled])], path, is_dir=is_dir) == expected
+
+
+def test_compile_pattern_comment() -> None:
+    assert compile_pattern("# comment") is None
+    assert compile_pattern("  ") is None
+
+
+def test_is_ignored_negated() -> None:
+    """The last matching pattern should win, and patterns of subdirectory should match relative to it."""
+    list_rules = [IgnoreRules("package", compile_patterns(["*.py", "!keep.py"]))]
+    assert is_ignored(list_rules, "package/module.py", is_dir=False)
+    assert not is_ignored(list_rules, "package/keep.py", is_dir=False)
+
+
+@pytest.mark.usefixtures("project")
+def test_list_python_files(index_context: Context) -> None:
+    """Files which .gitignore ignores, hidden files, and too large files should be skipped."""
+    expected = [str(Path("package", "module.py")), str(Path("package", "sub", "module.py"))]
+    assert list_python_files(["package"], index_context) == expected
+    # Directories are kept on command line, and tools which check files independently get files in index by chunks.
+    assert join_targets(["package"]) == "package"
+    assert plan_chunks(index_context, "bandit package", ["package"], 1) == [expected]
+    assert list_python_files(["package"]) == sorted(
+        str(Path("package", file))
+        for file in ["large.py", "message_pb2.py", "module.py", "sub/local.py", "sub/module.py"]
+    )
+
+
+def test_index_reuses_hash(project: Path, mocker: MockerFixture) -> None:
+    """Hash should be reused while file hasn't changed, and saved into index file."""
+    FileIndex(project / "index.json").scan("package")
+    spy = mocker.patch("invokelint.path.index.hash_file", side_effect=hash_file)
+    index = FileIndex(project / "index.json")
+    index.scan("package")
+    spy.assert_not_called()
+    file = str(Path("package", "module.py"))
+    assert file in json.loads((project / "index.json").read_text(encoding="utf-8"))
+    (project / "package" / "module.py").write_text("changed = True\n", encoding="utf-8")
+    assert index.get_hash(file) == FileIndex(project / "other.json").get_hash(file)
+    spy.assert_called()
+
+
+@pytest.mark.usefixtures("project")
+def test_list_ignored_paths() -> None:
+    assert list_ignored_paths() == ["^build(/|$)"]
@@ -1,30 +1,88 @@
 """Tests for `clean` package."""
 
-import sys
+import os
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 import pytest
 
+from invokelint._clean import cache
 from invokelint._clean import clean_all
+from invokelint._clean import python
 from tests.testlibraries import check_list_result
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from invoke import Context
+    from pytest_mock import MockerFixture
 
 
-@pytest.mark.skipif(sys.platform == "win32", reason="Currently support only in Linux.")
-def test_clean_all(context: "Context") -> None:
-    """Command should success and run appropriate commands."""
-    list_command_expected = [
-        "rm -fr build/",
-        "rm -fr dist/",
-        "rm -fr .eggs/",
-        "find . -name '*.egg-info' -exec rm -fr {} +",
-        "find . -name '*.egg' -not -path '*/.venv/*' -exec rm -f {} +",
-        "find . -name '*.pyc' -exec rm -f {} +",
-        "find . -name '*.pyo' -exec rm -f {} +",
-        "find . -name '*~' -exec rm -f {} +",
-        "find . -name '__pycache__' -exec rm -fr {} +",
-        "",
+def test_clean_all(context: "Context", tmp_path: "Path", monkeypatch: pytest.MonkeyPatch) -> None:
+    """Artifacts should be removed except ones in excluded directories."""
+    for path in [
+        "build/lib/package/__init__.py",
+        "package.egg-info/PKG-INFO",
+        "package/__pycache__/module.cpython-311.pyc",
+        "package/module.py~",
+        ".venv/lib/__pycache__/module.cpython-311.pyc",
+        ".invokelint_cache/build-env/lib/package.egg-info/PKG-INFO",
+        "node_modules/package/module.pyc",
+    ]:
+        tmp_path.joinpath(path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.joinpath(path).write_text("a", encoding="utf-8")
+    tmp_path.joinpath("package/module.py").write_text("a", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    list_result = clean_all(context, jobs=2)
+    check_list_result(list_result, ["", ""])
+    assert list_result[0].stdout == "Removed 4 files and 5 directories, freed 4 bytes.\n"
+    assert sorted(path.relative_to(tmp_path).as_posix() for path in tmp_path.rglob("*") if path.is_file()) == [
+        ".invokelint_cache/build-env/lib/package.egg-info/PKG-INFO",
+        ".venv/lib/__pycache__/module.cpython-311.pyc",
+        "node_modules/package/module.pyc",
+        "package/module.py",
     ]
-    check_list_result(clean_all(context), list_command_expected)
+
+
+def test_python_exclude(context: "Context", tmp_path: "Path", monkeypatch: pytest.MonkeyPatch) -> None:
+    """Configured directories should not be walked."""
+    for path in ["package/module.pyc", "vendor/module.pyc"]:
+        tmp_path.joinpath(path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.joinpath(path).write_text("a", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    python(context, exclude=["vendor"])
+    assert not tmp_path.joinpath("package/module.pyc").exists()
+    assert tmp_path.joinpath("vendor/module.pyc").exists()
+
+
+def test_python_unreadable(
+    context: "Context",
+    tmp_path: "Path",
+    monkeypatch: pytest.MonkeyPatch,
+    mocker: "MockerFixture",
+) -> None:
+    """Directory which can't be read should be skipped."""
+    for path in ["package/module.pyc", "private/module.pyc"]:
+        tmp_path.joinpath(path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.joinpath(path).write_text("a", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    scandir = os.scandir
+
+    def scandir_denying_private(path: str) -> "Iterator[os.DirEntry[str]]":
+        if Path(path).name == "private":
+            raise PermissionError(path)
+        return scandir(path)
+
+    mocker.patch("invokelint._clean.os.scandir", scandir_denying_private)
+    python(context)
+    assert not tmp_path.joinpath("package/module.pyc").exists()
+    assert tmp_path.joinpath("private/module.pyc").exists()
+
+
+def test_cache(context: "Context", tmp_path: "Path", mocker: "MockerFixture") -> None:
+    """Cache directory should be deleted."""
+    cache_dir = tmp_path / ".invokelint_cache"
+    cache_dir.joinpath("results").mkdir(parents=True)
+    mocker.patch("invokelint._clean.CACHE_DIR", cache_dir)
+    cache(context)
+    assert not cache_dir.exists()
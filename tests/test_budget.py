@@ -0,0 +1,89 @@
+"""Tests for `budget` package."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+from typing import Any
+
+import pytest
+from invoke import Context
+from invoke import Exit
+
+from invokelint.budget import RuntimeHistory
+from invokelint.budget import build_timeout_context
+from invokelint.budget import parse_duration
+from invokelint.budget import run_within_budget
+from invokelint.run import run_in_pty
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from invoke import Result
+
+
+@pytest.mark.parametrize(
+    ("duration", "expected"),
+    [("10s", 10.0), ("500ms", 0.5), ("1.5m", 90.0), ("3", 3.0)],
+)
+def test_parse_duration(duration: str, expected: float) -> None:
+    assert parse_duration(duration) == expected
+
+
+def test_parse_duration_invalid() -> None:
+    with pytest.raises(Exit, match="--budget requires duration"):
+        parse_duration("ten seconds")
+
+
+# Reason: Compatibility with TaskFunction. pylint: disable=unused-argument
+def call_quick(context: Context, **kwargs: Any) -> list[Result]:  # noqa: ARG001
+    return [run_in_pty(context, "echo quick")]
+
+
+# Reason: Compatibility with TaskFunction. pylint: disable=unused-argument
+def call_slow(context: Context, **kwargs: Any) -> list[Result]:  # noqa: ARG001
+    return [run_in_pty(context, "sleep 5")]
+
+
+def test_runtime_history(tmp_path: Path) -> None:
+    """Estimate should be median of recent runtimes and it should be saved."""
+    path = tmp_path / "history.json"
+    history = RuntimeHistory(path)
+    assert history.estimate(call_quick) == 0.0
+    for runtime in [1.0, 9.0, 2.0, 3.0, 4.0, 5.0]:
+        history.record("quick", runtime)
+    history.save()
+    assert RuntimeHistory(path).runtimes == {"quick": [9.0, 2.0, 3.0, 4.0, 5.0]}
+    median = 4.0
+    assert RuntimeHistory(path).estimate(call_quick) == median
+
+
+def test_runtime_history_read_only(tmp_path: Path) -> None:
+    """History which can't be written should be ignored, e.g. in read-only checkout."""
+    (tmp_path / "cache").write_text("", encoding="utf-8")
+    history = RuntimeHistory(tmp_path / "cache" / "history.json")
+    history.record("quick", 1.0)
+    history.save()
+    assert RuntimeHistory(tmp_path / "cache" / "history.json").runtimes == {}
+
+
+def test_measure_timed_out(tmp_path: Path) -> None:
+    """Timed out task should be reported instead of failure and its runtime should be recorded."""
+    history = RuntimeHistory(tmp_path / "history.json")
+    context = Context()
+    context.config.run.in_stream = False
+    timeout = 0.5
+    assert history.measure(call_slow)(build_timeout_context(context, timeout)) == []
+    assert history.timed_out == ["slow"]
+    assert history.runtimes["slow"][0] >= timeout
+
+
+def test_run_within_budget(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Tasks estimated to exceed the budget should be deferred and reported."""
+    history = RuntimeHistory(tmp_path / "history.json")
+    history.record("slow", 60.0)
+    list_task = history.wrap([call_slow, call_quick])
+    list_result = run_within_budget(list_task, Context(), history=history, deadline=time.monotonic() + 10)
+    assert [result.command for result in list_result] == ["echo quick"]
+    assert "Deferred (estimated to exceed budget" in capsys.readouterr().err
+    assert len(history.runtimes["quick"]) == 1
@@ -0,0 +1,105 @@
+"""Tests for `cache` package."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import Any
+
+from invoke import Result
+
+from invokelint.cache import ResultCache
+from invokelint.cache import build_key
+from invokelint.cache import cache_task
+from invokelint.cache import get_executable
+from invokelint.cache import get_mtime_ns
+from invokelint.cache import list_key_files
+from invokelint.cache import wrap_tasks
+from invokelint.lint import call_dodgy
+from invokelint.lint import call_mypy
+from invokelint.lint import call_ruff
+from invokelint.path import list_python_files
+from invokelint.style import call_ruff_fmt
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from invoke import Context
+    from pytest_mock import MockerFixture
+
+
+def test_get_executable() -> None:
+    assert get_executable(call_ruff) == "ruff"
+    assert get_executable(call_ruff_fmt) == "ruff"
+
+
+def test_build_key(tmp_path: Path) -> None:
+    """Key should change when content of target file changes."""
+    file = tmp_path / "module.py"
+    file.write_text("a = 1\n", encoding="utf-8")
+    key = build_key("python", "call_tool", {}, [str(file)])
+    assert build_key("python", "call_tool", {}, [str(file)]) == key
+    assert build_key("python", "call_tool", {"check": True}, [str(file)]) != key
+    file.write_text("a = 2\n", encoding="utf-8")
+    assert build_key("python", "call_tool", {}, [str(file)]) != key
+
+
+def test_result_cache_evict(tmp_path: Path) -> None:
+    """Least recently used entry should be evicted."""
+    result_cache = ResultCache(tmp_path, max_entries=2)
+    result_cache.store("first", [])
+    result_cache.store("second", [])
+    assert result_cache.contains("first")
+    result_cache.store("third", [])
+    assert result_cache.contains("first")
+    assert not result_cache.contains("second")
+    assert result_cache.contains("third")
+
+
+def test_result_cache_evict_concurrently(tmp_path: Path, mocker: MockerFixture) -> None:
+    """Entries which another worker has already evicted should be skipped."""
+    result_cache = ResultCache(tmp_path, max_entries=1)
+    for key in ["first", "second", "third"]:
+        (tmp_path / key).write_text("{}", encoding="utf-8")
+    assert not get_mtime_ns(tmp_path / "fourth")
+    mocker.patch("pathlib.Path.unlink", side_effect=FileNotFoundError)
+    result_cache.evict()
+
+
+def test_result_cache_contains_evicted(tmp_path: Path, mocker: MockerFixture) -> None:
+    """Entry which another worker evicts while checking should be missed."""
+    result_cache = ResultCache(tmp_path)
+    result_cache.store("first", [])
+    mocker.patch("invokelint.cache.os.utime", side_effect=FileNotFoundError)
+    assert not result_cache.contains("first")
+
+
+def test_list_key_files(context: Context) -> None:
+    """Key of tools which read imported modules should cover all Python files to lint."""
+    targets = ["invokelint/cache.py"]
+    assert list_key_files(call_ruff.__name__, targets, context) == targets
+    assert list_key_files(call_mypy.__name__, targets, context) == list_python_files(None, context)
+
+
+def test_cache_task(tmp_path: Path, context: Context) -> None:
+    """Task should be skipped when inputs haven't changed since the last passing run."""
+    file = tmp_path / "module.py"
+    file.write_text("a = 1\n", encoding="utf-8")
+    list_call = []
+
+    # Reason: Compatibility with TaskFunction. pylint: disable-next=unused-argument
+    def call_tool(context: Context, **kwargs: Any) -> list[Result]:  # noqa: ARG001
+        list_call.append(kwargs)
+        return [Result()]
+
+    cached_task = cache_task(call_tool, ResultCache(tmp_path / "cache"))
+    assert len(cached_task(context, targets=[str(file)])) == 1
+    assert not cached_task(context, targets=[str(file)])
+    file.write_text("a = 2\n", encoding="utf-8")
+    assert len(cached_task(context, targets=[str(file)])) == 1
+    assert len(list_call) == 2  # noqa: PLR2004
+
+
+def test_wrap_tasks_not_cacheable() -> None:
+    """Dodgy should not be cached since it scans whole working directory."""
+    assert wrap_tasks([call_dodgy], enabled=True) == [call_dodgy]
+    assert wrap_tasks([call_ruff], enabled=True) != [call_ruff]
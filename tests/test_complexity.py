@@ -0,0 +1,120 @@
+"""Tests for `complexity` package."""
+
+from __future__ import annotations
+
+from textwrap import dedent
+from typing import TYPE_CHECKING
+
+import pytest
+from invoke import UnexpectedExit
+
+from invokelint.complexity import Block
+from invokelint.complexity import ComplexityCache
+from invokelint.complexity import FileMetrics
+from invokelint.complexity import analyze
+from invokelint.complexity import analyze_file
+from invokelint.complexity import find_infractions
+from invokelint.complexity import report_cc
+from invokelint.complexity import report_mi
+from invokelint.complexity import result_xenon
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+# Reason: Black <=23.x (Python 3.9-) splits closing `"""` onto its own line, triggering ruff COM812.
+# fmt: off
+CODE = dedent("""\
+    def simple():
+        return 1
+
+
+    class Example:
+        def branch(self, value):
+            if value:
+                return 1
+            return 0
+""")
+# fmt: on
+BLOCK_COMPLEX = Block("F", 1, 0, "complex", 11)
+BLOCK_SIMPLE = Block("F", 20, 0, "simple", 1)
+
+
+def test_analyze_file(tmp_path: Path) -> None:
+    """Blocks and maintainability index should be computed from one file."""
+    path = tmp_path / "example.py"
+    path.write_text(CODE, encoding="utf-8")
+    metrics = analyze_file(str(path))
+    assert metrics.blocks == [
+        Block("F", 1, 0, "simple", 1),
+        Block("C", 5, 0, "Example", 3),
+        Block("M", 6, 4, "Example.branch", 2),
+    ]
+    assert 0 < metrics.mi <= 100  # noqa: PLR2004
+    assert not metrics.error
+
+
+def test_analyze_file_syntax_error(tmp_path: Path) -> None:
+    path = tmp_path / "broken.py"
+    path.write_text("def broken(:\n", encoding="utf-8")
+    assert analyze_file(str(path)).error
+
+
+def test_analyze_file_decode_error(tmp_path: Path) -> None:
+    path = tmp_path / "latin1.py"
+    path.write_bytes("# caf\xe9\n".encode("latin-1"))
+    assert analyze_file(str(path)).error
+
+
+def test_analyze_cache(tmp_path: Path, mocker: MockerFixture) -> None:
+    """Only edited files should be analyzed again."""
+    path = tmp_path / "example.py"
+    path.write_text(CODE, encoding="utf-8")
+    cache_file = tmp_path / "complexity.json"
+    metrics = analyze([str(path)], cache=ComplexityCache(cache_file))
+    spy = mocker.patch("invokelint.complexity.analyze_file", return_value=FileMetrics([], 100.0))
+    assert analyze([str(path)], cache=ComplexityCache(cache_file)) == metrics
+    spy.assert_not_called()
+    path.write_text("def simple():\n    return 1\n", encoding="utf-8")
+    analyze([str(path)], cache=ComplexityCache(cache_file))
+    spy.assert_called_once_with(str(path))
+
+
+def test_report_cc() -> None:
+    """Only files which have blocks ranked min rank or worse should be reported."""
+    metrics = {
+        "complex.py": FileMetrics([BLOCK_SIMPLE, BLOCK_COMPLEX], 50.0),
+        "simple.py": FileMetrics([BLOCK_SIMPLE], 80.0),
+        "broken.py": FileMetrics([], 0.0, "invalid syntax"),
+    }
+    expected = "complex.py\n    F 1:0 complex - C (11)\nbroken.py\n    ERROR: invalid syntax\n"
+    assert report_cc(metrics, min_rank="B", show_complexity=True) == expected
+
+
+def test_report_mi() -> None:
+    metrics = {"good.py": FileMetrics([], 50.0), "bad.py": FileMetrics([], 5.0)}
+    assert report_mi(metrics, show=True) == "good.py - A (50.00)\nbad.py - C (5.00)\n"
+
+
+def test_find_infractions() -> None:
+    """Blocks, average, and modules over thresholds should be reported in order of Xenon."""
+    metrics = {
+        "complex.py": FileMetrics([BLOCK_COMPLEX], 50.0),
+        "simple.py": FileMetrics([BLOCK_SIMPLE], 80.0),
+        "broken.py": FileMetrics([], 0.0, "invalid syntax"),
+    }
+    assert find_infractions(metrics, absolute="A", modules="A", average="A") == [
+        'block "complex.py:1 complex" has a rank of C',
+        "average complexity is ranked B",
+        "module 'complex.py' has a rank of C",
+    ]
+    assert not find_infractions(metrics, absolute="C", modules="C", average="B")
+
+
+def test_result_xenon() -> None:
+    """Result should fail when there are infractions."""
+    assert result_xenon("xenon", {"simple.py": FileMetrics([BLOCK_SIMPLE], 80.0)}).ok
+    with pytest.raises(UnexpectedExit) as exc_info:
+        result_xenon("xenon", {"complex.py": FileMetrics([BLOCK_COMPLEX], 50.0)})
+    assert exc_info.value.result.stdout.startswith('ERROR:xenon:block "complex.py:1 complex"')
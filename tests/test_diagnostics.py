@@ -0,0 +1,148 @@
+"""Tests for `diagnostics` package."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+from invoke import Context
+from invoke import Result
+from invoke import UnexpectedExit
+
+from invokelint.diagnostics import Diagnostic
+from invokelint.diagnostics import clear_semgrep_json
+from invokelint.diagnostics import parse
+from invokelint.diagnostics import parseable_options
+from invokelint.diagnostics import reporter
+from invokelint.diagnostics import reporting
+from invokelint.diagnostics import to_sarif
+from invokelint.run import run_in_pty
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+
+@pytest.mark.parametrize(
+    ("command", "stdout", "expected"),
+    [
+        (
+            "ruff check --output-format concise invokelint",
+            "\x1b[1mbad.py\x1b[0m:2:8: F401 [*] `os` imported but unused\r\nFound 1 error.\r\n",
+            [Diagnostic("ruff", "bad.py", 2, 8, "F401", "`os` imported but unused")],
+        ),
+        (
+            "flake8 --format default invokelint",
+            "bad.py:4:1: E302 expected 2 blank lines, found 0\n",
+            [Diagnostic("flake8", "bad.py", 4, 1, "E302", "expected 2 blank lines, found 0")],
+        ),
+        (
+            "bandit --format custom invokelint",
+            "bad.py:5:4: B101 [LOW] Use of assert detected.\n",
+            [Diagnostic("bandit", "bad.py", 5, 5, "B101", "Use of assert detected.", "warning")],
+        ),
+        (
+            "pylint invokelint",
+            "************* Module bad\nbad.py:1:0: C0114 Missing module docstring (missing-module-docstring)\n",
+            [Diagnostic("pylint", "bad.py", 1, 1, "C0114", "Missing module docstring (missing-module-docstring)")],
+        ),
+        (
+            "mypy --show-column-numbers --no-pretty invokelint",
+            'm.py:2:12: error: Incompatible return value type (got "int", expected "str")  [return-value]\n'
+            "Found 1 error in 1 file (checked 1 source file)\n",
+            [
+                Diagnostic(
+                    "mypy",
+                    "m.py",
+                    2,
+                    12,
+                    "return-value",
+                    'Incompatible return value type (got "int", expected "str")',
+                ),
+            ],
+        ),
+        (
+            "pydocstyle invokelint",
+            "bad.py:4 in public function `f`:\n        D103: Missing docstring in public function\n",
+            [Diagnostic("pydocstyle", "bad.py", 4, 0, "D103", "Missing docstring in public function")],
+        ),
+        (
+            "dodgy --ignore-paths csvinput",
+            '{"warnings": [{"path": "bad.py", "line": 3, "code": "password", "message": "Possible password"}]}',
+            [Diagnostic("dodgy", "bad.py", 3, 0, "password", "Possible password")],
+        ),
+        (
+            "xenon --max-absolute A invokelint",
+            "ERROR:xenon:block \"bad.py:4 f\" has a rank of B\nERROR:xenon:module 'bad.py' has a rank of B\n"
+            "ERROR:xenon:average complexity is ranked B\n",
+            [
+                Diagnostic("xenon", "bad.py", 4, 0, "max-absolute", 'block "bad.py:4 f" has a rank of B'),
+                Diagnostic("xenon", "bad.py", 0, 0, "max-modules", "module 'bad.py' has a rank of B"),
+            ],
+        ),
+    ],
+)
+def test_parse(command: str, stdout: str, expected: list[Diagnostic]) -> None:
+    """Output of each tool should be parsed into common diagnostics."""
+    assert parse(Result(stdout=stdout, command=command)) == expected
+
+
+def test_parse_unknown_tool() -> None:
+    """Command of tool which has no parser should be ignored."""
+    assert parse(Result(stdout="bad.py:1:1: X1 message", command="cohesion --directory invokelint")) is None
+
+
+def test_to_sarif() -> None:
+    """Region should be omitted when location in file is unknown."""
+    sarif = to_sarif(
+        ["ruff", "xenon"],
+        [
+            Diagnostic("ruff", "bad.py", 2, 8, "F401", "`os` imported but unused"),
+            Diagnostic("xenon", "bad.py", 0, 0, "max-modules", "module 'bad.py' has a rank of B"),
+        ],
+    )
+    ruff, xenon = sarif["runs"]
+    assert ruff["tool"]["driver"]["name"] == "ruff"
+    location = ruff["results"][0]["locations"][0]["physicalLocation"]
+    assert location == {"artifactLocation": {"uri": "bad.py"}, "region": {"startLine": 2, "startColumn": 8}}
+    assert "region" not in xenon["results"][0]["locations"][0]["physicalLocation"]
+
+
+def test_reporting_jsonl(tmp_path: Path) -> None:
+    """Diagnostics should be appended even if command fails, options should be added only while reporting."""
+    path = tmp_path / "report.jsonl"
+    assert parseable_options("flake8") == ""
+    with reporting(str(path)):
+        reporter.record(Result(stdout="bad.py:1:1: F401 unused\n", command="ruff check"))
+        command = f"flake8{parseable_options('flake8')} {tmp_path / 'not_exist.py'}"
+        with pytest.raises(UnexpectedExit):
+            run_in_pty(Context(), command, hide=True, in_stream=False)
+    assert not reporter.enabled
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["code"] for line in lines] == ["F401", "E902"]
+
+
+def test_reporting_sarif(tmp_path: Path) -> None:
+    """SARIF should be rewritten with all diagnostics as each command finishes."""
+    path = tmp_path / "report.sarif"
+    with reporting(str(path)):
+        reporter.record(Result(stdout="bad.py:1:1: F401 unused\n", command="ruff check"))
+        reporter.record(Result(stdout="bad.py:2:1: E302 blank\n", command="flake8"))
+        runs = json.loads(path.read_text(encoding="utf-8"))["runs"]
+    assert [run["tool"]["driver"]["name"] for run in runs] == ["ruff", "flake8"]
+    assert [run["results"][0]["ruleId"] for run in runs] == ["F401", "E302"]
+
+
+def test_parse_semgrep(tmp_path: Path, mocker: MockerFixture) -> None:
+    """JSON of the previous run should not be reported after it is cleared before the next run."""
+    semgrep_json = tmp_path / "semgrep.json"
+    mocker.patch("invokelint.diagnostics.SEMGREP_JSON", semgrep_json)
+    finding = {"path": "a.py", "start": {"line": 1, "col": 2}, "check_id": "rule", "extra": {"message": "bad"}}
+    semgrep_json.write_text(json.dumps({"results": [finding]}), encoding="utf-8")
+    result = Result(command="semgrep scan --json-output semgrep.json")
+    assert parse(result) == [Diagnostic("semgrep", "a.py", 1, 2, "rule", "bad", "warning")]
+    clear_semgrep_json()
+    clear_semgrep_json()
+    assert parse(result) == []
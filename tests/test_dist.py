@@ -1,15 +1,48 @@
 """Tests for `dist` package."""
 
+import shlex
+import sys
+from pathlib import Path
 from typing import TYPE_CHECKING
+from typing import Any
 
 import pytest
+from invoke import Result
 
 from invokelint.dist import dist
+from invokelint.dist import get_build_env_python
+from invokelint.dist import list_input_files
 from invokelint.dist import module_exists
+from invokelint.dist import prepare_build_env
 from tests.testlibraries import check_result
 
 if TYPE_CHECKING:
     from invoke import Context
+    from pytest_mock import MockerFixture
+    from pytest_mock import MockType
+
+
+@pytest.fixture(name="project")
+def fixture_project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, mocker: "MockerFixture") -> Path:
+    """Project which has package and cache of bytecode."""
+    monkeypatch.chdir(tmp_path)
+    mocker.patch("invokelint.dist.list_input_files", return_value=["pyproject.toml", "package/module.py"])
+    for file in ["pyproject.toml", "package/module.py", "package/__pycache__/module.pyc"]:
+        (tmp_path / file).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / file).write_text("", encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture(name="build_packages")
+def fixture_build_packages(mocker: "MockerFixture") -> "MockType":
+    """Builds package into dist/ without running commands."""
+
+    def build_packages(*_args: Any, **_kwargs: Any) -> Result:
+        Path("dist").mkdir()
+        Path("dist", "package-0.0.0.tar.gz").write_text("built", encoding="utf-8")
+        return Result(command="python -m build")
+
+    return mocker.patch("invokelint.dist.build_packages", side_effect=build_packages)
 
 
 @pytest.mark.usefixtures("_package_not_exists")
@@ -27,7 +60,7 @@ def test_module_exists(parameter: str, *, expect: bool) -> None:
 
 @pytest.mark.slow
 def test_dist_build(context: "Context") -> None:
-    check_result(dist(context), "python -m build")
+    check_result(dist(context, force=True), "python -m build")
 
 
 @pytest.mark.slow
@@ -42,3 +75,54 @@ def test_dist_setup_py(context: "Context") -> None:
 def test_dist_error(context: "Context") -> None:
     with pytest.raises(ModuleNotFoundError, match=r"Neither build nor wheel module exists\."):
         check_result(dist(context), "python setup.py bdist_wheel")
+
+
+def test_dist_skips_up_to_date(context: "Context", project: Path, build_packages: "MockType") -> None:
+    """Build should be skipped while packages in dist/ match sources, and only outputs of build are cleaned."""
+    check_result(dist(context), "python -m build")
+    assert "up to date" in dist(context).stdout
+    assert build_packages.call_count == 1
+    (project / "package" / "module.py").write_text("changed = True\n", encoding="utf-8")
+    check_result(dist(context), "python -m build")
+    (project / "dist" / "package-0.0.0.tar.gz").write_text("replaced", encoding="utf-8")
+    check_result(dist(context), "python -m build")
+    check_result(dist(context, force=True), "python -m build")
+    assert build_packages.call_count == 4  # noqa: PLR2004
+    assert (project / "package" / "__pycache__" / "module.pyc").exists()
+
+
+def test_list_input_files() -> None:
+    files = list_input_files()
+    assert "pyproject.toml" in files
+    assert str(Path("invokelint", "dist.py")) in files
+    assert not any("__pycache__" in file for file in files)
+
+
+@pytest.mark.usefixtures("project")
+def test_prepare_build_env(context: "Context", mocker: "MockerFixture") -> None:
+    """Environment should be created once, and requirements should be installed again only when they change."""
+
+    def run_in_pty(_context: "Context", command: str) -> Result:
+        if " venv " in command:
+            get_build_env_python().parent.mkdir(parents=True)
+            get_build_env_python().touch()
+        return Result(command=command)
+
+    run = mocker.patch("invokelint.dist.run_in_pty", side_effect=run_in_pty)
+    requires = mocker.patch("invokelint.dist.list_build_requires", return_value=["setuptools"])
+    mocker.patch("invokelint.dist.list_backend_requires", return_value=[])
+    prepare_build_env(context)
+    assert [call.args[1].split(" ")[:3] for call in run.call_args_list] == [
+        [shlex.quote(sys.executable), "-m", "venv"],
+        [shlex.quote(str(get_build_env_python())), "-m", "pip"],
+    ]
+    prepare_build_env(context)
+    assert run.call_count == 2  # noqa: PLR2004
+    requires.return_value = ["setuptools>=61"]
+    mocker.patch("invokelint.dist.list_backend_requires", return_value=["wheel"])
+    prepare_build_env(context)
+    commands = [call.args[1] for call in run.call_args_list[2:]]
+    assert [command.split(" ", 1)[1] for command in commands] == [
+        "-m pip install build 'setuptools>=61'",
+        "-m pip install wheel",
+    ]
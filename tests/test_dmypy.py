@@ -0,0 +1,43 @@
+"""Tests for `dmypy` package."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from invoke import Result
+
+from invokelint import dmypy
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from invoke import Context
+    from pytest_mock import MockerFixture
+
+
+def test_run_restarts_when_fingerprint_changes(context: Context, tmp_path: Path, mocker: MockerFixture) -> None:
+    """Daemon should be stopped before run only when interpreter or configuration changed."""
+    status_file = tmp_path / "dmypy.json"
+    status_file.write_text("{}", encoding="utf-8")
+    mocker.patch("invokelint.dmypy.STATUS_FILE", status_file)
+    mocker.patch("invokelint.dmypy.FINGERPRINT_FILE", tmp_path / "dmypy_fingerprint")
+    mock_fingerprint = mocker.patch("invokelint.dmypy.fingerprint", return_value="a")
+    mock_run_in_pty = mocker.patch("invokelint.dmypy.run_in_pty", return_value=Result())
+    dmypy.run(context, "invokelint tests", options=" --show-column-numbers")
+    dmypy.run(context, "invokelint tests")
+    mock_fingerprint.return_value = "b"
+    dmypy.run(context, "invokelint tests")
+    status = status_file.as_posix()
+    assert [call.args[1] for call in mock_run_in_pty.call_args_list] == [
+        f"dmypy --status-file {status} stop",
+        f"dmypy --status-file {status} run -- --show-column-numbers invokelint tests",
+        f"dmypy --status-file {status} run -- invokelint tests",
+        f"dmypy --status-file {status} stop",
+        f"dmypy --status-file {status} run -- invokelint tests",
+    ]
+
+
+def test_stop_not_started(context: Context, tmp_path: Path, mocker: MockerFixture) -> None:
+    """Nothing should run when daemon has never started."""
+    mocker.patch("invokelint.dmypy.STATUS_FILE", tmp_path / "dmypy.json")
+    assert not dmypy.stop(context)
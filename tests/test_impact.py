@@ -0,0 +1,127 @@
+"""Tests for `impact` package."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from invokelint.impact import ImpactMap
+from invokelint.impact import convert_to_node_id
+from invokelint.impact import parse_coverage_json
+from invokelint.path.imports import ImportGraph
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+FILES = {
+    "invokelint/lint.py": ["tests/test_lint.py::test_fast", "tests/test_lint.py::test_ruff"],
+    "invokelint/run.py": ["tests/test_lint.py::test_fast", "tests/test_run.py::test_run_in_parallel"],
+}
+# Records of deleted module, deleted test module, and renamed test.
+FILES_STALE = {
+    "invokelint/deleted.py": ["tests/test_lint.py::test_fast", "tests/test_deleted.py::test_deleted"],
+    "invokelint/shard.py": ["tests/test_shard.py::test_renamed", "tests/test_shard.py::test_run_sharded"],
+}
+
+
+@pytest.mark.parametrize(
+    ("label", "expected"),
+    [
+        ("tests.test_lint.test_fast", "tests/test_lint.py::test_fast"),
+        ("tests.test_lint.TestClass.test_method", "tests/test_lint.py::TestClass::test_method"),
+        ("not_exist.test_fast", None),
+    ],
+)
+def test_convert_to_node_id(label: str, expected: str | None) -> None:
+    """Label should be split at existing module."""
+    assert convert_to_node_id(label) == expected
+
+
+def test_parse_coverage_json() -> None:
+    """Lines executed out of tests should be ignored."""
+    content = {
+        "files": {
+            "invokelint/run.py": {
+                "contexts": {"1": [""], "2": ["tests.test_run.test_run_in_parallel", "tests.test_lint.test_fast"]},
+            },
+            "invokelint/__init__.py": {"contexts": {"0": [""]}},
+        },
+    }
+    assert parse_coverage_json(content) == {
+        "invokelint/run.py": FILES["invokelint/run.py"],
+        "invokelint/__init__.py": [],
+    }
+
+
+@pytest.mark.parametrize(
+    ("changed_files", "expected"),
+    [
+        (["invokelint/lint.py"], FILES["invokelint/lint.py"]),
+        (
+            ["invokelint/lint.py", "invokelint/run.py"],
+            [*FILES["invokelint/lint.py"], "tests/test_run.py::test_run_in_parallel"],
+        ),
+        (["tests/test_style.py"], ["tests/test_style.py"]),
+        (["README.md"], []),
+        (["invokelint/new.py"], None),
+        (["invokelint/deleted.py"], ["tests/test_lint.py::test_fast"]),
+        (["tests/test_deleted.py"], []),
+        (["invokelint/shard.py"], ["tests/test_shard.py"]),
+        (
+            ["invokelint/shard.py", "tests/test_shard.py", "invokelint/run.py"],
+            ["tests/test_shard.py", *FILES["invokelint/run.py"]],
+        ),
+        (["tests/testlibraries/__init__.py"], None),
+        (["tests/conftest.py"], None),
+        (["invokelint/lint.py", "pyproject.toml"], None),
+    ],
+)
+def test_select(tmp_path: Path, changed_files: list[str], expected: list[str] | None) -> None:
+    """All tests should run when changes can't be mapped to tests, including deleted files."""
+    impact_map = ImpactMap(tmp_path / "test_map.json")
+    impact_map.files = {**FILES, **FILES_STALE}
+    assert impact_map.select(changed_files) == expected
+
+
+def test_select_importing_tests(tmp_path: Path) -> None:
+    """Test modules importing unmeasured files should run instead of all tests."""
+    impact_map = ImpactMap(tmp_path / "test_map.json")
+    impact_map.files = dict(FILES)
+    graph = ImportGraph(tmp_path / "imports.json")
+    graph.update(["tests/testlibraries/__init__.py", "tests/test_style.py", "tests/test_run.py"])
+    assert impact_map.select(["tests/testlibraries/__init__.py"], graph) == ["tests/test_style.py"]
+    assert impact_map.select(["invokelint/new.py"], graph) is None
+
+
+def test_update(tmp_path: Path) -> None:
+    """Records of rerun tests should be replaced, others should be kept."""
+    impact_map = ImpactMap(tmp_path / "test_map.json")
+    impact_map.files = dict(FILES)
+    impact_map.update({"invokelint/run.py": ["tests/test_lint.py::test_fast"]}, ["tests/test_lint.py::test_fast"])
+    assert impact_map.files == {
+        "invokelint/lint.py": ["tests/test_lint.py::test_ruff"],
+        "invokelint/run.py": ["tests/test_lint.py::test_fast", "tests/test_run.py::test_run_in_parallel"],
+    }
+    impact_map.update({"invokelint/run.py": []}, None)
+    assert impact_map.files == {"invokelint/run.py": []}
+
+
+def test_save(tmp_path: Path) -> None:
+    """Saved map should be valid only with the same stamp."""
+    path = tmp_path / "cache" / "test_map.json"
+    assert not ImpactMap(path).is_valid("stamp")
+    impact_map = ImpactMap(path)
+    impact_map.files = dict(FILES)
+    impact_map.save("stamp")
+    assert ImpactMap(path).files == FILES
+    assert ImpactMap(path).is_valid("stamp")
+    assert not ImpactMap(path).is_valid("changed")
+
+
+def test_save_read_only(tmp_path: Path) -> None:
+    """Map which can't be written should be ignored."""
+    path = tmp_path / "file" / "test_map.json"
+    path.parent.write_text("", encoding="utf-8")
+    ImpactMap(path).save("stamp")
+    assert not ImpactMap(path).is_valid("stamp")
@@ -1,17 +1,27 @@
 """Tests for `lint` package."""
 
+import json
 import platform
 import sys
+from functools import partial
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 import pytest
 
+from invokelint.config import set_config
+from invokelint.dmypy import STATUS_FILE
+from invokelint.dmypy import stop
 from invokelint.lint import bandit
+from invokelint.lint import build_deep_tasks
+from invokelint.lint import call_semgrep
 from invokelint.lint import cohesion
 from invokelint.lint import deep
 from invokelint.lint import dodgy
 from invokelint.lint import fast
 from invokelint.lint import flake8
+from invokelint.lint import lint_captured
+from invokelint.lint import lint_source_captured
 from invokelint.lint import mypy
 from invokelint.lint import pydocstyle
 from invokelint.lint import pylint
@@ -20,14 +30,23 @@ from invokelint.lint import radon_cc
 from invokelint.lint import radon_mi
 from invokelint.lint import ruff_task
 from invokelint.lint import semgrep
+from invokelint.lint import watch
 from invokelint.lint import xenon
+from invokelint.run import build_buffered_context
+from invokelint.run import count_cpus
+from invokelint.semgrep_rules import resolve_config
+from invokelint.serve import LintServer
+from invokelint.timing import profiler
+from invokelint.timing import profiling
 from tests.test_style import LIST_COMMAND_EXPECTED_STYLE_BY_RUFF
 from tests.test_style import LIST_COMMAND_EXPECTED_STYLE_NO_RUFF
 from tests.test_style import LIST_COMMAND_EXPECTED_STYLE_WITHOUT_RUFF_BY_RUFF
+from tests.testlibraries import ScriptedWatcher
 from tests.testlibraries import check_list_result
 
 if TYPE_CHECKING:
     from invoke import Context
+    from pytest_mock import MockerFixture
 
 PYTHON_DIR_EXCLUDING_TEST = "invokelint setup.py tasks.py"
 TEST_DIR = "tests"
@@ -43,9 +62,25 @@ COMMAND_EXPECTED_PYDOCSTYLE = f"pydocstyle {PYTHON_DIR}"
 COMMAND_EXPECTED_XENON = f"xenon --max-absolute A --max-modules A --max-average A {PYTHON_DIR}"
 COMMAND_EXPECTED_MYPY = f"mypy {PYTHON_DIR}"
 COMMAND_EXPECTED_PYLINT = f"pylint {PYTHON_DIR}"
-COMMAND_EXPECTED_SEMGREP = "semgrep scan --oss-only --config p/python --metrics off " + " ".join(
-    [f"--include {code}" for code in PYTHON_DIR.split(" ")],
+# Committed snapshot, so that Semgrep scans without network.
+SEMGREP_RULES_FILE = Path("tests/testresources/semgrep_rules.yml")
+INCLUDES_SEMGREP = " ".join(f"--include {code}" for code in PYTHON_DIR.split(" "))
+COMMAND_EXPECTED_SEMGREP = (
+    f"semgrep scan --oss-only --config {SEMGREP_RULES_FILE.as_posix()} --metrics off --jobs {count_cpus()} "
+    + INCLUDES_SEMGREP
 )
+# Semgrep shares CPUs with mypy and Pylint running at once.
+COMMAND_EXPECTED_SEMGREP_PARALLEL = (
+    f"semgrep scan --oss-only --config {SEMGREP_RULES_FILE.as_posix()} --metrics off"
+    f" --jobs {max(count_cpus() // min(count_cpus(), 3), 1)} {INCLUDES_SEMGREP}"
+)
+
+
+@pytest.fixture
+def _semgrep_snapshot(mocker: "MockerFixture", monkeypatch: pytest.MonkeyPatch) -> None:
+    """Scans by committed snapshot instead of registry, without version check which waits for network."""
+    mocker.patch("invokelint.lint.resolve_config", partial(resolve_config, SEMGREP_RULES_FILE))
+    monkeypatch.setenv("SEMGREP_ENABLE_VERSION_CHECK", "0")
 
 
 def test_radon_cc(context: "Context") -> None:
@@ -56,22 +91,40 @@ def test_radon_mi(context: "Context") -> None:
     check_list_result(radon_mi(context), [COMMAND_EXPECTED_RADON_MI])
 
 
+def test_radon_in_process(context: "Context") -> None:
+    """Radon and Xenon should report by analysis in this process."""
+    check_list_result(radon(context, in_process=True), [COMMAND_EXPECTED_RADON_CC, COMMAND_EXPECTED_RADON_MI])
+    check_list_result(radon_cc(context, in_process=True, jobs=1), [COMMAND_EXPECTED_RADON_CC])
+    check_list_result(radon_mi(context, in_process=True), [COMMAND_EXPECTED_RADON_MI])
+    check_list_result(xenon(context, in_process=True), [COMMAND_EXPECTED_XENON])
+
+
 def test_radon(context: "Context") -> None:
+    """Commands should be profiled as same as other linters."""
     list_command_expected = [COMMAND_EXPECTED_RADON_CC, COMMAND_EXPECTED_RADON_MI]
-    list_result = radon(context)
+    with profiling(enabled=False):
+        list_result = radon(context)
+        assert sorted(timing.command for timing in profiler.sorted()) == list_command_expected
     check_list_result(list_result, list_command_expected)
 
 
+LIST_COMMAND_EXPECTED_COHESION = [
+    "cohesion --directory invokelint",
+    "cohesion --directory setup.py",
+    "cohesion --directory tasks.py",
+    "cohesion --directory tests",
+]
+
+
 def test_cohesion(context: "Context") -> None:
-    """Function: cohesion() should run appropriate commands."""
-    list_command_expected = [
-        "cohesion --directory invokelint",
-        "cohesion --directory setup.py",
-        "cohesion --directory tasks.py",
-        "cohesion --directory tests",
-    ]
+    """Function: cohesion() should run appropriate commands and return results in order of directories."""
     list_result = cohesion(context)
-    check_list_result(list_result, list_command_expected)
+    check_list_result(list_result, LIST_COMMAND_EXPECTED_COHESION)
+
+
+def test_cohesion_jobs_1(context: "Context") -> None:
+    """Function: cohesion() should run appropriate commands one by one."""
+    check_list_result(cohesion(context, jobs=1), LIST_COMMAND_EXPECTED_COHESION)
 
 
 def test_ruff(context: "Context") -> None:
@@ -82,10 +135,22 @@ def test_bandit(context: "Context") -> None:
     check_list_result(bandit(context), [COMMAND_EXPECTED_BANDIT])
 
 
+def test_bandit_shards(context: "Context") -> None:
+    """Results of shards should be merged into one result of the command."""
+    check_list_result(bandit(context, shards=2), [COMMAND_EXPECTED_BANDIT])
+
+
 def test_dodgy(context: "Context") -> None:
     check_list_result(dodgy(context), [COMMAND_EXPECTED_DODGY])
 
 
+def test_dodgy_index(context: "Context", mocker: "MockerFixture") -> None:
+    """Entries which .gitignore ignores should be skipped when index is enabled."""
+    mocker.patch("invokelint.lint.list_ignored_paths", return_value=["^csvoutput(/|$)"])
+    set_config(context, index=True)
+    check_list_result(dodgy(context), [f"{COMMAND_EXPECTED_DODGY} '^csvoutput(/|$)'"])
+
+
 def test_flake8(context: "Context") -> None:
     check_list_result(flake8(context), [COMMAND_EXPECTED_FLAKE8])
 
@@ -104,20 +169,25 @@ LIST_COMMAND_EXPECTED = [
     COMMAND_EXPECTED_DODGY,
     COMMAND_EXPECTED_FLAKE8_NO_RADON,
 ]
+# Ruff check is skipped since style already ran it.
+LIST_COMMAND_EXPECTED_AFTER_STYLE = [
+    COMMAND_EXPECTED_BANDIT,
+    COMMAND_EXPECTED_DODGY,
+    COMMAND_EXPECTED_FLAKE8_NO_RADON,
+]
 LIST_COMMAND_EXPECTED_WITH_XENON = [
     COMMAND_EXPECTED_XENON,
-    COMMAND_EXPECTED_RUFF_CHECK,
     COMMAND_EXPECTED_BANDIT,
     COMMAND_EXPECTED_DODGY,
     COMMAND_EXPECTED_FLAKE8,
 ]
-LIST_COMMAND_EXPECTED_WITHOUT_XENON = LIST_COMMAND_EXPECTED
+LIST_COMMAND_EXPECTED_WITHOUT_XENON = LIST_COMMAND_EXPECTED_AFTER_STYLE
 
 
 def test_fast(context: "Context") -> None:
     """Command should success and run appropriate commands."""
     list_result = fast(context)
-    check_list_result(list_result, LIST_COMMAND_EXPECTED_STYLE_BY_RUFF + LIST_COMMAND_EXPECTED)
+    check_list_result(list_result, LIST_COMMAND_EXPECTED_STYLE_BY_RUFF + LIST_COMMAND_EXPECTED_AFTER_STYLE)
 
 
 def test_fast_pydocstyle(context: "Context") -> None:
@@ -125,10 +195,37 @@ def test_fast_pydocstyle(context: "Context") -> None:
     list_result = fast(context, pydocstyle=True)
     check_list_result(
         list_result,
-        LIST_COMMAND_EXPECTED_STYLE_BY_RUFF + LIST_COMMAND_EXPECTED + [COMMAND_EXPECTED_PYDOCSTYLE],
+        LIST_COMMAND_EXPECTED_STYLE_BY_RUFF + LIST_COMMAND_EXPECTED_AFTER_STYLE + [COMMAND_EXPECTED_PYDOCSTYLE],
     )
 
 
+def test_fast_jobs(context: "Context") -> None:
+    """Command should success and return results in order even if linters run concurrently."""
+    list_result = fast(context, skip_format=True, jobs=0)
+    check_list_result(list_result, LIST_COMMAND_EXPECTED)
+
+
+def test_fast_changed(context: "Context", mocker: "MockerFixture") -> None:
+    """Only changed files should be linted by file based linters."""
+    mocker.patch("invokelint.path.list_changed_python_files", return_value=["invokelint/lint.py"])
+    list_result = fast(context, skip_format=True, changed=True)
+    check_list_result(
+        list_result,
+        [
+            "ruff check invokelint/lint.py",
+            "bandit --configfile pyproject.toml --recursive invokelint/lint.py",
+            COMMAND_EXPECTED_DODGY,
+            "flake8 invokelint/lint.py",
+        ],
+    )
+
+
+def test_fast_changed_nothing(context: "Context", mocker: "MockerFixture") -> None:
+    """Nothing should be run when no Python file is changed."""
+    mocker.patch("invokelint.path.list_changed_python_files", return_value=[])
+    assert not fast(context, changed=True)
+
+
 def test_fast_xenon(context: "Context") -> None:
     """Command should success and run appropriate commands."""
     list_result = fast(context, xenon=True)
@@ -156,13 +253,13 @@ def test_fast_skip_format(context: "Context") -> None:
 def test_fast_by_ruff(context: "Context") -> None:
     """Command should success and run appropriate commands."""
     list_result = fast(context, by_ruff=True)
-    check_list_result(list_result, LIST_COMMAND_EXPECTED_STYLE_BY_RUFF + LIST_COMMAND_EXPECTED)
+    check_list_result(list_result, LIST_COMMAND_EXPECTED_STYLE_BY_RUFF + LIST_COMMAND_EXPECTED_AFTER_STYLE)
 
 
 def test_fast_no_ruff(context: "Context") -> None:
     """Command should success and run appropriate commands."""
     list_result = fast(context, no_ruff=True)
-    check_list_result(list_result, LIST_COMMAND_EXPECTED_STYLE_NO_RUFF + LIST_COMMAND_EXPECTED)
+    check_list_result(list_result, LIST_COMMAND_EXPECTED_STYLE_NO_RUFF + LIST_COMMAND_EXPECTED_AFTER_STYLE)
 
 
 @pytest.mark.slow
@@ -170,6 +267,18 @@ def test_mypy(context: "Context") -> None:
     check_list_result(mypy(context), [COMMAND_EXPECTED_MYPY])
 
 
+@pytest.mark.slow
+def test_mypy_daemon(context: "Context") -> None:
+    """Daemon should be reused by following checks and be stopped."""
+    status_file = STATUS_FILE.as_posix()
+    command_expected = f"dmypy --status-file {status_file} run -- {PYTHON_DIR}"
+    try:
+        check_list_result(mypy(context, daemon=True), [command_expected])
+        check_list_result(mypy(context, daemon=True), [command_expected])
+    finally:
+        check_list_result(stop(context), [f"dmypy --status-file {status_file} stop"])
+
+
 @pytest.mark.slow
 def test_pylint(context: "Context") -> None:
     check_list_result(pylint(context), [COMMAND_EXPECTED_PYLINT])
@@ -181,12 +290,36 @@ def test_pylint(context: "Context") -> None:
 # - No module found: resource (ModuleNotFoundError) · Issue #7146 · returntocorp/semgrep
 #   https://github.com/returntocorp/semgrep/issues/7146
 @pytest.mark.skipif(sys.platform == "win32", reason="Semgrep doesn't support Windows.")
+@pytest.mark.usefixtures("_semgrep_snapshot")
 def test_semgrep(context: "Context") -> None:
     """Command should success and run appropriate commands."""
     check_list_result(semgrep(context), [COMMAND_EXPECTED_SEMGREP])
 
 
+def test_call_semgrep(context: "Context", mocker: "MockerFixture") -> None:
+    """CI mode should be passed from deep, and baseline commit should be quoted."""
+    mock_run_in_pty = mocker.patch("invokelint.lint.run_in_pty")
+    call_semgrep(context, ci=True, baseline_commit="main; echo", daemon=False)
+    command = mock_run_in_pty.call_args.args[1]
+    assert command.startswith("semgrep ci --baseline-commit 'main; echo' ")
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Semgrep doesn't support Windows.")
+def test_build_deep_tasks(context: "Context", mocker: "MockerFixture") -> None:
+    """Semgrep should get share of CPUs only when it runs at once with mypy and Pylint."""
+    mocker.patch("invokelint.lint.count_cpus", return_value=8)
+    assert build_deep_tasks(parallel=False, jobs=8)[-1] is call_semgrep
+    semgrep_task = build_deep_tasks(parallel=True, jobs=8)[-1]
+    assert getattr(semgrep_task, "__name__", "") == call_semgrep.__name__
+    mock_run_in_pty = mocker.patch("invokelint.lint.run_in_pty")
+    semgrep_task(context)
+    build_deep_tasks(parallel=True, jobs=1)[-1](context)
+    commands = [call.args[1] for call in mock_run_in_pty.call_args_list]
+    assert [" --jobs 2 " in commands[0], " --jobs 8 " in commands[1]] == [True, True]
+
+
 @pytest.mark.slow
+@pytest.mark.usefixtures("_semgrep_snapshot")
 def test_deep(context: "Context") -> None:
     """Command should success and run appropriate commands."""
     list_command_expected = [COMMAND_EXPECTED_MYPY, COMMAND_EXPECTED_PYLINT]
@@ -194,3 +327,78 @@ def test_deep(context: "Context") -> None:
         list_command_expected.append(COMMAND_EXPECTED_SEMGREP)
     list_result = deep(context)
     check_list_result(list_result, list_command_expected)
+
+
+@pytest.mark.slow
+@pytest.mark.usefixtures("_semgrep_snapshot")
+def test_deep_parallel(context: "Context") -> None:
+    """Command should success and return results in order even if linters run at once."""
+    list_command_expected = [COMMAND_EXPECTED_MYPY, COMMAND_EXPECTED_PYLINT]
+    if platform.system() != "Windows":
+        list_command_expected.append(COMMAND_EXPECTED_SEMGREP_PARALLEL)
+    list_result = deep(context, parallel=True)
+    check_list_result(list_result, list_command_expected)
+
+
+def test_fast_profile(context: "Context", tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Summary table should be printed and JSON should be written."""
+    path_json = tmp_path / "profile.json"
+    list_result = fast(context, skip_format=True, profile=True, profile_json=str(path_json))
+    check_list_result(list_result, LIST_COMMAND_EXPECTED)
+    assert "Wall [s]" in capsys.readouterr().out
+    list_command = sorted(timing["command"] for timing in json.loads(path_json.read_text(encoding="utf-8")))
+    assert list_command == sorted(result.command for result in list_result)
+
+
+def test_fast_report(context: "Context", tmp_path: Path) -> None:
+    """Tools should output parseable format and SARIF should have a run for each tool."""
+    path_sarif = tmp_path / "report.sarif"
+    list_result = fast(context, skip_format=True, report=str(path_sarif))
+    check_list_result(
+        list_result,
+        [
+            f"ruff check --output-format concise {PYTHON_DIR}",
+            f'bandit --format custom --msg-template "{{relpath}}:{{line}}:{{col}}: {{test_id}} [{{severity}}] {{msg}}"'
+            f" --configfile pyproject.toml --recursive {PYTHON_DIR}",
+            COMMAND_EXPECTED_DODGY,
+            f"flake8 --format default {PYTHON_DIR}",
+        ],
+    )
+    runs = json.loads(path_sarif.read_text(encoding="utf-8"))["runs"]
+    assert [run["tool"]["driver"]["name"] for run in runs] == ["ruff", "bandit", "dodgy", "flake8"]
+    assert all(run["results"] == [] for run in runs)
+
+
+def test_fast_budget(context: "Context") -> None:
+    """Linters should be ordered by recorded runtimes and all of them should finish within enough budget."""
+    list_result = fast(context, skip_format=True, budget="10m")
+    assert sorted(result.command for result in list_result) == sorted(LIST_COMMAND_EXPECTED)
+
+
+def test_watch(context: "Context", mocker: "MockerFixture") -> None:
+    """Linters accepting targets should run on changed files."""
+    mocker.patch("invokelint.watch.build_watcher", return_value=ScriptedWatcher([["invokelint/lint.py"], []]))
+    check_list_result(
+        watch(context),
+        [
+            "ruff check invokelint/lint.py",
+            "bandit --configfile pyproject.toml --recursive invokelint/lint.py",
+            "flake8 invokelint/lint.py",
+        ],
+    )
+
+
+def test_serve_buffer_of_test_module(context: "Context", tmp_path: Path) -> None:
+    """Buffer of test module should be linted with per-file-ignores of Ruff and skips of Bandit for tests."""
+    server_context = build_buffered_context(context)
+    source = '"""Test."""\n\n\ndef test() -> None:\n    """Test."""\n    assert not []\n'
+    with LintServer(
+        partial(lint_captured, server_context, pydocstyle=False),
+        partial(lint_source_captured, server_context, pydocstyle=False),
+        targets=[TEST_DIR],
+        path=tmp_path / "serve.sock",
+    ) as server:
+        response = server.answer({"file": "tests/test_buffer.py", "source": source})
+        assert response["exited"] == 0, response
+        response = server.answer({"file": "tests/test_buffer.py", "source": f"{source}import os\n"})
+    assert "tests/test_buffer.py:7:1: F401" in response["stdout"], response
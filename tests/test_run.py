@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import sys
 from typing import TYPE_CHECKING
+from typing import Any
 
 import pytest
 from invoke import Context
@@ -12,10 +13,13 @@ from invoke import UnexpectedExit
 from invoke import task
 
 from invokelint.run import run_all
+from invokelint.run import run_in_parallel
 
 if TYPE_CHECKING:
     from pathlib import Path
 
+    from invokelint.run import TaskFunction
+
 
 @task
 def fail(context: Context) -> list[Result]:
@@ -98,3 +102,51 @@ def check_run_all(list_expected_message: list[str], error: UnexpectedExit, tmp_p
     for expected_message in list_expected_message:
         assert expected_message in str(error)
     assert (tmp_path / "test.txt").exists()
+
+
+# Reason: Compatibility with TaskFunction. pylint: disable=unused-argument
+def echo_first(context: Context, **kwargs: Any) -> list[Result]:  # noqa: ARG001
+    return [context.run("sleep 0.2 && echo first")]
+
+
+# Reason: Compatibility with TaskFunction. pylint: disable=unused-argument
+def echo_second(context: Context, **kwargs: Any) -> list[Result]:  # noqa: ARG001
+    return [context.run("echo second")]
+
+
+# Reason: Compatibility with TaskFunction. pylint: disable=unused-argument
+def call_fail(context: Context, **kwargs: Any) -> list[Result]:  # noqa: ARG001
+    return fail(context)
+
+
+# Reason: Compatibility with TaskFunction. pylint: disable=unused-argument
+def call_create_file(context: Context, **kwargs: Any) -> list[Result]:  # noqa: ARG001
+    return create_file(context)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Code: sleep works only in Linux.")
+def test_run_in_parallel(context: Context, capsys: pytest.CaptureFixture[str]) -> None:
+    """Outputs should be printed in order of tasks even if the latter task finishes first."""
+    list_task: list[TaskFunction] = [echo_first, echo_second]
+    list_result = run_in_parallel(list_task, context, jobs=2)
+    assert [result.command for result in list_result] == ["sleep 0.2 && echo first", "echo second"]
+    assert capsys.readouterr().out.split() == ["first", "second"]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Code: context.cd() works only in Linux.")
+def test_run_in_parallel_keep_going(tmp_path: Path, context: Context, capsys: pytest.CaptureFixture[str]) -> None:
+    """All tasks should be run even one of them failed when fail_fast is False."""
+    list_expected_message = ["Encountered a bad command exit code!", "Exit code: 1"]
+    list_task: list[TaskFunction] = [call_fail, call_create_file]
+    with context.cd(str(tmp_path.resolve())), pytest.raises(UnexpectedExit) as excinfo:
+        run_in_parallel(list_task, context, fail_fast=False)
+    check_run_all(list_expected_message, excinfo.value, tmp_path)
+    assert "exit 1 (exit code: 1)" in capsys.readouterr().err
+
+
+def test_run_in_parallel_fail_fast(context: Context) -> None:
+    """The failure should be raised."""
+    list_task: list[TaskFunction] = [call_fail]
+    with pytest.raises(UnexpectedExit) as excinfo:
+        run_in_parallel(list_task, context)
+    assert "Exit code: 1" in str(excinfo.value)
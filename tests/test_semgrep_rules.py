@@ -0,0 +1,68 @@
+"""Tests for `semgrep_rules` package."""
+
+from __future__ import annotations
+
+import hashlib
+import urllib.error
+from typing import TYPE_CHECKING
+
+import pytest
+from invoke import Exit
+
+from invokelint.lint import semgrep_rules
+from invokelint.semgrep_rules import REGISTRY_CONFIG
+from invokelint.semgrep_rules import download
+from invokelint.semgrep_rules import read_stamp
+from invokelint.semgrep_rules import resolve_config
+from invokelint.semgrep_rules import snapshot
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from invoke import Context
+    from pytest_mock import MockerFixture
+
+RULES = b"rules:\n- id: example\n"
+
+
+def test_snapshot(tmp_path: Path, mocker: MockerFixture) -> None:
+    """Snapshot should be stamped and used instead of registry."""
+    mock_download = mocker.patch("invokelint.semgrep_rules.download", return_value=RULES)
+    path = tmp_path / ".semgrep_rules.yml"
+    assert resolve_config(path) == REGISTRY_CONFIG
+    snapshot("p/python", "1.0.0", path)
+    mock_download.assert_called_once_with("p/python")
+    assert read_stamp(path) == {"config": "p/python", "semgrep": "1.0.0", "sha256": hashlib.sha256(RULES).hexdigest()}
+    assert resolve_config(path) == path.as_posix()
+
+
+def test_download_failure(mocker: MockerFixture) -> None:
+    """Failure of network should be reported without traceback."""
+    mocker.patch("urllib.request.urlopen", side_effect=urllib.error.URLError("Name or service not known"))
+    with pytest.raises(Exit, match="Failed to download ruleset p/python"):
+        download("p/python")
+
+
+def test_resolve_config_changed(tmp_path: Path, mocker: MockerFixture, capsys: pytest.CaptureFixture[str]) -> None:
+    """Snapshot changed after taken should be warned but used."""
+    mocker.patch("invokelint.semgrep_rules.download", return_value=RULES)
+    path = tmp_path / ".semgrep_rules.yml"
+    snapshot("p/python", "1.0.0", path)
+    path.write_bytes(path.read_bytes() + b"- id: added\n")
+    assert resolve_config(path) == path.as_posix()
+    assert "has changed since snapshot is taken" in capsys.readouterr().err
+
+
+def test_semgrep_rules(context: Context, tmp_path: Path, mocker: MockerFixture) -> None:
+    """Task should snapshot ruleset with version of installed Semgrep."""
+    path = tmp_path / ".semgrep_rules.yml"
+    mocker.patch("invokelint.semgrep_rules.download", return_value=RULES)
+    mock_snapshot = mocker.patch(
+        "invokelint.lint.snapshot",
+        side_effect=lambda config, version: snapshot(config, version, path),
+    )
+    list_result = semgrep_rules(context)
+    version = list_result[0].stdout.strip()
+    mock_snapshot.assert_called_once_with(REGISTRY_CONFIG, version)
+    assert read_stamp(path)["semgrep"] == version
+    assert path.read_bytes().endswith(RULES)
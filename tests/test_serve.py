@@ -0,0 +1,94 @@
+"""Tests for `serve` package."""
+
+from __future__ import annotations
+
+import socket
+import threading
+from pathlib import Path
+from typing import Generator
+
+import pytest
+from invoke import Exit
+from invoke import Result
+
+from invokelint.client import main
+from invokelint.client import request
+from invokelint.serve import LintServer
+from invokelint.serve import build_response
+
+
+def lint(files: list[str]) -> list[Result]:
+    """Echoes content of files as failure."""
+    return [Result(stdout="".join(f"{file}: {Path(file).read_text(encoding='utf-8')}" for file in files), exited=1)]
+
+
+def lint_source(file: str, copy: str) -> list[Result]:
+    """Echoes content of copy next to file as failure."""
+    assert Path(copy).parent == Path(file).parent / ".invokelint_buffer"
+    return lint([copy])
+
+
+@pytest.fixture(name="socket_file")
+def fixture_socket_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Generator[Path, None, None]:
+    """Socket file of server running in thread, project has package/module.py."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "package").mkdir()
+    (tmp_path / "package" / "module.py").write_text("saved\n", encoding="utf-8")
+    path = tmp_path / "serve.sock"
+    with LintServer(lint, lint_source, targets=["package"], path=path) as server:
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        yield path
+        server.shutdown()
+        thread.join()
+    assert not path.exists()
+
+
+def test_build_response() -> None:
+    list_result = [Result(stdout="a\n", exited=0), Result(stderr="b\n", exited=3), Result(exited=1)]
+    assert build_response(list_result) == {"exited": 3, "stdout": "a\n", "stderr": "b\n"}
+
+
+def test_lint_files(socket_file: Path) -> None:
+    """Files out of targets should be ignored."""
+    response = request({"files": ["package/module.py", "other.py", "package/data.txt"]}, socket_file)
+    assert response == {"exited": 1, "stdout": "package/module.py: saved\n", "stderr": ""}
+    assert request({"files": ["other.py"]}, socket_file)["exited"] == 2  # noqa: PLR2004
+
+
+def test_lint_files_absolute_path(socket_file: Path) -> None:
+    """Absolute path which editors send should be linted and reported by path relative to project."""
+    response = request({"files": [str(socket_file.parent / "package" / "module.py")]}, socket_file)
+    assert response == {"exited": 1, "stdout": "package/module.py: saved\n", "stderr": ""}
+
+
+def test_lint_buffer(socket_file: Path) -> None:
+    """Buffer should be linted instead of saved file, and reported by path of saved file."""
+    response = request({"file": "package/module.py", "source": "buffer\n"}, socket_file)
+    assert response == {"exited": 1, "stdout": "package/module.py: buffer\n", "stderr": ""}
+    assert not (socket_file.parent / "package" / ".invokelint_buffer").exists()
+    response = request({"file": "other.py", "source": "buffer\n"}, socket_file)
+    assert response["exited"] == 2  # noqa: PLR2004
+
+
+def test_invalid_request(socket_file: Path) -> None:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(socket_file))
+        client.sendall(b"invalid\n")
+        assert b'"exited": 2' in client.makefile("rb").readline()
+    assert request([], socket_file)["exited"] == 2  # type: ignore[arg-type] # noqa: PLR2004
+
+
+def test_already_listening(socket_file: Path) -> None:
+    with pytest.raises(Exit):
+        LintServer(lint, lint_source, targets=["package"], path=socket_file)
+
+
+def test_client(socket_file: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    assert main(["--socket", str(socket_file), "package/module.py"]) == 1
+    assert capsys.readouterr().out == "package/module.py: saved\n"
+
+
+def test_client_without_server(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    assert main(["--socket", str(tmp_path / "serve.sock")]) == 2  # noqa: PLR2004
+    assert "inv lint.serve" in capsys.readouterr().err
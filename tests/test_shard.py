@@ -0,0 +1,83 @@
+"""Tests for `shard` package."""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import TYPE_CHECKING
+from typing import Any
+
+import pytest
+from invoke import UnexpectedExit
+
+from invokelint.run import run_in_parallel
+from invokelint.shard import chunk_by_length
+from invokelint.shard import run_sharded
+from invokelint.shard import split_balanced
+from invokelint.shard import split_files
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from invoke import Context
+    from invoke import Result
+
+
+def test_split_balanced() -> None:
+    """Heaviest keys should be spread first to balance total weights."""
+    weights = {"a.py": 1, "b.py": 5, "c.py": 3, "d.py": 2}
+    assert split_balanced(weights, 2) == [["b.py", "a.py"], ["c.py", "d.py"]]
+    assert split_balanced(weights, 8) == [["b.py"], ["c.py"], ["d.py"], ["a.py"]]
+
+
+def test_chunk_by_length() -> None:
+    """Each chunk joined by space should fit in limit."""
+    files = ["aaa.py", "bb.py", "c.py", "dddd.py"]
+    assert chunk_by_length(files, limit=13) == [["aaa.py", "bb.py"], ["c.py", "dddd.py"]]
+    assert chunk_by_length(["too_long_file.py"], limit=13) == [["too_long_file.py"]]
+
+
+def test_split_files(tmp_path: Path) -> None:
+    """Files should be split by byte sizes."""
+    sizes = {"a.py": 100, "b.py": 10, "c.py": 60, "d.py": 50}
+    files = []
+    for name, size in sizes.items():
+        path = tmp_path / name
+        path.write_text("#" * size, encoding="utf-8")
+        files.append(path.as_posix())
+    assert split_files(files, 2) == [files[:2], files[2:]]
+
+
+@pytest.fixture(name="files")
+def fixture_files(tmp_path: Path) -> list[str]:
+    """Directory of Python files, one of them fails check."""
+    for name, content in {"a.py": "ok", "b.py": "ok", "c.py": "ng"}.items():
+        (tmp_path / name).write_text(content, encoding="utf-8")
+    return [tmp_path.as_posix()]
+
+
+def test_run_sharded(context: Context, files: list[str], capsys: pytest.CaptureFixture[str]) -> None:
+    """Results of shards should be merged into one result of the command, which is printed once."""
+    result = run_sharded(context, "cat", targets=files, shards=2, warn=True)
+    assert result.command == f"cat {files[0]}"
+    assert sorted(result.stdout) == sorted("okokng")
+    assert result.exited == 0
+    assert capsys.readouterr().out == result.stdout
+
+
+def test_run_sharded_in_parallel(context: Context, files: list[str], capsys: pytest.CaptureFixture[str]) -> None:
+    """Output of shards should be printed once by run_in_parallel() which runs sharded task."""
+
+    def task(context: Context, **kwargs: Any) -> list[Result]:
+        return [run_sharded(context, "cat", **kwargs)]
+
+    list_result = run_in_parallel([partial(task, targets=files, shards=2, warn=True)], context)
+    assert capsys.readouterr().out == list_result[0].stdout
+
+
+def test_run_sharded_failure(context: Context, files: list[str]) -> None:
+    """Failure of any shard should be raised after all shards run."""
+    command = "grep -L ng"
+    with pytest.raises(UnexpectedExit) as excinfo:
+        run_sharded(context, command, targets=files, shards=3)
+    assert excinfo.value.result.command == f"{command} {files[0]}"
+    assert excinfo.value.result.stdout.count(".py") == 2  # noqa: PLR2004
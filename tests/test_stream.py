@@ -0,0 +1,87 @@
+"""Tests for `stream` package."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from invoke import Collection
+from invoke import UnexpectedExit
+
+from invokelint.config import DEFAULT_CONFIG
+from invokelint.diagnostics import parseable_options
+from invokelint.diagnostics import reporting
+from invokelint.run import run_in_pty
+from invokelint.stream import build_log_path
+from invokelint.stream import is_streaming
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from invoke import Context
+    from pytest_mock import MockerFixture
+
+COMMAND = "python -c \"import sys; print('x' * 50000); sys.stderr.write('error\\n')\""
+
+
+@pytest.fixture(name="streaming_context")
+def fixture_streaming_context(context: Context, tmp_path: Path, mocker: MockerFixture) -> Context:
+    """Context in streaming mode which writes logs into temporary directory."""
+    mocker.patch("invokelint.stream.LOG_DIR", tmp_path)
+    context.config["invokelint"] = {"stream": True, "tail": 1000}
+    return context
+
+
+def test_is_streaming(context: Context) -> None:
+    """Collections should configure default, which environment variable can override."""
+    assert not is_streaming(context)
+    collection = Collection()
+    collection.configure(DEFAULT_CONFIG)
+    expected = {
+        "invokelint": {"stream": False, "tail": 65536, "warm": False, "index": False, "max_file_size": 1048576},
+    }
+    assert collection.configuration() == expected  # type: ignore[no-untyped-call]
+    context.config["invokelint"] = {"stream": True}
+    assert is_streaming(context)
+
+
+def test_run_in_pty_streaming(streaming_context: Context, tmp_path: Path) -> None:
+    """Result should keep only tail without pseudo terminal."""
+    result = run_in_pty(streaming_context, COMMAND, hide=True)
+    assert not result.pty
+    log = tmp_path / build_log_path(COMMAND).name
+    assert result.stdout.startswith(f"[49000 characters omitted, see {log.as_posix()}]\n")
+    assert result.stdout.endswith("x" * 999 + "\n")
+    assert result.stderr == "error\n"
+
+
+def test_run_in_pty_streaming_log(streaming_context: Context, tmp_path: Path) -> None:
+    """Log should have whole output."""
+    run_in_pty(streaming_context, COMMAND, hide=True)
+    log = tmp_path / build_log_path(COMMAND).name
+    # Stderr may be written between chunks of stdout depending on timing.
+    assert log.read_text(encoding="utf-8").replace("error\n", "", 1) == "x" * 50000 + "\n"
+
+
+def test_run_in_pty_streaming_reporting(streaming_context: Context, tmp_path: Path) -> None:
+    """Diagnostics beyond tail should be reported, since output is kept whole while reporting."""
+    module = tmp_path / "module.py"
+    module.write_text("".join(f"import module_{index}\n" for index in range(100)), encoding="utf-8")
+    path = tmp_path / "report.jsonl"
+    with reporting(str(path)):
+        command = f"flake8{parseable_options('flake8')} --select F401 {module.as_posix()}"
+        result = run_in_pty(streaming_context, command, hide=True, warn=True)
+    assert len(result.stdout) > 1000  # noqa: PLR2004
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 100  # noqa: PLR2004
+
+
+def test_run_in_pty_streaming_rotate(streaming_context: Context, tmp_path: Path) -> None:
+    """Log of the previous run should be kept, and failure should be raised with tail."""
+    run_in_pty(streaming_context, "echo first", hide=True)
+    with pytest.raises(UnexpectedExit) as excinfo:
+        run_in_pty(streaming_context, "echo second && false", hide=True)
+    assert excinfo.value.result.stdout == "second\n"
+    run_in_pty(streaming_context, "echo first", hide=True)
+    log = tmp_path / build_log_path("echo first").name
+    assert log.read_text(encoding="utf-8") == "first\n"
+    assert tmp_path.joinpath(f"{log.name}.1").read_text(encoding="utf-8") == "first\n"
@@ -6,11 +6,15 @@ from typing import TYPE_CHECKING
 import pytest
 from invoke.exceptions import Exit
 
+from invokelint.style import call_ruff_check
+from invokelint.style import call_ruff_fmt
 from invokelint.style import docformatter
 from invokelint.style import fmt
 from tests.testlibraries import check_list_result
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from invoke import Context
     from pytest_mock import MockerFixture
 
@@ -25,20 +29,18 @@ LIST_COMMAND_EXPECTED_STYLE_WITHOUT_RUFF = [
     f"isort {PYTHON_DIR}",
     f"black {PYTHON_DIR}",
 ]
+# Ruff applies nothing since the project is already formatted.
 LIST_COMMAND_EXPECTED_STYLE_WITHOUT_RUFF_BY_RUFF = [
     *LIST_COMMAND_EXPECTED_STYLE_COMMON,
     f"ruff format --diff {PYTHON_DIR}",
-    f"ruff format {PYTHON_DIR}",
 ]
 LIST_COMMAND_EXPECTED_STYLE_BY_RUFF = [
     *LIST_COMMAND_EXPECTED_STYLE_WITHOUT_RUFF_BY_RUFF,
     f"ruff check --show-fixes {PYTHON_DIR}",
-    f"ruff check --fix --show-fixes {PYTHON_DIR}",
 ]
 LIST_COMMAND_EXPECTED_STYLE_NO_RUFF = [
     *LIST_COMMAND_EXPECTED_STYLE_WITHOUT_RUFF,
     f"ruff check --show-fixes {PYTHON_DIR}",
-    f"ruff check --fix --show-fixes {PYTHON_DIR}",
 ]
 LIST_COMMAND_EXPECTED_STYLE_CHECK_COMMON = (
     [f"docformatter --recursive --check {PYTHON_DIR}"] if sys.version_info >= (3, 10) else []
@@ -58,7 +60,6 @@ LIST_COMMAND_EXPECTED_STYLE_CHECK_BY_RUFF = [
 LIST_COMMAND_EXPECTED_STYLE_RUFF = [
     *LIST_COMMAND_EXPECTED_STYLE_COMMON,
     f"ruff format --diff {PYTHON_DIR}",
-    f"ruff format {PYTHON_DIR}",
 ]
 
 
@@ -104,6 +105,33 @@ def test_style_ruff_by_ruff_no_ruff(context: "Context") -> None:
     assert str(exc_info.value) == "Cannot use both '--by-ruff' and '--no-ruff' options together."
 
 
+def test_style_check_changed(context: "Context", mocker: "MockerFixture") -> None:
+    """Only changed files should be checked."""
+    mocker.patch("invokelint.path.list_changed_python_files", return_value=["invokelint/style.py"])
+    list_command_expected = [
+        *(["docformatter --recursive --check invokelint/style.py"] if sys.version_info >= (3, 10) else []),
+        "ruff format --diff invokelint/style.py",
+        "ruff check --show-fixes invokelint/style.py",
+    ]
+    check_list_result(fmt(context, check=True, changed=True), list_command_expected)
+
+
+def test_style_ruff_applies_after_preview(context: "Context", tmp_path: "Path") -> None:
+    """Ruff should apply changes only when preview finds them."""
+    # To apply default rules of Ruff instead of settings of this project.
+    tmp_path.joinpath("pyproject.toml").write_text("[tool.ruff]\n", encoding="utf-8")
+    path = tmp_path / "unformatted.py"
+    path.write_text("import os\nx=1\n", encoding="utf-8")
+    list_result = call_ruff_fmt(context, targets=[str(path)]) + call_ruff_check(context, targets=[str(path)])
+    assert [(result.command, result.exited) for result in list_result] == [
+        (f"ruff format --diff {path}", 1),
+        (f"ruff format {path}", 0),
+        (f"ruff check --show-fixes {path}", 1),
+        (f"ruff check --fix --show-fixes {path}", 0),
+    ]
+    assert path.read_text(encoding="utf-8").strip() == "x = 1"
+
+
 def test_docformatter_not_installed(context: "Context", mocker: "MockerFixture") -> None:
     """Returns empty list when docformatter is not installed."""
     mocker.patch("shutil.which", return_value=None)
@@ -6,17 +6,23 @@ from pathlib import Path
 from textwrap import dedent
 from typing import TYPE_CHECKING
 
+import pytest
 from invoke import MockContext
 from invoke import Result
+from invoke.exceptions import Exit
 
+from invokelint.impact import ImpactMap
+from invokelint.test import affected
 from invokelint.test import build_coverage_run_command
 from invokelint.test import coverage
 from invokelint.test import fast
+from invokelint.test import resolve_workers
 from invokelint.test import run_test_all
 from tests.testlibraries import check_list_result
 from tests.testlibraries import check_result
 
 if TYPE_CHECKING:
+    from invoke import Context
     from pytest_mock import MockFixture
 
 # Reason: Black <=23.x (Python 3.9-) splits closing `"""` onto its own line, triggering ruff COM812.
@@ -61,6 +67,88 @@ def test_run_test_all() -> None:
     context.run.assert_called_with(expected_command, pty=expected_pty)  # type: ignore[attr-defined]
 
 
+def test_fast_workers_xdist(mocker: "MockFixture") -> None:
+    """The test task should spread tests by pytest-xdist when it is installed."""
+    mocker.patch("invokelint.test.is_xdist_installed", return_value=True)
+    expected_command = 'pytest -m "not slow" -vv -n 4'
+    context = MockContext(run={expected_command: Result(EXPECTED_STDOUT)})
+    check_result(fast(context, workers="4"), expected_command)
+
+
+def test_run_test_all_workers_shards(
+    context: "Context",
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    mocker: "MockFixture",
+) -> None:
+    """The test task should split test files into shards when pytest-xdist is not installed."""
+    mocker.patch("invokelint.test.is_xdist_installed", return_value=False)
+    tmp_path.joinpath("test_a.py").write_text("def test_1():\n    pass\n\n\ndef test_2():\n    pass\n")
+    tmp_path.joinpath("test_b.py").write_text("def test_1():\n    pass\n")
+    monkeypatch.chdir(tmp_path)
+    result = run_test_all(context, workers="2")
+    check_result(result, "pytest -vv")
+    assert result.stdout.count(" passed") == 2  # noqa: PLR2004
+
+
+EXPECTED_COMMAND_AFFECTED = 'coverage run --rcfile=.invokelint_cache/test_map.coveragerc -m pytest -m "not slow" -vv'
+
+
+def test_affected(tmp_path: Path, mocker: "MockFixture") -> None:
+    """The test task should run only tests affected by changed files and update map of tests."""
+    path_map = tmp_path / "test_map.json"
+    impact_map = ImpactMap(path_map)
+    impact_map.files = {"invokelint/lint.py": ["tests/test_lint.py::test_fast"], "invokelint/run.py": []}
+    impact_map.save("stamp")
+    mocker.patch("invokelint.test.ImpactMap", return_value=ImpactMap(path_map))
+    mocker.patch("invokelint.test.build_stamp", return_value="stamp")
+    mocker.patch("invokelint.test.list_changed_files", return_value=["invokelint/lint.py"])
+    mocker.patch(
+        "invokelint.test.export_contexts",
+        return_value={"invokelint/run.py": ["tests/test_lint.py::test_fast"]},
+    )
+    expected_command = f"{EXPECTED_COMMAND_AFFECTED} tests/test_lint.py::test_fast"
+    context = MockContext(run={expected_command: Result(EXPECTED_STDOUT)})
+    check_list_result(affected(context), [expected_command])
+    assert ImpactMap(path_map).files == {
+        "invokelint/lint.py": [],
+        "invokelint/run.py": ["tests/test_lint.py::test_fast"],
+    }
+
+
+def test_affected_stale(tmp_path: Path, mocker: "MockFixture") -> None:
+    """The test task should run all tests to rebuild map of tests when it is missing."""
+    mocker.patch("invokelint.test.ImpactMap", return_value=ImpactMap(tmp_path / "test_map.json"))
+    mocker.patch("invokelint.test.export_contexts", return_value={"invokelint/run.py": []})
+    context = MockContext(run={EXPECTED_COMMAND_AFFECTED: Result(EXPECTED_STDOUT)})
+    check_list_result(affected(context), [EXPECTED_COMMAND_AFFECTED])
+    assert ImpactMap(tmp_path / "test_map.json").files == {"invokelint/run.py": []}
+
+
+def test_affected_nothing(tmp_path: Path, mocker: "MockFixture") -> None:
+    """The test task should run nothing when no test is affected."""
+    impact_map = ImpactMap(tmp_path / "test_map.json")
+    impact_map.files = {"invokelint/run.py": []}
+    mocker.patch("invokelint.test.ImpactMap", return_value=impact_map)
+    mocker.patch("invokelint.test.build_stamp", return_value="")
+    mocker.patch("invokelint.test.list_changed_files", return_value=["invokelint/run.py"])
+    assert not affected(MockContext())
+
+
+@pytest.mark.parametrize(
+    ("workers", "expected"),
+    [("", 1), ("3", 3), ("auto", 8)],
+)
+def test_resolve_workers(workers: str, expected: int, mocker: "MockFixture") -> None:
+    mocker.patch("invokelint.test.count_cpus", return_value=8)
+    assert resolve_workers(workers) == expected
+
+
+def test_resolve_workers_invalid() -> None:
+    with pytest.raises(Exit, match="--workers requires number or 'auto': many"):
+        resolve_workers("many")
+
+
 # Reason: Black <=23.x (Python 3.9-) splits closing `"""` onto its own line, triggering ruff COM812.
 # fmt: off
 EXPECTED_STDOUT_REPORT = dedent("""
@@ -85,6 +173,11 @@ def test_build_coverage_run_command() -> None:
     assert build_coverage_run_command(is_all=True) == "coverage run --source invokelint,setup,tasks -m pytest"
 
 
+def test_build_coverage_run_command_parallel() -> None:
+    expected = "coverage run --parallel-mode --source invokelint -m pytest"
+    assert build_coverage_run_command(parallel=True) == expected
+
+
 def test_coverage(mocker: "MockFixture") -> None:
     """The test task should call coverage with combine when .coverage.* files exist."""
     # Mock Path(".").glob to return multiple coverage files (simulating multiprocessing)
@@ -0,0 +1,56 @@
+"""Tests for `timing` package."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+from invoke import Context
+from invoke import UnexpectedExit
+
+from invokelint.run import run_in_pty
+from invokelint.timing import Profiler
+from invokelint.timing import Timing
+from invokelint.timing import format_timing
+from invokelint.timing import profiler
+from invokelint.timing import profiling
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_profiler_report() -> None:
+    """Timings should be sorted by wall time in descending order."""
+    instance = Profiler()
+    instance.list_timing.extend([Timing("fast", 0.1, 0.1, None), Timing("slow", 2.0, 1.0, 3 * 1024 * 1024)])
+    lines = instance.report().splitlines()
+    assert lines[1].startswith("slow")
+    assert lines[1].endswith("3.0")
+    assert lines[2].startswith("fast")
+    assert lines[2].endswith("-")
+
+
+def test_format_timing_truncates_command() -> None:
+    """Long command should be truncated to keep columns aligned."""
+    line = format_timing(Timing("x" * 100, 1.0, 1.0, None))
+    assert line.startswith("x" * 57 + "... ")
+
+
+def test_profiling(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Commands run by run_in_pty should be recorded."""
+    path_json = tmp_path / "profile.json"
+    with profiling(enabled=True, json_path=str(path_json)):
+        run_in_pty(Context(), "echo test", hide=True, in_stream=False)
+    assert "echo test" in capsys.readouterr().out
+    timing = json.loads(path_json.read_text(encoding="utf-8"))[0]
+    assert timing["command"] == "echo test"
+    assert timing["wall"] > 0
+
+
+def test_profiling_failure(capsys: pytest.CaptureFixture[str]) -> None:
+    """Summary table should be printed even if command fails."""
+    with pytest.raises(UnexpectedExit), profiling(enabled=True):
+        run_in_pty(Context(), "exit 1", hide=True, in_stream=False)
+    assert "exit 1" in capsys.readouterr().out
+    assert [timing.command for timing in profiler.sorted()] == ["exit 1"]
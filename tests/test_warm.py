@@ -0,0 +1,94 @@
+"""Tests for `warm` package."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from invoke import UnexpectedExit
+
+from invokelint.run import run_in_pty
+from invokelint.warm import is_warm
+from invokelint.warm import is_warmable
+from invokelint.warm import run_warm
+from invokelint.warm import to_exit_code
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from invoke import Context
+    from pytest_mock import MockerFixture
+
+
+@pytest.fixture(name="warm_context")
+def fixture_warm_context(context: Context) -> Context:
+    context.config["invokelint"] = {"warm": True}
+    return context
+
+
+@pytest.fixture(name="file_with_docstring_error")
+def fixture_file_with_docstring_error(tmp_path: Path) -> Path:
+    file = tmp_path / "module.py"
+    file.write_text('def function() -> None:\n    """returns nothing"""\n', encoding="utf-8")
+    return file
+
+
+def test_is_warm(context: Context, warm_context: Context) -> None:
+    assert is_warm(warm_context)
+    context.config["invokelint"] = {"warm": False}
+    assert not is_warm(context)
+
+
+@pytest.mark.parametrize(
+    ("command", "options", "expected"),
+    [
+        ("flake8 invokelint", {"warn": True, "hide": True}, True),
+        ("mypy invokelint", {}, False),
+        ("bandit -r invokelint | tee log", {}, False),
+        ("pylint '--ignore=a b' invokelint", {}, False),
+        ("flake8 invokelint", {"env": {"A": "1"}}, False),
+    ],
+)
+def test_is_warmable(context: Context, command: str, options: dict[str, bool], *, expected: bool) -> None:
+    """Only command of tool which doesn't need shell or subprocess options should be warmable."""
+    assert is_warmable(context, command, options) == expected
+
+
+def test_is_warmable_prefix(context: Context) -> None:
+    with context.cd("invokelint"):
+        assert not is_warmable(context, "flake8 .", {})
+
+
+@pytest.mark.parametrize(
+    ("code", "expected"),
+    [(None, 0), (0, 0), (2, 2), ("error", 1)],
+)
+def test_to_exit_code(code: object, expected: int) -> None:
+    assert to_exit_code(code) == expected
+
+
+def test_run_warm(warm_context: Context, file_with_docstring_error: Path) -> None:
+    """Result should be same as console script."""
+    result = run_warm(warm_context, f"pydocstyle {file_with_docstring_error.as_posix()}", warn=True, hide=True)
+    assert result.exited == 1
+    assert "D403" in result.stdout
+
+
+def test_run_warm_unexpected_exit(warm_context: Context, file_with_docstring_error: Path) -> None:
+    with pytest.raises(UnexpectedExit):
+        run_warm(warm_context, f"pydocstyle {file_with_docstring_error.as_posix()}", hide=True)
+
+
+def test_run_warm_closed_stdout(warm_context: Context) -> None:
+    """Bandit closes standard output after writing report."""
+    result = run_warm(warm_context, "bandit --configfile pyproject.toml --recursive invokelint/warm.py", hide=True)
+    assert "No issues identified." in result.stdout
+
+
+def test_run_in_pty_warm(warm_context: Context, mocker: MockerFixture) -> None:
+    """Warmable command should run by warm runner, others by subprocess."""
+    spy = mocker.spy(warm_context, "run")
+    assert run_in_pty(warm_context, "flake8 --version", hide=True).ok
+    spy.assert_not_called()
+    run_in_pty(warm_context, "python --version", hide=True)
+    spy.assert_called_once()
@@ -0,0 +1,79 @@
+"""Tests for `watch` package."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+from invoke import Result
+from invoke import UnexpectedExit
+
+from invokelint.watch import PollingWatcher
+from invokelint.watch import WatchdogWatcher
+from invokelint.watch import list_modified
+from invokelint.watch import scan
+from invokelint.watch import watch
+from tests.testlibraries import ScriptedWatcher
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+
+def touch(path: Path) -> None:
+    """Updates modified time forward, since resolution of modified time may be coarse."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_scan(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Hidden directories and caches should be skipped."""
+    monkeypatch.chdir(tmp_path)
+    for file in ["package/module.py", "package/sub/module.py", "package/.hidden/module.py", "package/data.txt"]:
+        (tmp_path / file).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / file).write_text("", encoding="utf-8")
+    (tmp_path / "setup.py").write_text("", encoding="utf-8")
+    mtimes = scan(["package", "setup.py", "not_exist.py"])
+    assert sorted(mtimes) == ["package/module.py", "package/sub/module.py", "setup.py"]
+    assert list_modified(mtimes, {**mtimes, "setup.py": 0, "new.py": 0}) == ["setup.py", "new.py"]
+
+
+def test_polling_watcher(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Changed files should be returned once, and changes before reset should be ignored."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.py").write_text("", encoding="utf-8")
+    (tmp_path / "b.py").write_text("", encoding="utf-8")
+    watcher = PollingWatcher(["a.py", "b.py"], interval=0.01)
+    touch(tmp_path / "a.py")
+    watcher.reset()
+    touch(tmp_path / "b.py")
+    assert watcher.wait(0.01) == ["b.py"]
+    assert watcher.poll() == []
+
+
+def test_watchdog_watcher(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Files saved in targets should be collected from events of file system."""
+    pytest.importorskip("watchdog")
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "package").mkdir()
+    with WatchdogWatcher(["package"], interval=0.01) as watcher:
+        (tmp_path / "package" / "module.py").write_text("", encoding="utf-8")
+        (tmp_path / "outside.py").write_text("", encoding="utf-8")
+        assert watcher.wait(0.2) == [str(Path("package", "module.py"))]
+
+
+def test_watch(mocker: MockerFixture, capsys: pytest.CaptureFixture[str]) -> None:
+    """Failure should be reported and watching should continue until interrupted."""
+    mocker.patch("invokelint.watch.build_watcher", return_value=ScriptedWatcher([["a.py"], [], [], ["b.py"], []]))
+    list_changed = []
+
+    def on_change(changed: list[str]) -> list[Result]:
+        list_changed.append(changed)
+        result = Result(command=f"lint {changed[0]}", exited=1)
+        raise UnexpectedExit(result)
+
+    list_result = watch(on_change, targets=[], interval=0, debounce=0)
+    assert list_changed == [["a.py"], ["b.py"]]
+    assert [result.command for result in list_result] == ["lint b.py"]
+    assert "Failed: lint a.py (exit code: 1)" in capsys.readouterr().err
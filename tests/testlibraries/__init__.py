@@ -4,10 +4,25 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from invokelint.watch import Watcher
+
 if TYPE_CHECKING:
     from invoke import Result
 
 
+class ScriptedWatcher(Watcher):
+    """Watcher which returns scripted changes for each poll, then interrupts as Ctrl+C."""
+
+    def __init__(self, changes: list[list[str]]) -> None:
+        super().__init__([], interval=0)
+        self.changes = changes
+
+    def poll(self) -> list[str]:
+        if not self.changes:
+            raise KeyboardInterrupt
+        return self.changes.pop(0)
+
+
 def check_list_result(list_result: list[Result], list_command_expected: list[str]) -> None:
     """Checks the results of a list of commands against expected commands."""
     assert len(list_result) == len(